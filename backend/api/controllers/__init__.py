@@ -9,6 +9,13 @@ from .divisions import DivisionController
 from .heats import HeatController
 from .results import ResultController
 from .rounds import RoundController  # Add the new RoundController
+from .debug import DebugController
+from .metrics import MetricsController
+from .profiling import ProfilingController
+from .photos import PhotoController
+from .reports import ReportsController
+from .board import BoardController
+from .frontend import FrontendController
 
 # List of all controllers for easy import
 __all__ = [
@@ -18,4 +25,11 @@ __all__ = [
     "HeatController",
     "ResultController",
     "RoundController",  # Add to __all__ list
+    "DebugController",
+    "MetricsController",
+    "ProfilingController",
+    "PhotoController",
+    "ReportsController",
+    "BoardController",
+    "FrontendController",
 ]
\ No newline at end of file
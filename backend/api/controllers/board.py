@@ -0,0 +1,34 @@
+# backend/api/controllers/board.py
+"""
+Now-racing board controller for Derby Director
+"""
+
+from litestar import Request, Response, get
+from litestar.controller import Controller
+from litestar.enums import MediaType
+from litestar.exceptions import ServiceUnavailableException
+from litestar.status_codes import HTTP_200_OK, HTTP_304_NOT_MODIFIED
+
+from backend.api.responses import REVALIDATE_CACHE_CONTROL, etag_matches
+from backend.api.schemas import RaceBoard
+from backend.api.services import race_queue
+
+
+class BoardController(Controller):
+    """Controller for the arena display; served from memory, without a database session"""
+
+    path = "/board"
+
+    @get("/", status_code=HTTP_200_OK)
+    async def get_board(self, request: Request) -> Response[RaceBoard]:
+        """The heat now racing, the heats on deck and the last heat's results"""
+        board = race_queue.board()
+        if board is None:
+            raise ServiceUnavailableException("The race board is not loaded yet")
+
+        etag = race_queue.etag
+        headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            return Response(content=b"", status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+
+        return Response(content=board, media_type=MediaType.JSON, headers=headers)
@@ -0,0 +1,29 @@
+# backend/api/controllers/debug.py
+"""
+Debug controller for Derby Director
+"""
+
+from typing import Any, Dict, List
+
+from litestar import get
+from litestar.controller import Controller
+from litestar.status_codes import HTTP_200_OK
+
+from backend.api.middleware.query_stats import recent_requests
+from backend.api.services.loop_monitor import loop_monitor
+
+
+class DebugController(Controller):
+    """Diagnostics endpoints, only registered in development"""
+    
+    path = "/debug"
+    
+    @get("/queries", status_code=HTTP_200_OK)
+    async def get_query_stats(self) -> List[Dict[str, Any]]:
+        """SQL statement counts, database time and rows for recent requests, newest first"""
+        return recent_requests()
+    
+    @get("/loop", status_code=HTTP_200_OK)
+    async def get_loop_lag(self) -> Dict[str, Any]:
+        """Event loop lag and the stacks captured while the loop was blocked, newest first"""
+        return loop_monitor.snapshot()
@@ -16,6 +16,7 @@ from litestar.status_codes import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CON
 
 from backend.api.models import Division
 from backend.api.schemas import DivisionCreate, DivisionUpdate, DivisionResponse
+from backend.api.services import race_analytics
 from backend.api.middleware.auth import get_jwt_user
 
 
@@ -105,6 +106,9 @@ class DivisionController(Controller):
         await session.commit()
         await session.refresh(dvsn)
         
+        # Division names appear on every report line; rebuild on next read
+        race_analytics.invalidate()
+        
         return DivisionResponse.model_validate(dvsn)
     
     @delete("/{division_id:int}", status_code=HTTP_204_NO_CONTENT)
@@ -0,0 +1,92 @@
+# backend/api/controllers/frontend.py
+"""
+Frontend controller for Derby Director
+
+Serves the built single-page app (frontend/dist) from FRONTEND_DIR, so the
+event laptop needs no second web server. Files under assets/ carry a content
+hash in their names (Vite's assetsDir), so they are cached forever; anything
+else, index.html above all, is sent with an ETag and must be revalidated.
+Precompressed .br/.gz siblings are sent to clients that accept them. Paths
+that are not files fall back to index.html for client-side routing.
+"""
+
+import mimetypes
+from pathlib import Path
+from typing import Optional
+
+from litestar import Request, Response, get
+from litestar.controller import Controller
+from litestar.datastructures import ETag
+from litestar.exceptions import NotFoundException
+from litestar.status_codes import HTTP_200_OK, HTTP_304_NOT_MODIFIED
+
+from backend.api.responses import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    StaticFile,
+    etag_matches,
+    precompressed_file,
+)
+from backend.config import FRONTEND_DIR
+
+# Vite's assetsDir; everything in it is content-hashed
+HASHED_ASSETS_DIR = "assets"
+
+
+def resolve_frontend_file(root: Path, file_path: str) -> Optional[Path]:
+    """The file a request path names inside root, or None (never a path outside root)"""
+    try:
+        path = (root / file_path.lstrip("/")).resolve()
+    except (OSError, ValueError):
+        return None
+    if not path.is_relative_to(root) or not path.is_file():
+        return None
+    return path
+
+
+class FrontendController(Controller):
+    """Controller serving the built frontend at the site root"""
+
+    path = "/"
+
+    @get(["/", "/{file_path:path}"], status_code=HTTP_200_OK, include_in_schema=False)
+    async def get_file(self, request: Request, file_path: str = "/") -> Response:
+        """A frontend file, or index.html for client-side routes"""
+        root = FRONTEND_DIR.resolve()
+        relative = file_path.lstrip("/")
+        if relative == "api" or relative.startswith("api/"):
+            # Unknown API routes stay 404s rather than becoming the app shell
+            raise NotFoundException()
+
+        path = resolve_frontend_file(root, relative)
+        if path is None:
+            if relative.startswith(f"{HASHED_ASSETS_DIR}/") or Path(relative).suffix:
+                raise NotFoundException(f"File {relative} not found")
+            path = resolve_frontend_file(root, "index.html")
+            if path is None:
+                raise NotFoundException("Frontend index.html not found")
+
+        sent, encoding, stat = precompressed_file(path, request.headers.get("Accept-Encoding"))
+        immutable = root / HASHED_ASSETS_DIR in path.parents
+
+        # Each encoding of a file is a different representation, so gets its own tag
+        etag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}" + (f"-{encoding}" if encoding else "")
+        headers = {
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+        if etag_matches(request.headers.get("If-None-Match"), f'"{etag}"'):
+            return Response(content=b"", status_code=HTTP_304_NOT_MODIFIED,
+                            headers={**headers, "ETag": f'"{etag}"'})
+
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return StaticFile(
+            sent,
+            media_type=mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+            content_disposition_type="inline",
+            filename=path.name,
+            etag=ETag(value=etag),
+            stat_result=stat,
+            headers=headers
+        )
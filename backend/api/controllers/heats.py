@@ -21,6 +21,7 @@ from backend.api.schemas import (
     HeatCreate, HeatUpdate, HeatResponse, HeatDetail,
     LaneAssignmentResponse, LaneAssignment
 )
+from backend.api.services import result_journal, heats_changed
 from backend.api.middleware.auth import get_jwt_user
 
 
@@ -36,6 +37,56 @@ async def provide_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def load_heat_detail(session: AsyncSession, heat_id: int) -> HeatDetail:
+    """Load a single heat by ID with lane assignments"""
+    # Get heat with round info
+    query = (
+        select(Heat, Round.name.label("round_name"))
+        .join(Round, Heat.roundid == Round.id)
+        .filter(Heat.id == heat_id)
+    )
+    
+    result = await session.execute(query)
+    row = result.one_or_none()
+    
+    if not row:
+        raise NotFoundException(f"Heat with ID {heat_id} not found")
+    
+    heat, round_name = row
+    
+    # Get lane assignments with racer info
+    lanes_query = (
+        select(
+            RacerHeat.lane,
+            RacerHeat.racer_id,
+            Racer.firstname,
+            Racer.lastname,
+            Racer.carno
+        )
+        .join(Racer, RacerHeat.racer_id == Racer.id)
+        .filter(RacerHeat.heat_id == heat_id)
+        .order_by(RacerHeat.lane)
+    )
+    
+    lanes_result = await session.execute(lanes_query)
+    lanes = [
+        LaneAssignmentResponse(
+            lane=lane,
+            racer_id=racer_id,
+            racer_name=f"{firstname} {lastname}",
+            car_number=carno
+        )
+        for lane, racer_id, firstname, lastname, carno in lanes_result
+    ]
+    
+    # Create response
+    return HeatDetail(
+        **HeatResponse.model_validate(heat).model_dump(),
+        lanes=lanes,
+        round_name=round_name
+    )
+
+
 class HeatController(Controller):
     """Controller for heat-related endpoints"""
     
@@ -84,52 +135,7 @@ class HeatController(Controller):
         session: Annotated[AsyncSession, Dependency()]
     ) -> HeatDetail:
         """Get a single heat by ID with lane assignments"""
-        # Get heat with round info
-        query = (
-            select(Heat, Round.name.label("round_name"))
-            .join(Round, Heat.roundid == Round.id)
-            .filter(Heat.id == heat_id)
-        )
-        
-        result = await session.execute(query)
-        row = result.one_or_none()
-        
-        if not row:
-            raise NotFoundException(f"Heat with ID {heat_id} not found")
-        
-        heat, round_name = row
-        
-        # Get lane assignments with racer info
-        lanes_query = (
-            select(
-                RacerHeat.lane,
-                RacerHeat.racer_id,
-                Racer.firstname,
-                Racer.lastname,
-                Racer.carno
-            )
-            .join(Racer, RacerHeat.racer_id == Racer.id)
-            .filter(RacerHeat.heat_id == heat_id)
-            .order_by(RacerHeat.lane)
-        )
-        
-        lanes_result = await session.execute(lanes_query)
-        lanes = [
-            LaneAssignmentResponse(
-                lane=lane,
-                racer_id=racer_id,
-                racer_name=f"{firstname} {lastname}",
-                car_number=carno
-            )
-            for lane, racer_id, firstname, lastname, carno in lanes_result
-        ]
-        
-        # Create response
-        response = HeatDetail.model_validate(heat)
-        response.lanes = lanes
-        response.round_name = round_name
-        
-        return response
+        return await load_heat_detail(session, heat_id)
     
     @post("/", status_code=HTTP_201_CREATED)
     async def create_heat(
@@ -172,9 +178,16 @@ class HeatController(Controller):
         
         await session.commit()
         await session.refresh(heat)
+        await heats_changed(session, [heat.id])
+        
+        await result_journal.append("schedule", round_id=heat.roundid, heats=[{
+            "heat_id": heat.id,
+            "heat": heat.heat,
+            "lanes": [[lane.lane, lane.racer_id] for lane in data.lanes]
+        }])
         
         # Return the created heat with details
-        return await self.get_heat(heat.id, session)
+        return await load_heat_detail(session, heat.id)
     
     @put("/{heat_id:int}", status_code=HTTP_200_OK)
     async def update_heat(
@@ -221,11 +234,28 @@ class HeatController(Controller):
                 )
                 session.add(lane)
         
+        # Round charts are cached by heat version
+        if data.status is not None or data.lanes is not None:
+            heat.version = (heat.version or 0) + 1
+        
         await session.commit()
         await session.refresh(heat)
+        await heats_changed(session, [heat_id])
+        
+        # One record per update, matching the single version bump above
+        if data.status is not None or data.lanes is not None:
+            await result_journal.append(
+                "heat_update",
+                heat_id=heat_id,
+                round_id=heat.roundid,
+                heat=heat.heat,
+                status=data.status,
+                lanes=(None if data.lanes is None
+                       else [[lane.lane, lane.racer_id] for lane in data.lanes]),
+            )
         
         # Return the updated heat with details
-        return await self.get_heat(heat_id, session)
+        return await load_heat_detail(session, heat_id)
     
     @delete("/{heat_id:int}", status_code=HTTP_204_NO_CONTENT)
     async def delete_heat(
@@ -260,4 +290,7 @@ class HeatController(Controller):
         
         # Delete heat
         await session.delete(heat)
-        await session.commit()
\ No newline at end of file
+        await session.commit()
+        await heats_changed(session, [heat_id])
+        
+        await result_journal.append("delete_heat", heat_id=heat_id)
\ No newline at end of file
@@ -0,0 +1,24 @@
+# backend/api/controllers/metrics.py
+"""
+Metrics controller for Derby Director
+"""
+
+from litestar import Response, get
+from litestar.controller import Controller
+from litestar.status_codes import HTTP_200_OK
+
+from backend.api.services.metrics import metrics
+
+
+class MetricsController(Controller):
+    """Prometheus scrape endpoint"""
+    
+    path = "/metrics"
+    
+    @get("/", status_code=HTTP_200_OK, include_in_schema=False)
+    async def get_metrics(self) -> Response[str]:
+        """Current metrics in the Prometheus text exposition format"""
+        return Response(
+            content=metrics.render(),
+            media_type="text/plain; version=0.0.4"
+        )
@@ -0,0 +1,33 @@
+# backend/api/controllers/photos.py
+"""
+Photo controller for Derby Director
+"""
+
+from litestar import get
+from litestar.controller import Controller
+from litestar.exceptions import NotFoundException
+from litestar.status_codes import HTTP_200_OK
+
+from backend.api.responses import IMMUTABLE_CACHE_CONTROL, StaticFile
+from backend.api.services.photos import photo_store
+
+
+class PhotoController(Controller):
+    """Serves resized racer photos by content digest"""
+
+    path = "/photos"
+
+    @get("/{digest:str}/{filename:str}", status_code=HTTP_200_OK, include_in_schema=False)
+    async def get_photo(self, digest: str, filename: str) -> StaticFile:
+        """A photo variant (thumb.jpg, display.jpg or print.jpg); cacheable forever"""
+        variant, _, extension = filename.partition(".")
+        path = photo_store.variant_path(digest, variant) if extension == "jpg" else None
+        if path is None:
+            raise NotFoundException(f"Photo {digest}/{filename} not found")
+
+        return StaticFile(
+            path,
+            media_type="image/jpeg",
+            content_disposition_type="inline",
+            headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL}
+        )
@@ -0,0 +1,78 @@
+# backend/api/controllers/profiling.py
+"""
+Profiling controller for Derby Director
+"""
+
+from typing import List
+
+from litestar import Request, Response, delete, get, post
+from litestar.controller import Controller
+from litestar.exceptions import NotAuthorizedException, NotFoundException, ValidationException
+from litestar.status_codes import HTTP_200_OK
+
+from backend.api.middleware.auth import is_admin_token
+from backend.api.schemas.profiling import (
+    ProfileFile,
+    ProfilingSamplingRequest,
+    ProfilingSamplingStatus,
+)
+from backend.api.services.profiling import request_profiler
+
+
+def require_admin(request: Request) -> None:
+    """Guard that rejects requests without an admin token"""
+    if not is_admin_token(request.headers.get("Authorization")):
+        raise NotAuthorizedException("Profiling requires an admin token")
+
+
+class ProfilingController(Controller):
+    """Background request sampling and access to written profiles"""
+
+    path = "/profiling"
+
+    @get("/sampling", status_code=HTTP_200_OK)
+    async def get_sampling(self, request: Request) -> ProfilingSamplingStatus:
+        """State of the background sampling window"""
+        require_admin(request)
+        return ProfilingSamplingStatus(**request_profiler.sampling_status())
+
+    @post("/sampling", status_code=HTTP_200_OK)
+    async def start_sampling(
+        self,
+        request: Request,
+        data: ProfilingSamplingRequest
+    ) -> ProfilingSamplingStatus:
+        """Profile one request in every N for the given number of seconds"""
+        require_admin(request)
+        try:
+            request_profiler.start_sampling(data.every, data.duration, data.mode)
+        except ValueError as e:
+            raise ValidationException(str(e))
+        return ProfilingSamplingStatus(**request_profiler.sampling_status())
+
+    @delete("/sampling", status_code=HTTP_200_OK)
+    async def stop_sampling(self, request: Request) -> ProfilingSamplingStatus:
+        """Close the sampling window early"""
+        require_admin(request)
+        request_profiler.stop_sampling()
+        return ProfilingSamplingStatus(**request_profiler.sampling_status())
+
+    @get("/profiles", status_code=HTTP_200_OK)
+    async def list_profiles(self, request: Request) -> List[ProfileFile]:
+        """Profiles written so far, newest first"""
+        require_admin(request)
+        return [ProfileFile(**profile) for profile in request_profiler.list_profiles()]
+
+    @get("/profiles/{name:str}", status_code=HTTP_200_OK)
+    async def download_profile(self, request: Request, name: str) -> Response[bytes]:
+        """Download a profile (.pstats or speedscope JSON)"""
+        require_admin(request)
+        path = request_profiler.profile_dir / name
+        if "/" in name or name.startswith(".") or not path.is_file():
+            raise NotFoundException(f"Profile {name} not found")
+        media_type = "application/json" if name.endswith(".json") else "application/octet-stream"
+        return Response(
+            content=path.read_bytes(),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{name}"'}
+        )
@@ -3,22 +3,40 @@
 Racer controller for Derby Director
 """
 
-from typing import Annotated, List, Optional, AsyncGenerator, Any
+import csv
+import zipfile
+from datetime import datetime
+from typing import Annotated, List, Optional, Dict, AsyncGenerator, AsyncIterator
+from xml.etree.ElementTree import ParseError
 
-from sqlalchemy import select, func
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
-from litestar import get, post, put, delete
+from litestar import Request, get, post, put, patch, delete
 from litestar.controller import Controller
 from litestar.di import Provide
-from litestar.params import Dependency, Parameter as Query
-from litestar.exceptions import NotFoundException
-from litestar.status_codes import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT
+from litestar.params import Body, Dependency, Parameter as Query
+from litestar.datastructures import UploadFile
+from litestar.enums import RequestEncodingType
+from litestar.exceptions import (
+    NotFoundException, ClientException, HTTPException, ServiceUnavailableException
+)
+from litestar.status_codes import (
+    HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT, HTTP_413_REQUEST_ENTITY_TOO_LARGE
+)
 
 from backend.api.models import Racer, Division, Rank
 from backend.api.schemas import (
-    RacerCreate, RacerUpdate, RacerResponse, RacerDetail
+    RacerCreate, RacerUpdate, RacerResponse, RacerDetail,
+    CheckinRequest, BatchCheckinRequest, CheckinResult, BatchCheckinResponse,
+    RacerImportResponse, ItineraryHeat, RacerItinerary
+)
+from backend.api.services import (
+    apply_racer_search, checkin_index, RacerImporter, iter_upload_rows, race_analytics,
+    race_queue, racers_changed
 )
+from backend.api.services.photos import PhotoTooLargeError, photo_store
+from backend.config import PHOTO_MAX_BYTES
 from backend.api.middleware.auth import get_jwt_user
 
 
@@ -34,6 +52,90 @@ async def provide_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+# Read size when copying an uploaded photo to disk
+PHOTO_CHUNK_SIZE = 64 * 1024
+
+
+async def photo_upload_chunks(request: Request) -> AsyncIterator[bytes]:
+    """
+    Body of a photo upload, in chunks.
+    
+    Accepts the frontend's multipart form (a "photo" file field) or a raw
+    image body, which is streamed straight from the socket.
+    """
+    if not request.content_type[0].startswith("multipart/"):
+        async for chunk in request.stream():
+            yield chunk
+        return
+    
+    form = await request.form()
+    upload = form.get("photo")
+    if not isinstance(upload, UploadFile):
+        upload = next((value for value in form.values() if isinstance(value, UploadFile)), None)
+    if upload is None:
+        raise ValueError("No photo file in upload")
+    
+    try:
+        while chunk := await upload.read(PHOTO_CHUNK_SIZE):
+            yield chunk
+    finally:
+        await upload.close()
+
+
+# Valid values for Racer.checkin_status
+CHECKIN_STATUSES = ("registered", "checked_in", "passed_inspection")
+
+
+def validate_checkin_status(status: str) -> None:
+    """Reject unknown check-in statuses"""
+    if status not in CHECKIN_STATUSES:
+        raise ClientException(
+            f"Invalid check-in status '{status}'. "
+            f"Expected one of: {', '.join(CHECKIN_STATUSES)}"
+        )
+
+
+def racer_itinerary(racer_id: int) -> Optional[RacerItinerary]:
+    """Itinerary from the race queue, or None if the racer has no heats left to run"""
+    if not race_queue.loaded:
+        raise ServiceUnavailableException("The race queue is not loaded yet")
+
+    stops = race_queue.itinerary(racer_id)
+    if not stops:
+        return None
+
+    lane = stops[0].lane
+    return RacerItinerary(
+        racer_id=racer_id,
+        racer_name=lane.racer_name,
+        car_number=lane.car_number,
+        cycle_time=round(race_queue.cycle_time(), 1),
+        heats=[
+            ItineraryHeat(
+                heat_id=stop.heat.heat_id,
+                round_id=stop.heat.round_id,
+                round_name=stop.heat.round_name,
+                heat=stop.heat.heat,
+                status=stop.heat.status,
+                lane=stop.lane.lane,
+                position=stop.position,
+                eta=stop.eta
+            )
+            for stop in stops
+        ]
+    )
+
+
+def empty_itinerary(racer: Racer) -> RacerItinerary:
+    return RacerItinerary(
+        racer_id=racer.id,
+        racer_name=f"{racer.firstname} {racer.lastname}",
+        car_number=racer.carno,
+        cycle_time=round(race_queue.cycle_time(), 1),
+        heats=[]
+    )
+
+
 class RacerController(Controller):
     """Controller for racer-related endpoints"""
     
@@ -65,12 +167,7 @@ class RacerController(Controller):
             query = query.filter(Racer.exclude == exclude_status)
             
         if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                (func.lower(Racer.firstname).like(search_term)) |
-                (func.lower(Racer.lastname).like(search_term)) |
-                (func.lower(Racer.carno).like(search_term))
-            )
+            query = await apply_racer_search(session, query, search)
         
         # Execute query
         result = await session.execute(query)
@@ -107,6 +204,44 @@ class RacerController(Controller):
         
         return response
     
+    @get("/{racer_id:int}/itinerary", status_code=HTTP_200_OK)
+    async def get_itinerary(
+        self,
+        racer_id: int,
+        session: Annotated[AsyncSession, Dependency()]
+    ) -> RacerItinerary:
+        """A racer's remaining heats, with lane, place in the queue and ETA"""
+        itinerary = racer_itinerary(racer_id)
+        if itinerary is not None:
+            return itinerary
+
+        # No heats left to run; only the racer's details come from the database
+        racer = await session.get(Racer, racer_id)
+        if not racer:
+            raise NotFoundException(f"Racer with ID {racer_id} not found")
+        return empty_itinerary(racer)
+
+    @get("/car/{car_number:str}/itinerary", status_code=HTTP_200_OK)
+    async def get_itinerary_by_car(
+        self,
+        car_number: str,
+        session: Annotated[AsyncSession, Dependency()]
+    ) -> RacerItinerary:
+        """A racer's remaining heats, looked up by car number"""
+        racer_id = race_queue.racer_for_car(car_number) if race_queue.loaded else None
+        if racer_id is not None:
+            itinerary = racer_itinerary(racer_id)
+            if itinerary is not None:
+                return itinerary
+
+        result = await session.execute(select(Racer).filter(Racer.carno == car_number).limit(1))
+        racer = result.scalar_one_or_none()
+        if not racer:
+            raise NotFoundException(f"Racer with car number {car_number} not found")
+
+        itinerary = racer_itinerary(racer.id)
+        return itinerary if itinerary is not None else empty_itinerary(racer)
+
     @post("/", status_code=HTTP_201_CREATED)
     async def create_racer(
         self,
@@ -123,6 +258,67 @@ class RacerController(Controller):
         await session.commit()
         await session.refresh(racer)
         
+        checkin_index.upsert(racer)
+        await racers_changed(session, [racer.id])
+        
+        return RacerResponse.model_validate(racer)
+    
+    @post("/import", status_code=HTTP_200_OK)
+    async def import_racers(
+        self,
+        data: Annotated[UploadFile, Body(media_type=RequestEncodingType.MULTI_PART)],
+        session: Annotated[AsyncSession, Dependency()],
+        user: Annotated[dict, Dependency()],
+        dry_run: Annotated[bool, Query(description="Validate without saving")] = False
+    ) -> RacerImportResponse:
+        """Import racers from an uploaded CSV or XLSX registration spreadsheet"""
+        importer = RacerImporter(session)
+        
+        try:
+            rows = iter_upload_rows(data.file, data.filename or "", data.content_type or "")
+            report = await importer.import_rows(rows, dry_run=dry_run)
+        except (ValueError, csv.Error, zipfile.BadZipFile, ParseError) as e:
+            await session.rollback()
+            raise ClientException(f"Could not import racers: {str(e)}")
+        finally:
+            await data.close()
+        
+        # New racers need to be visible to check-in scans
+        if report["imported"] and not dry_run:
+            await checkin_index.load(session)
+            race_analytics.invalidate()
+            await race_queue.load(session)
+        
+        return RacerImportResponse(**report)
+    
+    @post(
+        "/{racer_id:int}/photo",
+        status_code=HTTP_200_OK,
+        request_max_body_size=PHOTO_MAX_BYTES + PHOTO_CHUNK_SIZE  # Room for multipart framing
+    )
+    async def upload_photo(
+        self,
+        racer_id: int,
+        request: Request,
+        session: Annotated[AsyncSession, Dependency()],
+        user: Annotated[dict, Dependency()]
+    ) -> RacerResponse:
+        """Upload a racer's photo; thumbnail, display and print sizes are generated from it"""
+        racer = await session.get(Racer, racer_id)
+        if not racer:
+            raise NotFoundException(f"Racer with ID {racer_id} not found")
+        
+        try:
+            digest = await photo_store.save(photo_upload_chunks(request))
+        except PhotoTooLargeError as e:
+            raise HTTPException(status_code=HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+        except ValueError as e:
+            raise ClientException(f"Could not store photo: {str(e)}")
+        
+        racer.imagefile = digest
+        await session.commit()
+        await session.refresh(racer)
+        
         return RacerResponse.model_validate(racer)
     
     @put("/{racer_id:int}", status_code=HTTP_200_OK)
@@ -148,6 +344,9 @@ class RacerController(Controller):
         await session.commit()
         await session.refresh(racer)
         
+        checkin_index.upsert(racer)
+        await racers_changed(session, [racer_id])
+        
         return RacerResponse.model_validate(racer)
     
     @delete("/{racer_id:int}", status_code=HTTP_204_NO_CONTENT)
@@ -165,4 +364,92 @@ class RacerController(Controller):
         
         # Delete
         await session.delete(racer)
-        await session.commit()
\ No newline at end of file
+        await session.commit()
+        
+        checkin_index.remove(racer_id)
+        await racers_changed(session, [racer_id])
+    
+    @patch("/{racer_id:int}/checkin", status_code=HTTP_200_OK)
+    async def update_checkin(
+        self,
+        racer_id: int,
+        data: CheckinRequest,
+        session: Annotated[AsyncSession, Dependency()],
+        user: Annotated[dict, Dependency()]
+    ) -> RacerResponse:
+        """Update a racer's check-in status"""
+        validate_checkin_status(data.status)
+        
+        # Get racer
+        racer = await session.get(Racer, racer_id)
+        if not racer:
+            raise NotFoundException(f"Racer with ID {racer_id} not found")
+        
+        racer.checkin_status = data.status
+        
+        await session.commit()
+        await session.refresh(racer)
+        
+        return RacerResponse.model_validate(racer)
+    
+    @post("/checkin/batch", status_code=HTTP_200_OK)
+    async def batch_checkin(
+        self,
+        data: BatchCheckinRequest,
+        session: Annotated[AsyncSession, Dependency()],
+        user: Annotated[dict, Dependency()]
+    ) -> BatchCheckinResponse:
+        """Apply many car tag scans in a single transaction"""
+        for scan in data.scans:
+            validate_checkin_status(scan.status)
+        
+        await checkin_index.ensure_loaded(session)
+        
+        # Resolve scans from the in-memory index; a later scan of the same
+        # racer overrides an earlier one
+        results = []
+        status_by_racer: Dict[int, str] = {}
+        for scan in data.scans:
+            entries = checkin_index.matches(scan.code)
+            if len(entries) != 1:
+                # A shared car number is reported, not guessed
+                results.append(CheckinResult(
+                    code=scan.code,
+                    found=False,
+                    ambiguous=len(entries) > 1,
+                    candidate_ids=[entry.racer_id for entry in entries]
+                ))
+                continue
+            
+            entry = entries[0]
+            status_by_racer[entry.racer_id] = scan.status
+            results.append(CheckinResult(
+                code=scan.code,
+                found=True,
+                racer_id=entry.racer_id,
+                divisionid=entry.divisionid,
+                exclude=entry.exclude,
+                status=scan.status
+            ))
+        
+        # One UPDATE per distinct status
+        racers_by_status: Dict[str, List[int]] = {}
+        for racer_id, status in status_by_racer.items():
+            racers_by_status.setdefault(status, []).append(racer_id)
+        
+        now = datetime.utcnow()
+        for status, racer_ids in racers_by_status.items():
+            await session.execute(
+                update(Racer)
+                .where(Racer.id.in_(racer_ids))
+                .values(checkin_status=status, updated_at=now)
+            )
+        
+        await session.commit()
+        
+        return BatchCheckinResponse(
+            updated=len(status_by_racer),
+            not_found=sum(1 for result in results if not result.found and not result.ambiguous),
+            ambiguous=sum(1 for result in results if result.ambiguous),
+            results=results
+        )
\ No newline at end of file
@@ -0,0 +1,213 @@
+# backend/api/controllers/reports.py
+"""
+Reports controller for Derby Director
+"""
+
+from typing import Annotated, AsyncGenerator, List, Optional
+
+from litestar import get, post
+from litestar.controller import Controller
+from litestar.di import Provide
+from litestar.exceptions import ClientException, NotFoundException
+from litestar.params import Dependency
+from litestar.params import Parameter as Query
+from litestar.response import Stream
+from litestar.status_codes import HTTP_200_OK
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.middleware.auth import get_jwt_user
+from backend.api.schemas import (
+    CertificateRequest,
+    RaceReportResponse,
+    RacerHistoryEntry,
+    RacerResultResponse,
+    RaceSummaryResponse,
+)
+from backend.api.services import (
+    CertificateService,
+    HeatChartService,
+    race_analytics,
+    stream_certificates_pdf,
+    stream_certificates_zip,
+    stream_heat_chart,
+    stream_pit_cards,
+)
+from backend.api.services.race_analytics import racer_history_entries, racer_results
+
+
+async def provide_session() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency provider for database session"""
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from backend.config import DATABASE_URL
+
+    engine = create_async_engine(DATABASE_URL)
+    async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with async_session() as session:
+        yield session
+
+
+class ReportsController(Controller):
+    """Controller for reports and printable documents"""
+
+    path = "/reports"
+    dependencies = {"session": Provide(provide_session),
+                    "user": get_jwt_user
+    }
+
+    @get("/results", status_code=HTTP_200_OK)
+    async def get_results(
+        self,
+        session: Annotated[AsyncSession, Dependency()]
+    ) -> List[RaceSummaryResponse]:
+        """Every round with its racing progress, in running order"""
+        await race_analytics.ensure_loaded(session)
+        return [
+            RaceSummaryResponse(**summary._asdict()) for summary in race_analytics.round_summaries()
+        ]
+
+    @get("/races/{race_id:int}", status_code=HTTP_200_OK)
+    async def get_race_report(
+        self,
+        race_id: int,
+        session: Annotated[AsyncSession, Dependency()]
+    ) -> RaceReportResponse:
+        """A round's results, fastest average first"""
+        await race_analytics.ensure_loaded(session)
+        report = race_analytics.round_report(race_id)
+        if report is None:
+            raise NotFoundException(f"Round with ID {race_id} not found")
+
+        summary, standings = report
+        return RaceReportResponse(**summary._asdict(), results=racer_results(standings))
+
+    @get("/standings", status_code=HTTP_200_OK)
+    async def get_standings(
+        self,
+        session: Annotated[AsyncSession, Dependency()]
+    ) -> List[RacerResultResponse]:
+        """Overall standings from every round except semifinals and finals"""
+        await race_analytics.ensure_loaded(session)
+        return racer_results(race_analytics.standings())
+
+    @get("/standings/{rank:str}", status_code=HTTP_200_OK)
+    async def get_rank_standings(
+        self,
+        rank: str,
+        session: Annotated[AsyncSession, Dependency()]
+    ) -> List[RacerResultResponse]:
+        """Standings within one rank, positioned against that rank only"""
+        await race_analytics.ensure_loaded(session)
+        standings = race_analytics.standings(rank)
+        if standings is None:
+            raise NotFoundException(f"Rank '{rank}' not found")
+        return racer_results(standings)
+
+    @get("/racers/{racer_id:int}", status_code=HTTP_200_OK)
+    async def get_racer_history(
+        self,
+        racer_id: int,
+        session: Annotated[AsyncSession, Dependency()]
+    ) -> List[RacerHistoryEntry]:
+        """A racer's position and times in each round they have raced"""
+        await race_analytics.ensure_loaded(session)
+        history = race_analytics.racer_history(racer_id)
+        if history is None:
+            raise NotFoundException(f"Racer with ID {racer_id} not found")
+
+        return racer_history_entries(history)
+
+    @post("/certificates", status_code=HTTP_200_OK)
+    async def generate_certificates(
+        self,
+        data: CertificateRequest,
+        session: Annotated[AsyncSession, Dependency()],
+        user: Annotated[dict, Dependency()]
+    ) -> Stream:
+        """Award certificates as a PDF, or a ZIP of PDFs for large batches"""
+        service = CertificateService(session)
+        try:
+            certificates = await service.collect(
+                award_id=data.award_id,
+                racer_id=data.racer_id,
+                award_type=data.award_type,
+                title=data.title,
+                description=data.description
+            )
+        except ValueError as e:
+            raise ClientException(str(e))
+
+        if not certificates:
+            raise NotFoundException("No certificates match the request")
+
+        template = await service.template()
+
+        if data.format == "zip":
+            return Stream(
+                stream_certificates_zip(template, certificates),
+                media_type="application/zip",
+                headers={"Content-Disposition": 'attachment; filename="certificates.zip"'}
+            )
+
+        return Stream(
+            stream_certificates_pdf(template, certificates),
+            media_type="application/pdf",
+            headers={"Content-Disposition": 'attachment; filename="certificates.pdf"'}
+        )
+
+    @get("/heat-chart", status_code=HTTP_200_OK)
+    async def get_heat_chart(
+        self,
+        session: Annotated[AsyncSession, Dependency()],
+        round_id: Annotated[Optional[int], Query(description="Round to print")] = None,
+        division_id: Annotated[
+            Optional[int], Query(description="Division to print, all rounds")
+        ] = None,
+    ) -> Stream:
+        """Printable heat chart PDF for a round or division, streamed page by page"""
+        title, heats, _ = await self._load_chart(session, round_id, division_id)
+        return Stream(
+            stream_heat_chart(title, heats),
+            media_type="application/pdf",
+            headers={"Content-Disposition": 'inline; filename="heat-chart.pdf"'}
+        )
+
+    @get("/pit-cards", status_code=HTTP_200_OK)
+    async def get_pit_cards(
+        self,
+        session: Annotated[AsyncSession, Dependency()],
+        round_id: Annotated[Optional[int], Query(description="Round to print")] = None,
+        division_id: Annotated[
+            Optional[int], Query(description="Division to print, all rounds")
+        ] = None,
+    ) -> Stream:
+        """Printable pit cards PDF, one card per racer listing their heats and lanes"""
+        title, _, cards = await self._load_chart(session, round_id, division_id)
+        return Stream(
+            stream_pit_cards(title, cards),
+            media_type="application/pdf",
+            headers={"Content-Disposition": 'inline; filename="pit-cards.pdf"'}
+        )
+
+    @staticmethod
+    async def _load_chart(
+        session: AsyncSession, round_id: Optional[int], division_id: Optional[int]
+    ):
+        """Title, heats and pit cards for a round or division"""
+        service = HeatChartService(session)
+        try:
+            heats, cards = await service.load(round_id=round_id, division_id=division_id)
+        except ValueError as e:
+            raise ClientException(str(e))
+
+        title = await service.title(round_id=round_id, division_id=division_id)
+        if title is None:
+            kind = "Round" if round_id is not None else "Division"
+            raise NotFoundException(
+                f"{kind} with ID {round_id if round_id is not None else division_id} not found"
+            )
+        if not heats:
+            raise NotFoundException(f"No heats scheduled for {title}")
+
+        return title, heats, cards
@@ -3,24 +3,24 @@
 Results controller for Derby Director
 """
 
-from datetime import datetime
-from typing import Annotated, List, Optional, Dict, AsyncGenerator, Any
+from typing import Annotated, List, Optional, AsyncGenerator
 
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
-from litestar import get, post, put, delete
+from litestar import get, post, patch, delete
 from litestar.controller import Controller
 from litestar.di import Provide
 from litestar.params import Dependency, Parameter as Query
 from litestar.exceptions import NotFoundException, ClientException
 from litestar.status_codes import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT
 
-from backend.api.models import Heat, Round, RacerHeat, Racer, RaceResult
+from backend.api.models import Heat, Round, Racer, RaceResult
 from backend.api.schemas import (
-    ResultCreate, ResultUpdate, ResultResponse, ResultDetail,
-    HeatResultRequest, HeatResultsResponse
+    LaneResultUpdate, ResultResponse, ResultDetail,
+    HeatResultRequest, HeatResultsResponse, BatchHeatResultsRequest,
+    HeatResultAck, BatchHeatResultsResponse
 )
+from backend.api.services import ResultRecorder, MissingRecordError, result_journal, heats_changed
 from backend.api.middleware.auth import get_jwt_user
 
 
@@ -36,6 +36,68 @@ async def provide_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def load_heat_results(session: AsyncSession, heat_id: int) -> HeatResultsResponse:
+    """Load a heat and its lane results with racer details"""
+    # Get heat info
+    heat_query = (
+        select(Heat, Round.name.label("round_name"))
+        .join(Round, Heat.roundid == Round.id)
+        .filter(Heat.id == heat_id)
+    )
+    
+    heat_result = await session.execute(heat_query)
+    heat_row = heat_result.one_or_none()
+    
+    if not heat_row:
+        raise NotFoundException(f"Heat with ID {heat_id} not found")
+    
+    heat, round_name = heat_row
+    
+    # Get results for this heat
+    results_query = (
+        select(
+            RaceResult, 
+            Racer.firstname, 
+            Racer.lastname,
+            Racer.carno
+        )
+        .join(Racer, RaceResult.racer_id == Racer.id)
+        .filter(RaceResult.heat_id == heat_id)
+        .order_by(RaceResult.lane)
+    )
+    
+    results_rows = await session.execute(results_query)
+    
+    # Map to response objects
+    results_list = []
+    for race_result, firstname, lastname, carno in results_rows:
+        result_detail = ResultDetail(
+            id=race_result.id,
+            heat_id=race_result.heat_id,
+            racer_id=race_result.racer_id,
+            lane=race_result.lane,
+            time=race_result.time,
+            place=race_result.place,
+            completed=race_result.completed,
+            racer_name=f"{firstname} {lastname}",
+            car_number=carno,
+            heat_number=heat.heat,
+            round_name=round_name
+        )
+        results_list.append(result_detail)
+    
+    # All results are complete if the heat is marked complete
+    all_completed = heat.status == "completed"
+    
+    return HeatResultsResponse(
+        heat_id=heat_id,
+        round_name=round_name,
+        heat_number=heat.heat,
+        results=results_list,
+        completed=all_completed
+    )
+
+
 class ResultController(Controller):
     """Controller for race result endpoints"""
     
@@ -108,64 +170,7 @@ class ResultController(Controller):
         session: Annotated[AsyncSession, Dependency()]
     ) -> HeatResultsResponse:
         """Get all results for a specific heat"""
-        # Get heat info
-        heat_query = (
-            select(Heat, Round.name.label("round_name"))
-            .join(Round, Heat.roundid == Round.id)
-            .filter(Heat.id == heat_id)
-        )
-        
-        heat_result = await session.execute(heat_query)
-        heat_row = heat_result.one_or_none()
-        
-        if not heat_row:
-            raise NotFoundException(f"Heat with ID {heat_id} not found")
-        
-        heat, round_name = heat_row
-        
-        # Get results for this heat
-        results_query = (
-            select(
-                RaceResult, 
-                Racer.firstname, 
-                Racer.lastname,
-                Racer.carno
-            )
-            .join(Racer, RaceResult.racer_id == Racer.id)
-            .filter(RaceResult.heat_id == heat_id)
-            .order_by(RaceResult.lane)
-        )
-        
-        results_rows = await session.execute(results_query)
-        
-        # Map to response objects
-        results_list = []
-        for race_result, firstname, lastname, carno in results_rows:
-            result_detail = ResultDetail(
-                id=race_result.id,
-                heat_id=race_result.heat_id,
-                racer_id=race_result.racer_id,
-                lane=race_result.lane,
-                time=race_result.time,
-                place=race_result.place,
-                completed=race_result.completed,
-                racer_name=f"{firstname} {lastname}",
-                car_number=carno,
-                heat_number=heat.heat,
-                round_name=round_name
-            )
-            results_list.append(result_detail)
-        
-        # All results are complete if the heat is marked complete
-        all_completed = heat.status == "completed"
-        
-        return HeatResultsResponse(
-            heat_id=heat_id,
-            round_name=round_name,
-            heat_number=heat.heat,
-            results=results_list,
-            completed=all_completed
-        )
+        return await load_heat_results(session, heat_id)
     
     @post("/heat", status_code=HTTP_201_CREATED)
     async def record_heat_results(
@@ -175,43 +180,73 @@ class ResultController(Controller):
         user: Annotated[dict, Dependency()]
     ) -> HeatResultsResponse:
         """Record results for a complete heat"""
-        # Get heat
-        heat = await session.get(Heat, data.heat_id)
-        if not heat:
-            raise NotFoundException(f"Heat with ID {data.heat_id} not found")
+        recorder = ResultRecorder(session)
+        try:
+            await recorder.record_heats([data])
+        except MissingRecordError as e:
+            await session.rollback()
+            raise NotFoundException(str(e))
+        except ValueError as e:
+            await session.rollback()
+            raise ClientException(str(e))
         
-        # Delete any existing results for this heat
-        await session.execute(
-            RaceResult.__table__.delete().where(RaceResult.heat_id == data.heat_id)
-        )
+        # Return the updated heat results
+        return await load_heat_results(session, data.heat_id)
+    
+    @post("/heats:batch", status_code=HTTP_201_CREATED)
+    async def record_heat_results_batch(
+        self,
+        data: BatchHeatResultsRequest,
+        session: Annotated[AsyncSession, Dependency()],
+        user: Annotated[dict, Dependency()]
+    ) -> BatchHeatResultsResponse:
+        """Record results for many heats in one transaction (e.g. replaying a backlog)"""
+        recorder = ResultRecorder(session)
+        try:
+            heats = await recorder.record_heats(data.heats)
+        except MissingRecordError as e:
+            await session.rollback()
+            raise NotFoundException(str(e))
+        except ValueError as e:
+            await session.rollback()
+            raise ClientException(str(e))
         
-        # Create new results
-        for result_data in data.results:
-            # Verify the racer exists
-            racer = await session.get(Racer, result_data.racer_id)
-            if not racer:
-                await session.rollback()
-                raise NotFoundException(f"Racer with ID {result_data.racer_id} not found")
-            
-            # Create result
-            result = RaceResult(
-                heat_id=data.heat_id,
-                racer_id=result_data.racer_id,
-                lane=result_data.lane,
-                time=result_data.time,
-                place=result_data.place,
-                completed=True
+        # Acknowledge from the submitted data rather than re-querying
+        lane_counts = {submission.heat_id: len(submission.results) for submission in data.heats}
+        acks = [
+            HeatResultAck(
+                heat_id=heat.id,
+                round_id=heat.roundid,
+                heat_number=heat.heat,
+                status=heat.status,
+                lanes_recorded=lane_counts[heat.id],
+                completed_time=heat.completed_time
             )
-            session.add(result)
-        
-        # Update heat status to completed
-        heat.status = "completed"
-        heat.completed_time = datetime.utcnow()
+            for heat in heats
+        ]
         
-        await session.commit()
+        return BatchHeatResultsResponse(heats_recorded=len(acks), heats=acks)
+    
+    @patch("/heat/{heat_id:int}/lane/{lane:int}", status_code=HTTP_200_OK)
+    async def update_lane_result(
+        self,
+        heat_id: int,
+        lane: int,
+        data: LaneResultUpdate,
+        session: Annotated[AsyncSession, Dependency()],
+        user: Annotated[dict, Dependency()]
+    ) -> ResultResponse:
+        """Correct the result for a single lane of a heat"""
+        recorder = ResultRecorder(session)
+        try:
+            race_result = await recorder.update_lane(
+                heat_id, lane, data.model_dump(exclude_unset=True)
+            )
+        except MissingRecordError as e:
+            await session.rollback()
+            raise NotFoundException(str(e))
         
-        # Return the updated heat results
-        return await self.get_heat_results(data.heat_id, session)
+        return ResultResponse.model_validate(race_result)
     
     @delete("/heat/{heat_id:int}", status_code=HTTP_204_NO_CONTENT)
     async def delete_heat_results(
@@ -234,5 +269,9 @@ class ResultController(Controller):
         # Update heat status back to scheduled
         heat.status = "scheduled"
         heat.completed_time = None
+        heat.version = (heat.version or 0) + 1
+        
+        await session.commit()
+        await heats_changed(session, [heat_id])
         
-        await session.commit()
\ No newline at end of file
+        await result_journal.append("clear", heat_id=heat_id)
\ No newline at end of file
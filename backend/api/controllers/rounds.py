@@ -7,14 +7,20 @@ from typing import Annotated, List, Optional, Dict, AsyncGenerator, Any
 
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from litestar import get, post, put, delete
+from litestar import Request, Response, get, post, put, delete
 from litestar.controller import Controller
 from litestar.di import Provide
+from litestar.enums import MediaType
 from litestar.params import Dependency, Parameter
 from litestar.exceptions import NotFoundException, ClientException
-from litestar.status_codes import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT
+from litestar.status_codes import (
+    HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT, HTTP_304_NOT_MODIFIED
+)
 
 from backend.api.models import Round, Division, Heat
+from backend.api.responses import REVALIDATE_CACHE_CONTROL, etag_matches
+from backend.api.schemas import RoundChart
+from backend.api.services import round_changed, round_chart_version, load_round_chart
 from backend.api.middleware.auth import get_jwt_user
 
 
@@ -75,6 +81,10 @@ class RoundWithHeats(RoundResponse):
         from_attributes = True
 
 
+# Serialized charts are kept in the app's round_charts store, one per round
+ROUND_CHART_CACHE_TTL = 600
+
+
 class RoundController(Controller):
     """Controller for round-related endpoints"""
     
@@ -220,6 +230,7 @@ class RoundController(Controller):
         session.add(round_obj)
         await session.commit()
         await session.refresh(round_obj)
+        await round_changed(session, round_obj.id)
         
         # Get division name for response if applicable
         division_name = None
@@ -268,6 +279,7 @@ class RoundController(Controller):
         # Save changes
         await session.commit()
         await session.refresh(round_obj)
+        await round_changed(session, round_id)
         
         # Get division name for response if applicable
         division_name = None
@@ -315,6 +327,7 @@ class RoundController(Controller):
         # Delete round
         await session.delete(round_obj)
         await session.commit()
+        await round_changed(session, round_id)
     
     @get("/{round_id:int}/heats", status_code=HTTP_200_OK)
     async def get_round_heats(
@@ -343,4 +356,35 @@ class RoundController(Controller):
                 "phase": round_obj.phase
             },
             "heats": heats
-        }
\ No newline at end of file
+        }
+
+    @get("/{round_id:int}/chart", status_code=HTTP_200_OK)
+    async def get_round_chart(
+        self,
+        round_id: int,
+        request: Request,
+        session: AsyncSession = Dependency()
+    ) -> Response[RoundChart]:
+        """Get a round's whole heat chart (heats, lanes, racers and results) in columnar form"""
+        versioned = await round_chart_version(session, round_id)
+        if versioned is None:
+            raise NotFoundException(f"Round with ID {round_id} not found")
+
+        info, version = versioned
+        etag = f'"{round_id}-{version}"'
+        headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            return Response(content=b"", status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+
+        # One entry per round: the version, a newline, then the serialized chart
+        store = request.app.stores.get("round_charts")
+        cached = await store.get(str(round_id))
+        prefix = version.encode() + b"\n"
+        if cached is not None and cached.startswith(prefix):
+            body = cached[len(prefix):]
+        else:
+            chart = await load_round_chart(session, info, version)
+            body = chart.model_dump_json().encode()
+            await store.set(str(round_id), prefix + body, expires_in=ROUND_CHART_CACHE_TTL)
+
+        return Response(content=body, media_type=MediaType.JSON, headers=headers)
@@ -96,4 +96,18 @@ def create_access_token(
         "exp": expire.timestamp()
     }
     
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
\ No newline at end of file
+    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+
+def is_admin_token(auth_header: Optional[str]) -> bool:
+    """Whether an Authorization header carries a valid admin token"""
+    if not auth_header or not auth_header.startswith("Bearer "):
+        return False
+    
+    try:
+        payload = jwt.decode(
+            auth_header.replace("Bearer ", ""), JWT_SECRET, algorithms=[JWT_ALGORITHM]
+        )
+    except jwt.PyJWTError:
+        return False
+    
+    return bool(payload.get("is_admin", False))
@@ -0,0 +1,194 @@
+# backend/api/middleware/compression.py
+"""
+Response compression for Derby Director
+
+Results, standings and racer lists are large, repetitive JSON sent to phones
+and displays over weak venue Wi-Fi; they shrink ten- to twenty-fold. The
+middleware compresses complete response bodies of at least
+COMPRESSION_MIN_SIZE bytes with a compressible content type, using the first
+of COMPRESSION_ENCODINGS the client accepts. Brotli is used only when the
+brotli package is installed (it is imported on first use); gzip always works.
+
+Responses that are streamed (PDFs, file downloads), already encoded (the
+precompressed frontend files) or not modified pass through untouched.
+
+Compressing the same payload for every client is wasted CPU when the payload
+is versioned: responses with an ETag (round charts, the race board) have
+their compressed bodies kept in a small LRU cache keyed by path, ETag and
+encoding, so each version is compressed once. The ETag of a compressed
+response is made weak, as nginx does, so If-None-Match still matches the
+handler's tag (etag_matches compares weakly).
+
+Unversioned bodies such as the full results and racer lists run to
+megabytes at a large event and take tens of milliseconds to compress. Bodies
+of COMPRESSION_EXECUTOR_MIN_SIZE bytes or more are compressed in the default
+thread pool (zlib and brotli release the GIL), so one large response does
+not stall every other request on the event loop; smaller bodies are cheaper
+to compress in place than to hand to a thread.
+"""
+
+import asyncio
+import gzip
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from litestar.datastructures import Headers, MutableScopeHeaders
+from litestar.middleware import AbstractMiddleware
+from litestar.types import Message, Receive, Scope, Send
+
+from backend.api.responses import accepted_encodings
+from backend.config import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_CACHE_ENTRIES,
+    COMPRESSION_ENCODINGS,
+    COMPRESSION_EXECUTOR_MIN_SIZE,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MIN_SIZE,
+)
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/javascript", "application/xml", "image/svg+xml", "text/",
+)
+
+_brotli = None
+
+
+def brotli_available() -> bool:
+    """Whether the optional brotli package can be used (imported on first call)"""
+    global _brotli
+    if _brotli is None:
+        try:
+            import brotli
+            _brotli = brotli
+        except ImportError:
+            _brotli = False
+    return _brotli is not False
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    return content_type.split(";")[0].strip().lower().startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return _brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressedBodyCache:
+    """Compressed bodies of versioned responses, least recently used evicted first"""
+
+    def __init__(self, max_entries: int = COMPRESSION_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def set(self, key: Tuple[str, str, str], body: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = body
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+
+compressed_bodies = CompressedBodyCache()
+
+
+def choose_encoding(
+    accept_encoding: Optional[str], encodings: List[str] = COMPRESSION_ENCODINGS
+) -> Optional[str]:
+    """The first configured encoding the client accepts and the server can produce"""
+    accepted = accepted_encodings(accept_encoding)
+    for encoding in encodings:
+        if encoding in accepted or "*" in accepted:
+            if encoding == "gzip" or (encoding == "br" and brotli_available()):
+                return encoding
+    return None
+
+
+def _add_vary(headers: MutableScopeHeaders) -> None:
+    if "accept-encoding" not in (headers.get("vary") or "").lower():
+        headers.extend_header_value("vary", "Accept-Encoding")
+
+
+class CompressionMiddleware(AbstractMiddleware):
+    """Compresses complete, compressible response bodies over COMPRESSION_MIN_SIZE"""
+
+    scopes = {"http"}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = choose_encoding(Headers.from_scope(scope).get("accept-encoding"))
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                # Held until the body shows whether it is complete and large enough
+                start = message
+                return
+
+            headers = MutableScopeHeaders.from_message(start)
+            compressible = is_compressible(headers.get("content-type"))
+            if compressible:
+                _add_vary(headers)
+
+            body = message.get("body", b"") if message["type"] == "http.response.body" else b""
+            if (
+                encoding is None
+                or not compressible
+                or message["type"] != "http.response.body"
+                or message.get("more_body", False)
+                or len(body) < COMPRESSION_MIN_SIZE
+                or headers.get("content-encoding")
+                or start["status"] < 200 or start["status"] in (204, 304)
+            ):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            etag = headers.get("etag")
+            target = scope.get("path", "") + "?" + scope.get("query_string", b"").decode("latin-1")
+            key = (target, etag or "", encoding)
+            compressed = compressed_bodies.get(key) if etag else None
+            if compressed is None:
+                if len(body) >= COMPRESSION_EXECUTOR_MIN_SIZE:
+                    compressed = await asyncio.get_running_loop().run_in_executor(
+                        None, compress, body, encoding
+                    )
+                else:
+                    compressed = compress(body, encoding)
+                if etag:
+                    compressed_bodies.set(key, compressed)
+
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            if etag and not etag.startswith("W/"):
+                headers["etag"] = f"W/{etag}"
+            passthrough = True
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
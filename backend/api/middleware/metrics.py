@@ -0,0 +1,77 @@
+# backend/api/middleware/metrics.py
+"""
+Metrics middleware for Derby Director
+
+Records per-route request counts and latency and the number of requests in
+flight, and installs SQLAlchemy session hooks that measure how long sessions
+wait for a database connection.
+"""
+
+import time
+
+from litestar.middleware import AbstractMiddleware
+from litestar.types import Message, Receive, Scope, Send
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.api.services.metrics import (
+    db_checkout_wait,
+    http_in_flight,
+    http_request_duration,
+    http_requests,
+)
+
+_WAIT_STARTED = "metrics_checkout_started"
+
+
+def _start_checkout_timer(orm_execute_state) -> None:
+    # The first statement outside a transaction is what acquires a connection
+    session = orm_execute_state.session
+    if not session.in_transaction():
+        session.info[_WAIT_STARTED] = time.perf_counter()
+
+
+def _stop_checkout_timer(session, transaction, connection) -> None:
+    started = session.info.pop(_WAIT_STARTED, None)
+    if started is not None:
+        db_checkout_wait.observe(time.perf_counter() - started)
+
+
+_installed = False
+
+
+def install_db_metrics() -> None:
+    """Attach the connection wait hooks to every session (idempotent)"""
+    global _installed
+    if not _installed:
+        event.listen(Session, "do_orm_execute", _start_checkout_timer)
+        event.listen(Session, "after_begin", _stop_checkout_timer)
+        _installed = True
+
+
+class MetricsMiddleware(AbstractMiddleware):
+    """Counts and times every HTTP request by route template"""
+
+    scopes = {"http"}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        install_db_metrics()
+        # Route templates keep label cardinality bounded (no IDs in labels)
+        route = scope.get("path_template") or scope.get("path", "")
+        method = scope.get("method", "")
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_in_flight.dec()
+            http_request_duration.observe(time.perf_counter() - started, method=method, route=route)
+            http_requests.inc(method=method, route=route, status=str(status))
@@ -0,0 +1,58 @@
+# backend/api/middleware/profiling.py
+"""
+Opt-in request profiling for Derby Director
+
+An admin can profile a single request on a running server by sending an
+X-Profile header (or a ?profile= query parameter) with the mode, "cprofile"
+or "sample"; any other value means "cprofile". The request runs under the
+profiler, the output is written to PROFILE_DIR and its file name is returned
+in an X-Profile-File header. Requests without a valid admin token are handled
+normally and never profiled.
+
+While a sampling window is open (see /api/profiling/sampling), one request
+in every N is profiled as well, whoever sent it.
+"""
+
+from urllib.parse import parse_qs
+
+from litestar.datastructures import MutableScopeHeaders
+from litestar.middleware import AbstractMiddleware
+from litestar.types import Message, Receive, Scope, Send
+
+from backend.api.middleware.auth import is_admin_token
+from backend.api.services.profiling import MODES, request_profiler
+
+
+def requested_mode(scope: Scope) -> str:
+    """The profiling mode asked for by the request, or an empty string"""
+    headers = dict(scope.get("headers", ()))
+    value = headers.get(b"x-profile", b"").decode("latin-1")
+    if not value:
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        value = query.get("profile", [""])[0]
+    if not value or not is_admin_token(headers.get(b"authorization", b"").decode("latin-1")):
+        return ""
+    return value if value in MODES else "cprofile"
+
+
+class ProfilingMiddleware(AbstractMiddleware):
+    """Runs requests under a profiler when asked to, or when sampled"""
+
+    scopes = {"http"}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        mode = requested_mode(scope) or request_profiler.sampled_mode()
+        profile = request_profiler.begin(mode, scope["method"], scope["path"]) if mode else None
+        if profile is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_profile(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableScopeHeaders.from_message(message).add("X-Profile-File", profile.path.name)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            request_profiler.end(profile)
@@ -0,0 +1,166 @@
+# backend/api/middleware/query_stats.py
+"""
+Per-request SQL instrumentation for Derby Director
+
+SQLAlchemy cursor events count statements, database time and rows for the
+request that issued them (tracked through a context variable, which SQLAlchemy
+carries into its async greenlets). The middleware reports the totals in a
+Server-Timing header and keeps the most recent requests for the
+/api/debug/queries endpoint.
+
+With QUERY_DETECT_REPEATS enabled, statement shapes that run more than
+QUERY_REPEAT_THRESHOLD times within one request are logged: that is the
+signature of an N+1 query loop. Tests can use track_queries() to assert on
+the same numbers directly.
+"""
+
+import logging
+import re
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from litestar.datastructures import MutableScopeHeaders
+from litestar.middleware import AbstractMiddleware
+from litestar.types import Message, Receive, Scope, Send
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from backend.config import QUERY_DETECT_REPEATS, QUERY_REPEAT_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+# Number of recent requests kept for the debug endpoint
+RECENT_REQUESTS = 200
+
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so IN lists of different lengths compare equal"""
+    return _WHITESPACE.sub(" ", _IN_LIST.sub("(?)", statement)).strip()
+
+
+class QueryStats:
+    """SQL totals for one request (or one tracked block)"""
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float, rows: int) -> None:
+        self.statements += 1
+        self.db_time += elapsed
+        self.rows += max(rows, 0)
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int = QUERY_REPEAT_THRESHOLD) -> Dict[str, int]:
+        """Statement shapes that ran more than `threshold` times"""
+        return {shape: count for shape, count in self.shapes.items() if count > threshold}
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.statements} queries, {self.rows} rows"'
+        )
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_recent: Deque[Dict[str, Any]] = deque(maxlen=RECENT_REQUESTS)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None or not conn.info.get("query_stats_start"):
+        return
+
+    elapsed = time.perf_counter() - conn.info["query_stats_start"].pop()
+    # The async driver adapters buffer the whole result; rowcount covers DML
+    buffered = getattr(cursor, "_rows", None)
+    rows = len(buffered) if buffered is not None else cursor.rowcount
+    stats.record(statement, elapsed, rows)
+
+
+_installed = False
+
+
+def install_query_listeners() -> None:
+    """Attach the cursor event hooks to every engine (idempotent)"""
+    global _installed
+    if not _installed:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _installed = True
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect SQL statistics for a block of code (used by tests)"""
+    install_query_listeners()
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def recent_requests() -> List[Dict[str, Any]]:
+    """Most recent request summaries, newest first"""
+    return list(reversed(_recent))
+
+
+class QueryStatsMiddleware(AbstractMiddleware):
+    """Adds a Server-Timing header with SQL statistics to every HTTP response"""
+
+    scopes = {"http"}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        install_query_listeners()
+        stats = QueryStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                total = (time.perf_counter() - started) * 1000
+                headers = MutableScopeHeaders.from_message(message)
+                headers.add("Server-Timing", f"{stats.server_timing()}, total;dur={total:.2f}")
+                self._finish(scope, message["status"], stats, total)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+
+    @staticmethod
+    def _finish(scope: Scope, status: int, stats: QueryStats, total_ms: float) -> None:
+        """Record the request summary and flag repeated statements"""
+        repeated = stats.repeated()
+        _recent.append({
+            "method": scope.get("method"),
+            "path": scope.get("path"),
+            "status": status,
+            "statements": stats.statements,
+            "db_ms": round(stats.db_time * 1000, 2),
+            "rows": stats.rows,
+            "total_ms": round(total_ms, 2),
+            "repeated": repeated,
+        })
+
+        if QUERY_DETECT_REPEATS:
+            for shape, count in repeated.items():
+                logger.warning(
+                    f"Possible N+1: {count} executions of the same statement in "
+                    f"{scope.get('method')} {scope.get('path')}: {shape[:200]}"
+                )
@@ -25,6 +25,8 @@ class Heat(Base):
     heat: Mapped[int] = Column(Integer)  # Heat number within the round
     status: Mapped[str] = Column(String(20), default="scheduled")  # scheduled, in_progress, completed
     completed_time: Mapped[Optional[datetime]] = Column(DateTime, nullable=True)
+    # Bumped whenever the heat's lanes, status or results change
+    version: Mapped[int] = Column(Integer, default=0)
     
     # Relationships
     round: Mapped["Round"] = relationship("Round", back_populates="heats")
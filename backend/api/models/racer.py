@@ -25,9 +25,13 @@ class Racer(Base):
     lastname: Mapped[str] = Column(String(100))
     divisionid: Mapped[int] = Column(Integer, ForeignKey("divisions.id"))
     rankid: Mapped[Optional[int]] = Column(Integer, ForeignKey("ranks.id"), nullable=True)
-    carno: Mapped[Optional[str]] = Column(String(20), nullable=True)
+    carno: Mapped[Optional[str]] = Column(String(20), nullable=True, index=True)
     carname: Mapped[Optional[str]] = Column(String(200), nullable=True)
+    barcode: Mapped[Optional[str]] = Column(String(50), nullable=True, unique=True, index=True)
     exclude: Mapped[bool] = Column(Boolean, default=False)
+    checkin_status: Mapped[str] = Column(
+        String(20), nullable=False, default="registered", server_default="registered"
+    )  # registered, checked_in, passed_inspection
     imagefile: Mapped[Optional[str]] = Column(String(255), nullable=True)
     created_at: Mapped[datetime] = Column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
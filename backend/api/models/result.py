@@ -4,7 +4,7 @@ Race Result model for Derby Director
 """
 
 from typing import Optional, TYPE_CHECKING
-from sqlalchemy import Column, Integer, Float, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, Float, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship, Mapped
 
 from .base import Base
@@ -17,6 +17,10 @@ if TYPE_CHECKING:
 class RaceResult(Base):
     """Model representing the result of a race for a single lane"""
     __tablename__ = "race_results"
+    __table_args__ = (
+        # One result per lane per heat; also the conflict target for upserts
+        Index("uq_race_results_heat_lane", "heat_id", "lane", unique=True),
+    )
     
     id: Mapped[int] = Column(Integer, primary_key=True)
     heat_id: Mapped[int] = Column(Integer, ForeignKey("heats.id"))
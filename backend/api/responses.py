@@ -0,0 +1,151 @@
+# backend/api/responses.py
+"""
+Response helpers for Derby Director
+
+StaticFile serves a file from disk. When the ASGI server supports the
+"http.response.pathsend" extension (Granian, Hypercorn) the server is handed
+the path and sends the file itself, sendfile-style, without the bytes ever
+passing through Python. Other servers (uvicorn) get Litestar's regular
+streamed file response.
+
+Versioned JSON (such as round charts) is sent with an ETag and must be
+revalidated; etag_matches checks a request's If-None-Match against it.
+
+Build output is usually compressed ahead of time (app.js.br, app.js.gz next
+to app.js); precompressed_file picks the sibling a client accepts, so static
+files are never compressed per request.
+"""
+
+import itertools
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from litestar import Litestar, Request
+from litestar.background_tasks import BackgroundTask, BackgroundTasks
+from litestar.datastructures import Cookie
+from litestar.enums import ASGIExtension, MediaType
+from litestar.response import File
+from litestar.response.file import ASGIFileResponse
+from litestar.types import Receive, Scope, Send, TypeEncodersMap
+from litestar.utils.helpers import get_enum_string_value
+
+# Content-addressed URLs never change meaning, so they can be cached forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Clients may keep a copy but must check its ETag before using it
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header names the given ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in tags)
+
+
+# Content-Encoding -> file suffix, in order of preference
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> set:
+    """Encodings an Accept-Encoding header allows (q=0 excludes one)"""
+    accepted = set()
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = params.strip().removeprefix("q=") if params.strip().startswith("q=") else "1"
+        try:
+            if float(quality) > 0:
+                accepted.add(coding.strip().lower())
+        except ValueError:
+            continue
+    return accepted
+
+
+def precompressed_file(
+    path: Path, accept_encoding: Optional[str]
+) -> Tuple[Path, Optional[str], os.stat_result]:
+    """
+    The file to send for path: a precompressed sibling the client accepts, or path itself.
+
+    Returns (file, Content-Encoding or None, its stat result).
+    """
+    accepted = accepted_encodings(accept_encoding)
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        if encoding in accepted or "*" in accepted:
+            sibling = path.with_name(path.name + suffix)
+            try:
+                return sibling, encoding, sibling.stat()
+            except OSError:
+                continue
+    return path, None, path.stat()
+
+
+class PathSendFileResponse(ASGIFileResponse):
+    """ASGIFileResponse that hands the file path to the server when it can"""
+
+    __slots__ = ()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            ASGIExtension.PATH_SEND.value not in scope.get("extensions", {})
+            or self.is_head_response
+        ):
+            await super().__call__(scope, receive, send)
+            return
+
+        await self.start_response(send=send)
+        await send({"type": "http.response.pathsend", "path": str(self.file_path)})
+        await self.after_response()
+
+
+class StaticFile(File):
+    """File response using zero-copy sends where the server supports them"""
+
+    __slots__ = ()
+
+    def to_asgi_response(
+        self,
+        app: Optional[Litestar],
+        request: Request,
+        *,
+        background: Optional[Union[BackgroundTask, BackgroundTasks]] = None,
+        encoded_headers: Optional[Iterable[Tuple[bytes, bytes]]] = None,
+        cookies: Optional[Iterable[Cookie]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        is_head_response: bool = False,
+        media_type: Optional[Union[MediaType, str]] = None,
+        status_code: Optional[int] = None,
+        type_encoders: Optional[TypeEncodersMap] = None,
+    ) -> ASGIFileResponse:
+        """Build a PathSendFileResponse from the same arguments File.to_asgi_response uses"""
+        headers = {**headers, **self.headers} if headers is not None else self.headers
+        cookies = self.cookies if cookies is None else itertools.chain(self.cookies, cookies)
+
+        media_type = self.media_type or media_type
+        if media_type is not None:
+            media_type = get_enum_string_value(media_type)
+
+        return PathSendFileResponse(
+            background=self.background or background,
+            body=b"",
+            chunk_size=self.chunk_size,
+            content_disposition_type=self.content_disposition_type,
+            content_length=0,
+            cookies=cookies,
+            encoded_headers=encoded_headers,
+            encoding=self.encoding,
+            etag=self.etag,
+            file_info=self.file_info,
+            file_path=self.file_path,
+            file_system=self.file_system,
+            filename=self.filename,
+            headers=headers,
+            is_head_response=is_head_response,
+            media_type=media_type,
+            stat_result=self.stat_result,
+            status_code=self.status_code or status_code,
+        )
@@ -5,7 +5,9 @@ Schema imports and aggregation for Derby Director
 
 from .racer import (
     RacerBase, RacerCreate, RacerUpdate,
-    RacerResponse, RacerDetail
+    RacerResponse, RacerDetail, CheckinRequest,
+    CheckinScan, BatchCheckinRequest, CheckinResult,
+    BatchCheckinResponse, RacerImportError, RacerImportResponse
 )
 
 from .division import (
@@ -20,20 +22,37 @@ from .heat import (
 )
 
 from .result import (
-    ResultBase, ResultCreate, ResultUpdate,
+    ResultBase, ResultCreate, ResultUpdate, LaneResultUpdate,
     ResultResponse, ResultDetail, HeatResultRequest,
-    HeatResultsResponse
+    HeatResultsResponse, BatchHeatResultsRequest, HeatResultAck,
+    BatchHeatResultsResponse
 )
 
 from .auth import (
     LoginRequest, TokenResponse, UserInfo
 )
 
+from .report import (
+    CertificateRequest, RacerResultResponse, RaceSummaryResponse,
+    RaceReportResponse, RacerHistoryEntry
+)
+
+from .round_chart import (
+    RoundChartInfo, RoundChartHeats, RoundChartRacers, RoundChartLanes, RoundChart
+)
+from .board import BoardLane, BoardHeat, RaceBoard, ItineraryHeat, RacerItinerary
+
+from .profiling import (
+    ProfilingSamplingRequest, ProfilingSamplingStatus, ProfileFile
+)
+
 # List of all schemas for easy import
 __all__ = [
     # Racer schemas
     'RacerBase', 'RacerCreate', 'RacerUpdate',
-    'RacerResponse', 'RacerDetail',
+    'RacerResponse', 'RacerDetail', 'CheckinRequest',
+    'CheckinScan', 'BatchCheckinRequest', 'CheckinResult',
+    'BatchCheckinResponse', 'RacerImportError', 'RacerImportResponse',
     
     # Division schemas
     'DivisionBase', 'DivisionCreate', 'DivisionUpdate',
@@ -45,10 +64,24 @@ __all__ = [
     'HeatDetail',
     
     # Result schemas
-    'ResultBase', 'ResultCreate', 'ResultUpdate',
+    'ResultBase', 'ResultCreate', 'ResultUpdate', 'LaneResultUpdate',
     'ResultResponse', 'ResultDetail', 'HeatResultRequest',
-    'HeatResultsResponse',
+    'HeatResultsResponse', 'BatchHeatResultsRequest', 'HeatResultAck',
+    'BatchHeatResultsResponse',
     
     # Auth schemas
     'LoginRequest', 'TokenResponse', 'UserInfo',
+    
+    # Report schemas
+    'CertificateRequest', 'RacerResultResponse', 'RaceSummaryResponse',
+    'RaceReportResponse', 'RacerHistoryEntry',
+    
+    # Round chart schemas
+    'RoundChartInfo', 'RoundChartHeats', 'RoundChartRacers', 'RoundChartLanes', 'RoundChart',
+    
+    # Board schemas
+    'BoardLane', 'BoardHeat', 'RaceBoard', 'ItineraryHeat', 'RacerItinerary',
+    
+    # Profiling schemas
+    'ProfilingSamplingRequest', 'ProfilingSamplingStatus', 'ProfileFile',
 ]
\ No newline at end of file
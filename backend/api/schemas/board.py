@@ -0,0 +1,63 @@
+# backend/api/schemas/board.py
+"""
+Now-racing board schemas for API responses
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BoardLane(BaseModel):
+    """Schema for a lane on the board"""
+    lane: int = Field(..., description="Lane number")
+    racer_id: int = Field(..., description="Racer ID")
+    racer_name: str = Field(..., description="Name of the racer")
+    car_number: Optional[str] = Field(None, description="Car number")
+    time: Optional[float] = Field(None, description="Race time in seconds, once run")
+    place: Optional[int] = Field(None, description="Finishing position, once run")
+
+
+class BoardHeat(BaseModel):
+    """Schema for a heat on the board"""
+    heat_id: int = Field(..., description="Heat ID")
+    round_id: int = Field(..., description="Round ID")
+    round_name: str = Field(..., description="Name of the round")
+    heat: int = Field(..., description="Heat number within the round")
+    status: str = Field(..., description="Heat status")
+    lanes: List[BoardLane] = Field(..., description="Lanes in lane order")
+
+
+class RaceBoard(BaseModel):
+    """Schema for the now-racing board"""
+    track: str = Field(..., description="Track the board is for")
+    version: int = Field(..., description="Incremented whenever the board changes")
+    updated_at: datetime = Field(..., description="When the board last changed")
+    current: Optional[BoardHeat] = Field(None, description="Heat running, or next to run")
+    on_deck: List[BoardHeat] = Field(..., description="Heats following the current one")
+    last_result: Optional[BoardHeat] = Field(
+        None, description="Most recently completed heat with results"
+    )
+    remaining: int = Field(..., description="Heats still to run")
+
+
+class ItineraryHeat(BaseModel):
+    """Schema for one of a racer's remaining heats"""
+    heat_id: int = Field(..., description="Heat ID")
+    round_id: int = Field(..., description="Round ID")
+    round_name: str = Field(..., description="Name of the round")
+    heat: int = Field(..., description="Heat number within the round")
+    status: str = Field(..., description="Heat status")
+    lane: int = Field(..., description="Lane the racer runs in")
+    position: int = Field(..., description="Heats ahead in the queue; 0 is on the track or next up")
+    eta: datetime = Field(..., description="Estimated start time (UTC)")
+
+
+class RacerItinerary(BaseModel):
+    """Schema for a racer's remaining heats"""
+    racer_id: int = Field(..., description="Racer ID")
+    racer_name: str = Field(..., description="Name of the racer")
+    car_number: Optional[str] = Field(None, description="Car number")
+    cycle_time: float = Field(..., description="Average seconds per heat used for the ETAs")
+    heats: List[ItineraryHeat] = Field(..., description="Remaining heats in running order")
@@ -36,6 +36,9 @@ class HeatResponse(HeatBase):
     id: int = Field(..., description="Heat ID")
     status: str = Field(..., description="Heat status")
     completed_time: Optional[datetime] = Field(None, description="When the heat was completed")
+    version: int = Field(
+        0, description="Incremented whenever the heat's lanes, status or results change"
+    )
     
     class Config:
         from_attributes = True
@@ -0,0 +1,32 @@
+# backend/api/schemas/profiling.py
+"""
+Profiling schemas for API requests and responses
+"""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class ProfilingSamplingRequest(BaseModel):
+    """Schema for opening a background sampling window"""
+    every: int = Field(..., ge=1, description="Profile one request in this many")
+    duration: float = Field(..., gt=0, le=3600, description="How long to keep sampling, in seconds")
+    mode: Literal["cprofile", "sample"] = Field(
+        "sample", description="Profiler to use for sampled requests"
+    )
+
+
+class ProfilingSamplingStatus(BaseModel):
+    """Schema for the state of the sampling window"""
+    active: bool = Field(..., description="Whether requests are currently being sampled")
+    every: int = Field(..., description="One request in this many is profiled")
+    mode: str = Field(..., description="Profiler used for sampled requests")
+    remaining_seconds: float = Field(..., description="Time left in the sampling window")
+    requests_seen: int = Field(..., description="Requests seen since the window opened")
+
+
+class ProfileFile(BaseModel):
+    """Schema for a profile written to disk"""
+    name: str = Field(..., description="File name in the profiles directory")
+    size: int = Field(..., description="File size in bytes")
@@ -4,8 +4,12 @@ Racer schemas for API requests and responses
 """
 
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import List, Optional
+import re
+from pydantic import BaseModel, Field, computed_field
+
+# Racer.imagefile holds the SHA-256 digest of an uploaded photo
+PHOTO_DIGEST = re.compile(r"^[0-9a-f]{64}$")
 
 
 class RacerBase(BaseModel):
@@ -16,6 +20,7 @@ class RacerBase(BaseModel):
     rankid: Optional[int] = Field(None, description="ID of the racer's rank (if applicable)")
     carno: Optional[str] = Field(None, description="Car number")
     carname: Optional[str] = Field(None, description="Car name")
+    barcode: Optional[str] = Field(None, description="Barcode printed on the car tag")
 
 
 class RacerCreate(RacerBase):
@@ -36,10 +41,18 @@ class RacerResponse(RacerBase):
     """Schema for racer responses"""
     id: int = Field(..., description="Racer ID")
     exclude: bool = Field(False, description="Whether the racer is excluded from races")
+    checkin_status: str = Field("registered", description="Check-in status")
     imagefile: Optional[str] = Field(None, description="Path to racer's image file")
     created_at: datetime = Field(..., description="When the racer was created")
     updated_at: datetime = Field(..., description="When the racer was last updated")
     
+    @computed_field(description="URL of the racer's photo at display size")
+    @property
+    def photo_url(self) -> Optional[str]:
+        if self.imagefile and PHOTO_DIGEST.match(self.imagefile):
+            return f"/api/photos/{self.imagefile}/display.jpg"
+        return None
+    
     class Config:
         from_attributes = True
 
@@ -50,4 +63,58 @@ class RacerDetail(RacerResponse):
     rank_name: Optional[str] = Field(None, description="Name of racer's rank")
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class CheckinRequest(BaseModel):
+    """Schema for updating a single racer's check-in status"""
+    status: str = Field(
+        ..., description="Check-in status (registered, checked_in, passed_inspection)"
+    )
+
+
+class CheckinScan(BaseModel):
+    """Schema for a single scanned car tag"""
+    code: str = Field(..., description="Scanned barcode or car number")
+    status: str = Field("checked_in", description="Check-in status to apply")
+
+
+class BatchCheckinRequest(BaseModel):
+    """Schema for applying many check-in scans at once"""
+    scans: List[CheckinScan] = Field(..., description="Scans in the order they were read")
+
+
+class CheckinResult(BaseModel):
+    """Schema for the outcome of a single check-in scan"""
+    code: str = Field(..., description="Scanned barcode or car number")
+    found: bool = Field(..., description="Whether the code matched exactly one racer")
+    ambiguous: bool = Field(False, description="Whether several racers share the car number")
+    candidate_ids: List[int] = Field([], description="Racers sharing the car number, if ambiguous")
+    racer_id: Optional[int] = Field(None, description="Matched racer ID")
+    divisionid: Optional[int] = Field(None, description="Matched racer's division ID")
+    exclude: bool = Field(False, description="Whether the matched racer is excluded from races")
+    status: Optional[str] = Field(None, description="Check-in status applied")
+
+
+class BatchCheckinResponse(BaseModel):
+    """Schema for batch check-in responses"""
+    updated: int = Field(..., description="Number of racers updated")
+    not_found: int = Field(..., description="Number of scans that matched no racer")
+    ambiguous: int = Field(0, description="Number of scans that matched more than one racer")
+    results: List[CheckinResult] = Field(..., description="Per-scan outcomes, in request order")
+
+
+class RacerImportError(BaseModel):
+    """Schema for a single problem found while importing racers"""
+    row: int = Field(..., description="Spreadsheet row number (header is row 1)")
+    field: Optional[str] = Field(None, description="Field that failed validation")
+    message: str = Field(..., description="Description of the problem")
+
+
+class RacerImportResponse(BaseModel):
+    """Schema for bulk racer import results"""
+    total_rows: int = Field(..., description="Number of non-blank data rows read")
+    imported: int = Field(..., description="Number of racers imported")
+    failed: int = Field(..., description="Number of rows rejected")
+    dry_run: bool = Field(False, description="Whether the import was validated only")
+    errors: List[RacerImportError] = Field([], description="Per-row validation errors")
@@ -0,0 +1,74 @@
+# backend/api/schemas/report.py
+"""
+Report schemas for API requests and responses
+"""
+
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class CertificateRequest(BaseModel):
+    """Schema for requesting award certificates"""
+    award_id: Optional[int] = Field(None, description="Only this award's winners")
+    racer_id: Optional[int] = Field(None, description="Only this racer's certificates")
+    award_type: Optional[Literal["winner", "participant", "speed", "design", "custom"]] = Field(
+        None,
+        description=(
+            "Kind of certificate; participant and custom go to every racer "
+            "unless racer_id is set"
+        ),
+    )
+    title: Optional[str] = Field(None, description="Title overriding the award's own")
+    description: Optional[str] = Field(None, description="Line printed under the racer's name")
+    format: Literal["pdf", "zip"] = Field(
+        "pdf", description="One PDF, or a ZIP of PDFs rendered in parallel"
+    )
+
+
+class RacerResultResponse(BaseModel):
+    """Schema for a racer's line in standings or a race report"""
+    racer_id: int = Field(..., description="Racer ID")
+    first_name: str = Field(..., description="Racer first name")
+    last_name: str = Field(..., description="Racer last name")
+    car_number: Optional[str] = Field(None, description="Car number")
+    rank: str = Field(..., description="Racer rank, empty if none")
+    den: Optional[str] = Field(None, description="Racer division")
+    total_points: int = Field(..., description="Points from finishing places")
+    avg_time: Optional[float] = Field(None, description="Average race time in seconds")
+    fastest_time: Optional[float] = Field(None, description="Fastest race time in seconds")
+    races_completed: int = Field(..., description="Number of heats completed")
+    position: int = Field(..., description="Position, fastest average first")
+
+
+class RaceSummaryResponse(BaseModel):
+    """Schema for a round's place in the results listing"""
+    race_id: int = Field(..., description="Round ID")
+    name: str = Field(..., description="Round name")
+    race_type: str = Field(..., description="Chart type of the round")
+    phase: str = Field(..., description="Round phase")
+    status: Literal["pending", "in_progress", "completed"] = Field(..., description="Racing status")
+    total_heats: int = Field(..., description="Number of heats in the round")
+    completed_heats: int = Field(..., description="Number of heats completed")
+    completed_at: Optional[datetime] = Field(
+        None, description="When the last heat finished, once all have"
+    )
+
+
+class RaceReportResponse(RaceSummaryResponse):
+    """Schema for a round's results"""
+    results: List[RacerResultResponse] = Field(..., description="Racers in finishing order")
+
+
+class RacerHistoryEntry(BaseModel):
+    """Schema for one round in a racer's history"""
+    race_id: int = Field(..., description="Round ID")
+    race_name: str = Field(..., description="Round name")
+    phase: str = Field(..., description="Round phase")
+    position: int = Field(..., description="Racer's position in the round")
+    total_points: int = Field(..., description="Points earned in the round")
+    avg_time: Optional[float] = Field(None, description="Average time in the round")
+    fastest_time: Optional[float] = Field(None, description="Fastest time in the round")
+    races_completed: int = Field(..., description="Heats completed in the round")
+    race_date: Optional[datetime] = Field(None, description="When the racer last ran in the round")
@@ -3,6 +3,7 @@
 Race result schemas for API requests and responses
 """
 
+from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
@@ -28,6 +29,11 @@ class ResultUpdate(BaseModel):
     completed: Optional[bool] = Field(None, description="Whether the result is final")
 
 
+class LaneResultUpdate(ResultUpdate):
+    """Schema for correcting a single lane result"""
+    racer_id: Optional[int] = Field(None, description="ID of the racer in this lane")
+
+
 class ResultResponse(ResultBase):
     """Schema for result responses"""
     id: int = Field(..., description="Result ID")
@@ -51,7 +57,14 @@ class ResultDetail(ResultResponse):
 class HeatResultRequest(BaseModel):
     """Schema for submitting multiple results for a heat"""
     heat_id: int = Field(..., description="ID of the heat")
-    results: List[ResultCreate] = Field(..., description="List of results for each lane")
+    results: List[ResultCreate] = Field(
+        ...,
+        min_length=1,
+        description=(
+            "List of results for each lane; "
+            "clear a heat with DELETE /api/results/heat/{heat_id}"
+        ),
+    )
 
 
 class HeatResultsResponse(BaseModel):
@@ -60,4 +73,27 @@ class HeatResultsResponse(BaseModel):
     round_name: str = Field(..., description="Name of the round")
     heat_number: int = Field(..., description="Heat number")
     results: List[ResultDetail] = Field(..., description="Results for each lane")
-    completed: bool = Field(..., description="Whether all results are final")
\ No newline at end of file
+    completed: bool = Field(..., description="Whether all results are final")
+
+
+class BatchHeatResultsRequest(BaseModel):
+    """Schema for submitting results for many heats at once"""
+    heats: List[HeatResultRequest] = Field(
+        ..., min_length=1, description="Heat result submissions, oldest first"
+    )
+
+
+class HeatResultAck(BaseModel):
+    """Schema for acknowledging a recorded heat"""
+    heat_id: int = Field(..., description="Heat ID")
+    round_id: int = Field(..., description="Round ID")
+    heat_number: int = Field(..., description="Heat number")
+    status: str = Field(..., description="Heat status after recording")
+    lanes_recorded: int = Field(..., description="Number of lane results stored")
+    completed_time: Optional[datetime] = Field(None, description="When the heat was completed")
+
+
+class BatchHeatResultsResponse(BaseModel):
+    """Schema for batch heat result submission responses"""
+    heats_recorded: int = Field(..., description="Number of distinct heats recorded")
+    heats: List[HeatResultAck] = Field(..., description="Acknowledgement for each heat")
@@ -0,0 +1,54 @@
+# backend/api/schemas/round_chart.py
+"""
+Round chart schemas for API responses
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class RoundChartInfo(BaseModel):
+    """Schema for the round a chart belongs to"""
+    id: int = Field(..., description="Round ID")
+    name: str = Field(..., description="Round name")
+    phase: str = Field(..., description="Round phase")
+    charttype: str = Field(..., description="Chart type for display")
+
+
+class RoundChartHeats(BaseModel):
+    """Heat columns of a round chart, in running order"""
+    id: List[int] = Field(..., description="Heat IDs")
+    heat: List[int] = Field(..., description="Heat numbers")
+    status: List[str] = Field(..., description="Heat statuses")
+    completed_time: List[Optional[datetime]] = Field(
+        ..., description="When each heat was completed"
+    )
+    version: List[int] = Field(..., description="Heat versions")
+
+
+class RoundChartRacers(BaseModel):
+    """Racer columns of a round chart, one entry per racer"""
+    id: List[int] = Field(..., description="Racer IDs")
+    name: List[str] = Field(..., description="Racer names")
+    car_number: List[Optional[str]] = Field(..., description="Car numbers")
+
+
+class RoundChartLanes(BaseModel):
+    """Lane columns of a round chart, ordered by heat then lane"""
+    heat: List[int] = Field(..., description="Index into the heat columns")
+    lane: List[int] = Field(..., description="Lane numbers")
+    racer: List[int] = Field(..., description="Index into the racer columns")
+    time: List[Optional[float]] = Field(..., description="Race time in seconds, if run")
+    place: List[Optional[int]] = Field(..., description="Finishing position, if run")
+
+
+class RoundChart(BaseModel):
+    """Schema for a round's complete heat chart in columnar form"""
+    round: RoundChartInfo = Field(..., description="The round")
+    version: str = Field(..., description="Changes whenever anything on the chart changes")
+    lane_count: int = Field(..., description="Highest lane number used")
+    heats: RoundChartHeats = Field(..., description="Heats")
+    racers: RoundChartRacers = Field(..., description="Racers referenced by the lanes")
+    lanes: RoundChartLanes = Field(..., description="Lane assignments with any results")
@@ -4,10 +4,74 @@ Service imports and aggregation for Derby Director
 """
 
 from .timer import TimerService, TimerFactory, TimerInterface
+from .racer_search import apply_racer_search, build_fts_query
+from .checkin_index import CheckinIndex, CheckinEntry, checkin_index, load_checkin_index
+from .racer_import import RacerImporter, iter_upload_rows
+from .result_recorder import ResultRecorder, MissingRecordError
+from .journal import ResultJournal, result_journal, iter_journal
+from .race_scheduler import RaceScheduler
+from .metrics import metrics, MetricsRegistry
+from .profiling import RequestProfiler, request_profiler
+from .loop_monitor import LoopMonitor, loop_monitor, start_loop_monitor, stop_loop_monitor
+from .photos import PhotoStore, photo_store
+from .render_pool import RenderPool, render_pool
+from .certificates import CertificateService, stream_certificates_pdf, stream_certificates_zip
+from .heat_charts import HeatChartService, stream_heat_chart, stream_pit_cards
+from .round_charts import round_chart_version, load_round_chart
+from .race_analytics import RaceAnalytics, race_analytics, load_race_analytics
+from .race_queue import RaceQueue, race_queue, load_race_queue
+from .results_publisher import ResultsPublisher, results_publisher, publish_results
+from .heat_events import heats_changed, round_changed, racers_changed
 
 # List of all services for easy import
 __all__ = [
     'TimerService',
     'TimerFactory',
     'TimerInterface',
+    'apply_racer_search',
+    'build_fts_query',
+    'CheckinIndex',
+    'CheckinEntry',
+    'checkin_index',
+    'load_checkin_index',
+    'RacerImporter',
+    'iter_upload_rows',
+    'ResultRecorder',
+    'MissingRecordError',
+    'ResultJournal',
+    'result_journal',
+    'iter_journal',
+    'RaceScheduler',
+    'metrics',
+    'MetricsRegistry',
+    'RequestProfiler',
+    'request_profiler',
+    'LoopMonitor',
+    'loop_monitor',
+    'start_loop_monitor',
+    'stop_loop_monitor',
+    'PhotoStore',
+    'photo_store',
+    'RenderPool',
+    'render_pool',
+    'CertificateService',
+    'stream_certificates_pdf',
+    'stream_certificates_zip',
+    'HeatChartService',
+    'stream_heat_chart',
+    'stream_pit_cards',
+    'RaceAnalytics',
+    'race_analytics',
+    'load_race_analytics',
+    'round_chart_version',
+    'load_round_chart',
+    'RaceQueue',
+    'race_queue',
+    'load_race_queue',
+    'ResultsPublisher',
+    'results_publisher',
+    'publish_results',
+    'heats_changed',
+    'round_changed',
+    'racers_changed',
 ]
\ No newline at end of file
@@ -0,0 +1,325 @@
+# backend/api/services/certificates.py
+"""
+Award certificate generation for Derby Director
+
+Certificates are rendered with reportlab in the shared render pool. Each
+document draws the parts every certificate shares (border, organization,
+event name, logo, signature lines) once into a PDF form XObject and places
+that on every page, so a 600 page document carries the artwork once. Within
+a worker process, the name font is registered once and decoded images are
+cached, so later batches skip that work entirely.
+
+Large batches are split into files of CERTIFICATES_PER_FILE pages rendered
+in parallel and streamed back as a ZIP in order, each file as soon as it
+and the ones before it are ready. A single merged PDF is rendered by one
+worker (there is no PDF merging library in the dependency set) and streamed
+back once complete.
+"""
+
+import io
+import zipfile
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.models import Award, AwardWinner, Division, Racer, Settings
+from backend.api.services.photos import photo_store
+from backend.api.services.render_pool import render_pool
+from backend.config import CERTIFICATE_FONT, CERTIFICATE_LOGO
+
+# Pages per file when streaming a ZIP
+CERTIFICATES_PER_FILE = 50
+
+# Bytes per chunk when streaming a finished PDF
+STREAM_CHUNK_SIZE = 64 * 1024
+
+AWARD_DESCRIPTIONS = {
+    "speed": "for outstanding speed on the track",
+    "design": "for outstanding car design",
+    "participant": "for building a car and racing in the",
+}
+
+
+class Certificate(NamedTuple):
+    """What is printed on one certificate"""
+    name: str
+    carno: str
+    division: str
+    title: str
+    place: Optional[int]
+    description: str
+    photo: Optional[str]
+
+
+class CertificateTemplate(NamedTuple):
+    """What every certificate in a batch shares"""
+    event_name: str
+    organization: str
+    logo: Optional[str]
+    font: Optional[str]
+
+
+def ordinal(place: int) -> str:
+    if 10 <= place % 100 <= 20:
+        suffix = "th"
+    else:
+        suffix = {1: "st", 2: "nd", 3: "rd"}.get(place % 10, "th")
+    return f"{place}{suffix}"
+
+
+# Worker-side caches; each worker process keeps its own
+
+_registered_fonts: Dict[str, str] = {}
+
+
+def _name_font(path: Optional[str]) -> str:
+    """Font name for racer names, registering a TrueType font on first use"""
+    if not path:
+        return "Times-BoldItalic"
+    if path not in _registered_fonts:
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+
+        name = f"CertificateFont{len(_registered_fonts)}"
+        pdfmetrics.registerFont(TTFont(name, path))
+        _registered_fonts[path] = name
+    return _registered_fonts[path]
+
+
+@lru_cache(maxsize=256)
+def _image(path: str):
+    from reportlab.lib.utils import ImageReader
+
+    return ImageReader(path)
+
+
+def _draw_template(c, template: CertificateTemplate, width: float, height: float) -> None:
+    from reportlab.lib import colors
+
+    c.setStrokeColor(colors.HexColor("#1f3a68"))
+    c.setLineWidth(6)
+    c.rect(24, 24, width - 48, height - 48)
+    c.setLineWidth(1.5)
+    c.rect(36, 36, width - 72, height - 72)
+
+    if template.logo:
+        c.drawImage(_image(template.logo), 60, height - 150, width=90, height=90,
+                    preserveAspectRatio=True, mask="auto")
+
+    c.setFillColor(colors.HexColor("#1f3a68"))
+    c.setFont("Helvetica", 16)
+    c.drawCentredString(width / 2, height - 80, template.organization)
+    c.setFont("Helvetica-Bold", 30)
+    c.drawCentredString(width / 2, height - 120, template.event_name)
+
+    c.setFillColor(colors.black)
+    c.setLineWidth(0.75)
+    for x in (width * 0.2, width * 0.6):
+        c.line(x, 95, x + width * 0.2, 95)
+    c.setFont("Helvetica", 10)
+    c.drawCentredString(width * 0.3, 80, "Race Director")
+    c.drawCentredString(width * 0.7, 80, "Date")
+
+
+def _draw_certificate(
+    c, certificate: Certificate, name_font: str, width: float, height: float
+) -> None:
+    text_center = width / 2 if not certificate.photo else width * 0.42
+
+    c.setFont("Helvetica-Bold", 26)
+    c.drawCentredString(text_center, height - 200, certificate.title)
+    if certificate.place:
+        c.setFont("Helvetica", 18)
+        c.drawCentredString(text_center, height - 228, f"{ordinal(certificate.place)} Place")
+
+    c.setFont("Helvetica", 13)
+    c.drawCentredString(text_center, height - 270, "is presented to")
+    c.setFont(name_font, 40)
+    c.drawCentredString(text_center, height - 320, certificate.name)
+
+    c.setFont("Helvetica", 13)
+    details = " - ".join(part for part in (f"Car #{certificate.carno}" if certificate.carno else "",
+                                           certificate.division) if part)
+    c.drawCentredString(text_center, height - 348, details)
+    c.drawCentredString(text_center, height - 380, certificate.description)
+
+    if certificate.photo:
+        c.drawImage(_image(certificate.photo), width * 0.7, height - 400, width=width * 0.22,
+                    height=220, preserveAspectRatio=True, anchor="c")
+
+
+def render_certificates(
+    template: CertificateTemplate, certificates: Sequence[Certificate]
+) -> bytes:
+    """Render certificates into one PDF (runs in a worker process)"""
+    from reportlab.lib.pagesizes import landscape, letter
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    width, height = landscape(letter)
+    c = canvas.Canvas(buffer, pagesize=(width, height), pageCompression=1)
+    c.setTitle(f"{template.event_name} certificates")
+
+    c.beginForm("template")
+    _draw_template(c, template, width, height)
+    c.endForm()
+
+    name_font = _name_font(template.font)
+    for certificate in certificates:
+        c.doForm("template")
+        _draw_certificate(c, certificate, name_font, width, height)
+        c.showPage()
+
+    c.save()
+    return buffer.getvalue()
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only, unseekable sink that hands out what ZipFile has written so far"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer.extend(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+class CertificateService:
+    """Collects certificate data and streams rendered certificates"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def template(self) -> CertificateTemplate:
+        rows = await self.session.execute(
+            select(Settings.key, Settings.value).where(
+                Settings.key.in_(("event_name", "organization"))
+            )
+        )
+        settings = dict(rows.all())
+        return CertificateTemplate(
+            event_name=settings.get("event_name", "Pinewood Derby"),
+            organization=settings.get("organization", ""),
+            logo=CERTIFICATE_LOGO or None,
+            font=CERTIFICATE_FONT or None,
+        )
+
+    async def collect(
+        self,
+        award_id: Optional[int] = None,
+        racer_id: Optional[int] = None,
+        award_type: Optional[str] = None,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+    ) -> List[Certificate]:
+        """
+        Certificates to print.
+
+        Award winners by default, narrowed by award, racer or award type.
+        "participant" and "custom" certificates go to one racer, or to every
+        racer taking part when no racer is given.
+        """
+        if award_type in ("participant", "custom"):
+            if award_type == "custom" and not title:
+                raise ValueError("Custom certificates need a title")
+            return await self._participants(racer_id, award_type, title, description)
+
+        query = (
+            select(AwardWinner.place, Award.title, Award.awardtype, Racer.firstname, Racer.lastname,
+                   Racer.carno, Racer.imagefile, Division.name)
+            .join(Award, AwardWinner.award_id == Award.id)
+            .join(Racer, AwardWinner.racer_id == Racer.id)
+            .join(Division, Racer.divisionid == Division.id)
+            .order_by(Award.sort_order, Award.id, AwardWinner.place)
+        )
+        if award_id is not None:
+            query = query.where(Award.id == award_id)
+        if racer_id is not None:
+            query = query.where(Racer.id == racer_id)
+        if award_type in AWARD_DESCRIPTIONS:
+            query = query.where(Award.awardtype == award_type)
+
+        rows = await self.session.execute(query)
+        return [
+            Certificate(
+                name=f"{first} {last}",
+                carno=carno or "",
+                division=division,
+                title=title or award_title,
+                place=place,
+                description=description or AWARD_DESCRIPTIONS.get(kind, ""),
+                photo=self._photo(imagefile),
+            )
+            for place, award_title, kind, first, last, carno, imagefile, division in rows
+        ]
+
+    async def _participants(self, racer_id: Optional[int], award_type: str,
+                            title: Optional[str], description: Optional[str]) -> List[Certificate]:
+        query = (
+            select(Racer.firstname, Racer.lastname, Racer.carno, Racer.imagefile, Division.name)
+            .join(Division, Racer.divisionid == Division.id)
+            .order_by(Division.sort_order, Racer.lastname, Racer.firstname)
+        )
+        if racer_id is not None:
+            query = query.where(Racer.id == racer_id)
+        else:
+            query = query.where(Racer.exclude.is_(False))
+
+        template = await self.template()
+        default_description = f"{AWARD_DESCRIPTIONS['participant']} {template.event_name}"
+        return [
+            Certificate(
+                name=f"{first} {last}",
+                carno=carno or "",
+                division=division,
+                title=title or "Certificate of Participation",
+                place=None,
+                description=description or ("" if award_type == "custom" else default_description),
+                photo=self._photo(imagefile),
+            )
+            for first, last, carno, imagefile, division in await self.session.execute(query)
+        ]
+
+    @staticmethod
+    def _photo(imagefile: Optional[str]) -> Optional[str]:
+        path = photo_store.variant_path(imagefile, "print") if imagefile else None
+        return str(path) if path else None
+
+
+async def stream_certificates_pdf(template: CertificateTemplate,
+                                  certificates: List[Certificate]) -> AsyncIterator[bytes]:
+    """All certificates as one PDF"""
+    pdf = await render_pool.run(render_certificates, template, certificates)
+    for start in range(0, len(pdf), STREAM_CHUNK_SIZE):
+        yield pdf[start:start + STREAM_CHUNK_SIZE]
+
+
+async def stream_certificates_zip(template: CertificateTemplate, certificates: List[Certificate],
+                                  per_file: int = CERTIFICATES_PER_FILE) -> AsyncIterator[bytes]:
+    """Certificates split into PDFs rendered in parallel, streamed as a ZIP in order"""
+    starts = range(0, len(certificates), per_file)
+    batches = [certificates[start:start + per_file] for start in starts]
+    sink = _ZipStream()
+
+    # The PDFs are already compressed
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+        results = render_pool.map_ordered(
+            render_certificates, ((template, batch) for batch in batches)
+        )
+        number = 0
+        async for pdf in results:
+            number += 1
+            archive.writestr(f"certificates-{number:03d}.pdf", pdf)
+            yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,160 @@
+# backend/api/services/checkin_index.py
+"""
+In-memory check-in lookup index for Derby Director.
+
+Check-in stations scan car tags continuously, so resolving a scanned car number
+or barcode must not cost a database round trip. The index maps both to a small
+entry per racer; it is loaded once per process and kept coherent by the racer
+create, update and delete handlers.
+
+Barcodes are unique, car numbers are not: racers in different divisions may
+share one. A car number held by more than one racer is ambiguous, and lookup()
+refuses to guess which racer was meant.
+"""
+
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.models import Racer
+
+logger = logging.getLogger(__name__)
+
+
+class CheckinEntry(NamedTuple):
+    """Lookup result for a scanned car tag"""
+    racer_id: int
+    divisionid: int
+    exclude: bool
+    carno: Optional[str]
+    barcode: Optional[str]
+
+
+def normalize_code(code: Optional[str]) -> Optional[str]:
+    """Normalize a car number or barcode so scans match regardless of case/padding"""
+    if code is None:
+        return None
+    code = code.strip().upper()
+    return code or None
+
+
+class CheckinIndex:
+    """Process-wide index from car number and barcode to racer"""
+
+    def __init__(self):
+        self._by_id: Dict[int, CheckinEntry] = {}
+        self._by_carno: Dict[str, Set[int]] = {}
+        self._by_barcode: Dict[str, int] = {}
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._by_id.clear()
+        self._by_carno.clear()
+        self._by_barcode.clear()
+        self.loaded = False
+
+    async def load(self, session: AsyncSession) -> None:
+        """(Re)build the index from the racers table"""
+        query = select(
+            Racer.id, Racer.divisionid, Racer.exclude, Racer.carno, Racer.barcode
+        )
+        result = await session.execute(query)
+
+        self.clear()
+        for racer_id, divisionid, exclude, carno, barcode in result:
+            self._add(CheckinEntry(racer_id, divisionid, bool(exclude), carno, barcode))
+        self.loaded = True
+
+        logger.info(f"Check-in index loaded with {len(self)} racers")
+
+    async def ensure_loaded(self, session: AsyncSession) -> None:
+        """Load the index if startup loading was skipped or failed"""
+        if not self.loaded:
+            await self.load(session)
+
+    def _add(self, entry: CheckinEntry) -> None:
+        self._by_id[entry.racer_id] = entry
+
+        carno = normalize_code(entry.carno)
+        if carno:
+            self._by_carno.setdefault(carno, set()).add(entry.racer_id)
+
+        barcode = normalize_code(entry.barcode)
+        if barcode:
+            self._by_barcode[barcode] = entry.racer_id
+
+    def remove(self, racer_id: int) -> None:
+        """Remove a racer from the index"""
+        entry = self._by_id.pop(racer_id, None)
+        if entry is None:
+            return
+
+        carno = normalize_code(entry.carno)
+        holders = self._by_carno.get(carno) if carno else None
+        if holders is not None:
+            holders.discard(racer_id)
+            if not holders:
+                del self._by_carno[carno]
+
+        barcode = normalize_code(entry.barcode)
+        if barcode and self._by_barcode.get(barcode) == racer_id:
+            del self._by_barcode[barcode]
+
+    def upsert(self, racer: Racer) -> None:
+        """Add a racer or refresh its entry after an update"""
+        self.remove(racer.id)
+        self._add(CheckinEntry(
+            racer.id, racer.divisionid, bool(racer.exclude), racer.carno, racer.barcode
+        ))
+
+    def get(self, racer_id: int) -> Optional[CheckinEntry]:
+        """Get the entry for a racer ID"""
+        return self._by_id.get(racer_id)
+
+    def matches(self, code: str) -> List[CheckinEntry]:
+        """Every racer a scanned barcode or car number could mean (barcodes take precedence)"""
+        code = normalize_code(code)
+        if not code:
+            return []
+
+        racer_id = self._by_barcode.get(code)
+        racer_ids = [racer_id] if racer_id is not None else sorted(self._by_carno.get(code, ()))
+        return [self._by_id[racer_id] for racer_id in racer_ids if racer_id in self._by_id]
+
+    def lookup(self, code: str) -> Optional[CheckinEntry]:
+        """Resolve a scan to a single racer; None if nobody or more than one racer matches"""
+        entries = self.matches(code)
+        return entries[0] if len(entries) == 1 else None
+
+    def lookup_many(self, codes: Iterable[str]) -> List[Optional[CheckinEntry]]:
+        """Resolve a batch of scans, preserving order"""
+        return [self.lookup(code) for code in codes]
+
+
+# Shared index for the application process
+checkin_index = CheckinIndex()
+
+
+async def load_checkin_index() -> None:
+    """Startup hook: build the check-in index from the configured database"""
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from backend.config import DATABASE_URL
+
+    engine = create_async_engine(DATABASE_URL)
+    async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+    try:
+        async with async_session() as session:
+            await checkin_index.load(session)
+    except Exception as e:
+        # Not fatal: handlers load the index lazily on first use
+        logger.error(f"Failed to load check-in index at startup: {str(e)}")
+    finally:
+        await engine.dispose()
@@ -0,0 +1,282 @@
+# backend/api/services/heat_charts.py
+"""
+Printable heat charts and pit cards for Derby Director
+
+Everything a chart needs (heats, lane assignments, racers and any results
+so far) comes from one joined query. Pages are laid out in the request,
+drawn in batches by the render pool and written to the client as each
+batch finishes through PdfStreamWriter, so the first page of a 1,000 heat
+chart is on its way while the rest are still being drawn.
+"""
+
+from typing import AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.models import Division, Heat, Racer, RaceResult, RacerHeat, Round
+from backend.api.services.pdf_stream import PageCanvas, PdfStreamWriter, fit_text
+from backend.api.services.render_pool import render_pool
+
+# Landscape and portrait US letter, in points
+CHART_PAGE = (792.0, 612.0)
+CARD_PAGE = (612.0, 792.0)
+
+MARGIN = 36.0
+ROW_HEIGHT = 26.0
+# Rows that fit below the title and lane headings
+CHART_ROWS_PER_PAGE = int((CHART_PAGE[1] - 2 * MARGIN - 56) // ROW_HEIGHT)
+
+CARD_COLUMNS, CARD_ROWS = 2, 3
+CARD_HEAT_LINES = 13
+
+# Pages drawn per render pool job
+PAGES_PER_JOB = 8
+
+
+class ChartLane(NamedTuple):
+    lane: int
+    carno: str
+    name: str
+    time: Optional[float]
+    place: Optional[int]
+
+
+class ChartHeat(NamedTuple):
+    round_name: str
+    heat: int
+    status: str
+    lanes: Tuple[ChartLane, ...]
+
+
+class PitCard(NamedTuple):
+    name: str
+    carno: str
+    division: str
+    heats: Tuple[Tuple[str, int, int], ...]  # round name, heat number, lane
+
+
+# A chart row is either a round heading or a heat
+ChartRow = Union[str, ChartHeat]
+
+
+class HeatChartService:
+    """Loads the heats of a round or division for printing"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def title(
+        self, round_id: Optional[int] = None, division_id: Optional[int] = None
+    ) -> Optional[str]:
+        """Round or division name, or None if it does not exist"""
+        if round_id is not None:
+            return await self.session.scalar(select(Round.name).where(Round.id == round_id))
+        return await self.session.scalar(select(Division.name).where(Division.id == division_id))
+
+    async def load(self, round_id: Optional[int] = None,
+                   division_id: Optional[int] = None) -> Tuple[List[ChartHeat], List[PitCard]]:
+        """Heats in running order, and a pit card per racer, from a single query"""
+        if (round_id is None) == (division_id is None):
+            raise ValueError("Give either a round or a division")
+
+        query = (
+            select(Round.name, Heat.id, Heat.heat, Heat.status, RacerHeat.lane, Racer.id,
+                   Racer.carno, Racer.firstname, Racer.lastname, Division.name,
+                   RaceResult.time, RaceResult.place)
+            .select_from(Heat)
+            .join(Round, Heat.roundid == Round.id)
+            .outerjoin(RacerHeat, RacerHeat.heat_id == Heat.id)
+            .outerjoin(Racer, Racer.id == RacerHeat.racer_id)
+            .outerjoin(Division, Division.id == Racer.divisionid)
+            .outerjoin(
+                RaceResult,
+                and_(RaceResult.heat_id == Heat.id, RaceResult.racer_id == RacerHeat.racer_id),
+            )
+            .order_by(Round.roundno, Round.id, Heat.heat, Heat.id, RacerHeat.lane)
+        )
+        if round_id is not None:
+            query = query.where(Round.id == round_id)
+        else:
+            query = query.where(Round.divisionid == division_id)
+
+        heats: Dict[int, ChartHeat] = {}
+        cards: Dict[int, Tuple[str, str, str, List[Tuple[str, int, int]]]] = {}
+        for (round_name, heat_id, heat_no, status, lane, racer_id, carno, first, last,
+             division, time, place) in await self.session.execute(query):
+            heat = heats.get(heat_id)
+            if heat is None:
+                heat = heats[heat_id] = ChartHeat(round_name, heat_no, status, ())
+            if lane is None:
+                continue
+
+            name = f"{first} {last}"
+            heats[heat_id] = heat._replace(
+                lanes=heat.lanes + (ChartLane(lane, carno or "", name, time, place),)
+            )
+            if racer_id not in cards:
+                cards[racer_id] = (name, carno or "", division or "", [])
+            cards[racer_id][3].append((round_name, heat_no, lane))
+
+        pit_cards = [PitCard(name, carno, division, tuple(entries))
+                     for name, carno, division, entries in cards.values()]
+        pit_cards.sort(key=lambda card: (card.division, _car_sort_key(card.carno), card.name))
+        return list(heats.values()), pit_cards
+
+
+def _car_sort_key(carno: str) -> Tuple[int, str]:
+    return (int(carno), "") if carno.isdigit() else (10 ** 9, carno)
+
+
+def chart_rows(heats: Sequence[ChartHeat]) -> List[ChartRow]:
+    """Heats with a heading row wherever a new round starts"""
+    rows: List[ChartRow] = []
+    current = None
+    for heat in heats:
+        if heat.round_name != current:
+            current = heat.round_name
+            rows.append(current)
+        rows.append(heat)
+    return rows
+
+
+def paginate(items: Sequence, per_page: int) -> List[List]:
+    return [list(items[start:start + per_page]) for start in range(0, len(items), per_page)]
+
+
+# Drawing (runs in worker processes)
+
+def _page_header(canvas: PageCanvas, width: float, height: float, title: str, subtitle: str,
+                 page_no: int, page_total: int) -> None:
+    canvas.text(MARGIN, height - MARGIN - 14, title, size=16, bold=True)
+    canvas.text(MARGIN, height - MARGIN - 28, subtitle, size=9)
+    canvas.text(width - MARGIN, height - MARGIN - 14, f"Page {page_no} of {page_total}",
+                size=9, align="right")
+    canvas.line(MARGIN, height - MARGIN - 34, width - MARGIN, height - MARGIN - 34, width=1)
+
+
+def render_chart_pages(title: str, lane_count: int, pages: List[List[ChartRow]],
+                       first_page: int, page_total: int) -> List[bytes]:
+    """Content streams for a run of heat chart pages"""
+    width, height = CHART_PAGE
+    heat_column = 56.0
+    lane_width = (width - 2 * MARGIN - heat_column) / max(lane_count, 1)
+    contents = []
+
+    for offset, rows in enumerate(pages):
+        canvas = PageCanvas()
+        _page_header(canvas, width, height, title, "Heat chart", first_page + offset, page_total)
+
+        y = height - MARGIN - 40
+        canvas.rect(MARGIN, y - 16, width - 2 * MARGIN, 16)
+        canvas.text(MARGIN + 4, y - 12, "Heat", bold=True)
+        for lane in range(lane_count):
+            canvas.text(
+                MARGIN + heat_column + lane * lane_width + 4, y - 12, f"Lane {lane + 1}", bold=True
+            )
+        y -= 16
+
+        for row in rows:
+            if isinstance(row, str):
+                canvas.text(MARGIN + 4, y - 17, row, size=11, bold=True)
+                canvas.line(MARGIN, y - ROW_HEIGHT, width - MARGIN, y - ROW_HEIGHT)
+                y -= ROW_HEIGHT
+                continue
+
+            canvas.text(MARGIN + 4, y - 12, str(row.heat), size=12, bold=True)
+            if row.status == "completed":
+                canvas.text(MARGIN + 4, y - 22, "done", size=7)
+            for lane in row.lanes:
+                x = MARGIN + heat_column + (lane.lane - 1) * lane_width + 4
+                label = f"#{lane.carno} {lane.name}" if lane.carno else lane.name
+                canvas.text(x, y - 11, fit_text(label, lane_width - 8, 9), size=9)
+                if lane.time is not None:
+                    place = f"  ({lane.place})" if lane.place else ""
+                    canvas.text(x, y - 22, f"{lane.time:.4f}s{place}", size=8)
+                else:
+                    canvas.line(x, y - 22, x + lane_width - 16, y - 22, width=0.3)
+            canvas.line(MARGIN, y - ROW_HEIGHT, width - MARGIN, y - ROW_HEIGHT)
+            y -= ROW_HEIGHT
+
+        contents.append(canvas.content())
+    return contents
+
+
+def render_pit_card_pages(title: str, pages: List[List[PitCard]],
+                          first_page: int, page_total: int) -> List[bytes]:
+    """Content streams for a run of pit card pages"""
+    width, height = CARD_PAGE
+    top = height - MARGIN - 44
+    card_width = (width - 2 * MARGIN) / CARD_COLUMNS
+    card_height = (top - MARGIN) / CARD_ROWS
+    contents = []
+
+    for offset, cards in enumerate(pages):
+        canvas = PageCanvas()
+        _page_header(canvas, width, height, title, "Pit cards", first_page + offset, page_total)
+
+        for index, card in enumerate(cards):
+            column, row = index % CARD_COLUMNS, index // CARD_COLUMNS
+            x = MARGIN + column * card_width + 6
+            y = top - row * card_height - 6
+            inner = card_width - 12
+            canvas.box(x, y - card_height + 12, inner, card_height - 12)
+
+            canvas.text(x + 8, y - 24, f"#{card.carno}" if card.carno else "", size=20, bold=True)
+            canvas.text(x + inner - 8, y - 18, fit_text(card.name, inner * 0.6, 11, bold=True),
+                        size=11, bold=True, align="right")
+            canvas.text(x + inner - 8, y - 30, fit_text(card.division, inner * 0.6, 9),
+                        size=9, align="right")
+
+            line_y = y - 46
+            canvas.rect(x + 4, line_y - 3, inner - 8, 13)
+            canvas.text(x + 8, line_y, "Round", size=8, bold=True)
+            canvas.text(x + inner - 70, line_y, "Heat", size=8, bold=True)
+            canvas.text(x + inner - 30, line_y, "Lane", size=8, bold=True)
+
+            shown = card.heats
+            if len(shown) > CARD_HEAT_LINES:
+                shown = shown[:CARD_HEAT_LINES - 1]
+            for round_name, heat_no, lane in shown:
+                line_y -= 12
+                canvas.text(x + 8, line_y, fit_text(round_name, inner - 90, 8), size=8)
+                canvas.text(x + inner - 62, line_y, str(heat_no), size=9, align="right")
+                canvas.text(x + inner - 22, line_y, str(lane), size=9, bold=True, align="right")
+            if len(shown) < len(card.heats):
+                canvas.text(
+                    x + 8, line_y - 12, f"+ {len(card.heats) - len(shown)} more heats", size=8
+                )
+
+        contents.append(canvas.content())
+    return contents
+
+
+async def _stream_pages(page_size: Tuple[float, float], title: str, pages: List[List],
+                        render: Callable[..., List[bytes]], *args) -> AsyncIterator[bytes]:
+    writer = PdfStreamWriter(page_size, title)
+    yield writer.start()
+
+    jobs = (
+        (*args, pages[start:start + PAGES_PER_JOB], start + 1, len(pages))
+        for start in range(0, len(pages), PAGES_PER_JOB)
+    )
+    async for contents in render_pool.map_ordered(render, jobs):
+        for content in contents:
+            yield writer.page(content)
+
+    yield writer.finish()
+
+
+def stream_heat_chart(title: str, heats: List[ChartHeat]) -> AsyncIterator[bytes]:
+    """Heat chart PDF, streamed as pages are drawn"""
+    lane_count = max((lane.lane for heat in heats for lane in heat.lanes), default=1)
+    pages = paginate(chart_rows(heats), CHART_ROWS_PER_PAGE)
+    return _stream_pages(
+        CHART_PAGE, f"{title} heat chart", pages, render_chart_pages, title, lane_count
+    )
+
+
+def stream_pit_cards(title: str, cards: List[PitCard]) -> AsyncIterator[bytes]:
+    """Pit card PDF, streamed as pages are drawn"""
+    pages = paginate(cards, CARD_COLUMNS * CARD_ROWS)
+    return _stream_pages(CARD_PAGE, f"{title} pit cards", pages, render_pit_card_pages, title)
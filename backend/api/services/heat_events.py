@@ -0,0 +1,45 @@
+# backend/api/services/heat_events.py
+"""
+Change notifications for in-memory views of the race schedule.
+
+The race analytics and the race queue both mirror heats in memory, and the
+results publisher writes static files from the analytics. Every write that
+changes heats, rounds or racers calls one of these once it has committed,
+and each view refreshes just the records involved. The in-memory views are
+refreshed before the request returns; the static files are published in the
+background.
+"""
+
+from typing import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .race_analytics import race_analytics
+from .race_queue import race_queue
+from .results_publisher import results_publisher
+
+
+async def heats_changed(session: AsyncSession, heat_ids: Iterable[int]) -> None:
+    """Heats were scheduled, edited, started, completed, cleared or deleted"""
+    heat_ids = set(heat_ids)
+    # Deleted heats are gone from the analytics after the refresh
+    rounds = race_analytics.heat_rounds(heat_ids)
+    await race_analytics.refresh_heats(session, heat_ids)
+    await race_queue.refresh_heats(session, heat_ids)
+    results_publisher.schedule(round_ids=rounds, heat_ids=heat_ids)
+
+
+async def round_changed(session: AsyncSession, round_id: int) -> None:
+    """A round was created, edited, deleted or had heats generated"""
+    await race_analytics.refresh_round(session, round_id)
+    await race_queue.refresh_round(session, round_id)
+    results_publisher.schedule(round_ids=[round_id])
+
+
+async def racers_changed(session: AsyncSession, racer_ids: Iterable[int]) -> None:
+    """Racers were created, edited or deleted"""
+    racer_ids = set(racer_ids)
+    rounds = race_analytics.racer_rounds(racer_ids)
+    await race_analytics.refresh_racers(session, racer_ids)
+    await race_queue.refresh_racers(session, racer_ids)
+    results_publisher.schedule(round_ids=rounds, racer_ids=racer_ids)
@@ -0,0 +1,225 @@
+# backend/api/services/journal.py
+"""
+Append-only result journal for Derby Director.
+
+Every result submission, lane correction, result deletion, heat update,
+schedule generation and heat deletion is appended to a journal file as a
+compact record. The journal is the audit trail for corrections and a rebuild
+log: backend/migrations/replay_journal.py rebuilds race_results, heat status
+and standings from it, for example into a database restored from a backup or
+after the database file is damaged.
+
+Records are appended after the database transaction commits, so the journal
+never holds a change the database rolled back, but it is not crash recovery
+for the database: a crash between the commit and the fsync loses the record
+while the change itself survives in the database. Replaying into a database
+that already has a change is harmless, since replay sets final state rather
+than re-applying deltas.
+
+Record layout: 4-byte big-endian payload length, 4-byte CRC32 of the payload,
+then the payload as compact JSON. A torn write at the end of the file (from a
+crash mid-append) fails the length or CRC check and is discarded.
+
+Writes are group-committed: records appended within JOURNAL_FSYNC_INTERVAL of
+each other share a single write + fsync, and append() returns once the record
+is durable.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">II")
+
+# Upper bound on a single record; anything larger is treated as corruption
+MAX_RECORD_SIZE = 16 * 1024 * 1024
+
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    """Encode a record as header + compact JSON payload"""
+    payload = json.dumps(record, separators=(",", ":")).encode()
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def scan_journal(path: Path) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Read every intact record from a journal file.
+
+    Returns:
+        The records in order, and the byte offset just past the last intact one
+    """
+    records = []
+    offset = 0
+
+    if not path.exists():
+        return records, offset
+
+    with open(path, "rb") as handle:
+        data = handle.read()
+
+    while offset + _HEADER.size <= len(data):
+        length, crc = _HEADER.unpack_from(data, offset)
+        start = offset + _HEADER.size
+        end = start + length
+        if length > MAX_RECORD_SIZE or end > len(data):
+            break
+        payload = data[start:end]
+        if zlib.crc32(payload) != crc:
+            break
+        try:
+            records.append(json.loads(payload))
+        except ValueError:
+            break
+        offset = end
+
+    if offset < len(data):
+        logger.warning(
+            f"Journal {path} has {len(data) - offset} trailing bytes that are not a "
+            "complete record (torn write?); they will be ignored"
+        )
+
+    return records, offset
+
+
+def iter_journal(path: Path) -> Iterator[Dict[str, Any]]:
+    """Iterate over the intact records of a journal file"""
+    records, _ = scan_journal(path)
+    yield from records
+
+
+class ResultJournal:
+    """Group-committing, append-only journal writer"""
+
+    def __init__(self, path: Optional[Path] = None, fsync_interval: float = 0.05,
+                 enabled: bool = True):
+        self.path = Path(path) if path else None
+        self.fsync_interval = fsync_interval
+        self.enabled = enabled and path is not None
+        self._handle = None
+        self._seq = 0
+        self._pending: List[bytes] = []
+        self._waiters: List[asyncio.Future] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+
+    def configure(self, path: Optional[Path], fsync_interval: Optional[float] = None,
+                  enabled: bool = True) -> None:
+        """Point the journal at a different file (closing the current one)"""
+        self.close()
+        self._pending, self._waiters = [], []
+        self._flush_task = None
+        self._write_lock = None
+        self.path = Path(path) if path else None
+        self.enabled = enabled and path is not None
+        if fsync_interval is not None:
+            self.fsync_interval = fsync_interval
+
+    def _open(self) -> None:
+        """Open the journal for appending, truncating any torn tail"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        records, valid_end = scan_journal(self.path)
+        self._seq = records[-1].get("seq", len(records)) if records else 0
+
+        self._handle = open(self.path, "ab")
+        if self._handle.tell() != valid_end:
+            self._handle.truncate(valid_end)
+            self._handle.seek(valid_end)
+
+    def close(self) -> None:
+        """Write and fsync any records still waiting for their batch, then close the file
+
+        Registered as a shutdown hook.
+        """
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+        batch, self._pending = self._pending, []
+        waiters, self._waiters = self._waiters, []
+        if batch and self._handle is not None:
+            try:
+                self._write_and_sync(b"".join(batch))
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} journal records on close: {str(e)}")
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    async def append(self, record_type: str, **fields: Any) -> None:
+        """
+        Append a record and wait until it has been fsynced.
+
+        Called after the change it describes has been committed.
+
+        Args:
+            record_type: Record kind (results, lane, clear, heat_update, schedule, delete_heat)
+            fields: Record body; must be JSON-serializable
+        """
+        if not self.enabled:
+            return
+
+        if self._handle is None:
+            self._open()
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+
+        self._seq += 1
+        record = {"seq": self._seq, "ts": round(time.time(), 3), "type": record_type, **fields}
+        self._pending.append(encode_record(record))
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_interval())
+
+        await waiter
+
+    async def _flush_after_interval(self) -> None:
+        """Write and fsync everything appended during one interval"""
+        await asyncio.sleep(self.fsync_interval)
+
+        # Later appends start a new batch; the lock keeps batches in order
+        self._flush_task = None
+        batch, self._pending = self._pending, []
+        waiters, self._waiters = self._waiters, []
+
+        try:
+            async with self._write_lock:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._write_and_sync, b"".join(batch)
+                )
+        except Exception as e:
+            # The database commit already happened; losing the journal entry
+            # must not fail the request, but it must be loud
+            logger.error(f"Failed to write {len(batch)} journal records: {str(e)}")
+
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _write_and_sync(self, data: bytes) -> None:
+        self._handle.write(data)
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+
+
+def _default_journal() -> ResultJournal:
+    from backend.config import JOURNAL_ENABLED, JOURNAL_FSYNC_INTERVAL, JOURNAL_PATH
+    return ResultJournal(JOURNAL_PATH, JOURNAL_FSYNC_INTERVAL, JOURNAL_ENABLED)
+
+
+# Shared journal for the application process
+result_journal = _default_journal()
@@ -0,0 +1,175 @@
+# backend/api/services/loop_monitor.py
+"""
+Event loop lag monitor for Derby Director
+
+Timer I/O shares the event loop with schedule generation, validation and ORM
+hydration, so a long synchronous stretch anywhere delays result delivery.
+The monitor makes that visible:
+
+- A task on the loop sleeps for LOOP_MONITOR_INTERVAL and records how late
+  it woke up in the derby_event_loop_lag_seconds histogram.
+- A watchdog thread notices when that task has not woken for longer than
+  LOOP_LAG_THRESHOLD past its deadline and captures the loop thread's stack
+  while it is still blocked, so the stall can be traced to the code that
+  caused it. Recent stalls are served at /api/debug/loop.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from backend.api.services.metrics import event_loop_lag, event_loop_stalls
+from backend.config import LOOP_LAG_THRESHOLD, LOOP_MONITOR_ENABLED, LOOP_MONITOR_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+# Stack frames kept per stall, innermost last
+STACK_DEPTH = 40
+
+
+class LoopMonitor:
+    """Measures event loop scheduling lag and captures stacks of stalls"""
+
+    def __init__(
+        self,
+        interval: float = LOOP_MONITOR_INTERVAL,
+        threshold: float = LOOP_LAG_THRESHOLD,
+        keep: int = 50,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=keep)
+        self._pending: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._deadline = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start monitoring the running loop (no-op if already running)"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._deadline = time.perf_counter() + self.interval
+        self._stop.clear()
+        self._task = self._loop.create_task(self._probe(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop the probe task and watchdog thread"""
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog:
+            self._watchdog.join()
+            self._watchdog = None
+
+    async def _probe(self) -> None:
+        while True:
+            self._deadline = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - self._deadline)
+            self._record_lag(lag)
+
+    def _record_lag(self, lag: float) -> None:
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        event_loop_lag.observe(lag)
+
+        with self._lock:
+            stall, self._pending = self._pending, None
+        if lag < self.threshold:
+            return
+
+        self.stalls += 1
+        event_loop_stalls.inc()
+        if stall is None:
+            # Too short for the watchdog to catch it in the act
+            stall = self._new_stall(task=None, stack=[])
+            self._recent.append(stall)
+        stall["lag"] = round(lag, 4)
+        logger.warning(
+            f"Event loop blocked for {lag * 1000:.0f}ms in {stall['task'] or 'unknown task'}"
+        )
+
+    def _watch(self) -> None:
+        captured_deadline = None
+        while not self._stop.wait(min(self.interval, self.threshold) / 2):
+            deadline = self._deadline
+            if deadline == captured_deadline or time.perf_counter() - deadline < self.threshold:
+                continue
+            stall = self._capture()
+            # Drop the snapshot if the loop recovered while it was being taken
+            if stall is not None and self._deadline == deadline:
+                with self._lock:
+                    self._pending = stall
+                self._recent.append(stall)
+            captured_deadline = deadline
+
+    def _capture(self) -> Optional[Dict[str, Any]]:
+        """Snapshot what the loop thread is running right now"""
+        frame = sys._current_frames().get(self._thread_id)
+        if frame is None:
+            return None
+        task = asyncio.current_task(self._loop)
+        stack = [line.rstrip() for line in traceback.format_stack(frame)[-STACK_DEPTH:]]
+        return self._new_stall(task=task.get_name() if task else None, stack=stack)
+
+    @staticmethod
+    def _new_stall(task: Optional[str], stack: List[str]) -> Dict[str, Any]:
+        return {
+            "at": datetime.now().isoformat(timespec="milliseconds"),
+            "lag": None,  # Filled in once the loop recovers
+            "task": task,
+            "stack": stack,
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current lag figures and recent stalls, newest first"""
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "threshold": self.threshold,
+            "last_lag": round(self.last_lag, 4),
+            "max_lag": round(self.max_lag, 4),
+            "stalls": self.stalls,
+            "recent": list(reversed(self._recent)),
+        }
+
+
+# Shared monitor for the application's event loop
+loop_monitor = LoopMonitor()
+
+
+async def start_loop_monitor() -> None:
+    """Startup hook: begin measuring event loop lag"""
+    if LOOP_MONITOR_ENABLED:
+        await loop_monitor.start()
+
+
+async def stop_loop_monitor() -> None:
+    """Shutdown hook"""
+    await loop_monitor.stop()
@@ -0,0 +1,159 @@
+# backend/api/services/pdf_stream.py
+"""
+Incremental PDF writer for Derby Director
+
+reportlab builds a whole document in memory and writes it on save(), which
+means nothing reaches the client until the last page is drawn. This writer
+emits a PDF as a sequence of byte chunks instead: the header first, then
+each page as soon as its content stream is ready, and the page tree, cross
+reference table and trailer at the end. Only the byte offsets of objects
+already written are kept.
+
+Pages are drawn with PageCanvas, a small set of drawing operations over the
+standard Helvetica fonts (which need no embedding), measured with
+reportlab's font metrics. It is deliberately minimal: text, lines and
+filled rectangles are all heat charts and pit cards need.
+"""
+
+import zlib
+from typing import List, Tuple
+
+# Font resource name -> standard font
+FONTS = {"F1": "Helvetica", "F2": "Helvetica-Bold"}
+
+# Object numbers reserved up front; pages start after them
+_CATALOG, _PAGES, _FIRST_FONT = 1, 2, 3
+
+
+def _escape(text: str) -> bytes:
+    data = text.encode("cp1252", errors="replace")
+    return data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+class PageCanvas:
+    """Builds one page's content stream (origin at the bottom left, in points)"""
+
+    def __init__(self):
+        self._ops: List[bytes] = []
+
+    def text(self, x: float, y: float, text: str, size: float = 9, bold: bool = False,
+             align: str = "left") -> None:
+        if not text:
+            return
+        if align != "left":
+            width = string_width(text, size, bold)
+            x -= width if align == "right" else width / 2
+        font = "F2" if bold else "F1"
+        self._ops.append(
+            b"BT /%s %.1f Tf %.2f %.2f Td (%s) Tj ET" % (font.encode(), size, x, y, _escape(text))
+        )
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, width: float = 0.5) -> None:
+        self._ops.append(b"%.2f w %.2f %.2f m %.2f %.2f l S" % (width, x1, y1, x2, y2))
+
+    def rect(self, x: float, y: float, w: float, h: float, gray: float = 0.9) -> None:
+        """Filled rectangle in a shade of gray (0 black, 1 white)"""
+        self._ops.append(b"%.2f g %.2f %.2f %.2f %.2f re f 0 g" % (gray, x, y, w, h))
+
+    def box(self, x: float, y: float, w: float, h: float, width: float = 0.75) -> None:
+        self._ops.append(b"%.2f w %.2f %.2f %.2f %.2f re S" % (width, x, y, w, h))
+
+    def content(self) -> bytes:
+        """Compressed content stream"""
+        return zlib.compress(b"\n".join(self._ops), 6)
+
+
+def string_width(text: str, size: float, bold: bool = False) -> float:
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    return stringWidth(text, FONTS["F2" if bold else "F1"], size)
+
+
+def fit_text(text: str, width: float, size: float, bold: bool = False) -> str:
+    """Truncate text with an ellipsis so it fits in width points"""
+    if string_width(text, size, bold) <= width:
+        return text
+    while text and string_width(text + "...", size, bold) > width:
+        text = text[:-1]
+    return text + "..." if text else ""
+
+
+class PdfStreamWriter:
+    """Writes a PDF front to back; each method returns the bytes to send next"""
+
+    def __init__(self, page_size: Tuple[float, float], title: str = ""):
+        self.width, self.height = page_size
+        self.title = title
+        self._offsets = {}
+        self._position = 0
+        self._next_object = _FIRST_FONT + len(FONTS)
+        self._pages: List[int] = []
+
+    def _object(self, number: int, body: bytes, stream: bytes = b"") -> bytes:
+        self._offsets[number] = self._position
+        data = b"%d 0 obj\n%s\n" % (number, body)
+        if stream:
+            data += b"stream\n" + stream + b"\nendstream\n"
+        data += b"endobj\n"
+        self._position += len(data)
+        return data
+
+    def _allocate(self) -> int:
+        number = self._next_object
+        self._next_object += 1
+        return number
+
+    def start(self) -> bytes:
+        """File header and font resources"""
+        header = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+        self._position = len(header)
+        chunks = [header]
+        for index, base_font in enumerate(FONTS.values()):
+            chunks.append(self._object(_FIRST_FONT + index, (
+                b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>"
+                % base_font.encode()
+            )))
+        return b"".join(chunks)
+
+    def page(self, content: bytes) -> bytes:
+        """One page, from a compressed content stream (see PageCanvas.content)"""
+        content_number = self._allocate()
+        page_number = self._allocate()
+        self._pages.append(page_number)
+        fonts = b" ".join(
+            b"/%s %d 0 R" % (name.encode(), _FIRST_FONT + index) for index, name in enumerate(FONTS)
+        )
+        stream = b"<< /Length %d /Filter /FlateDecode >>" % len(content)
+        return b"".join((
+            self._object(content_number, stream, content),
+            self._object(page_number, (
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.2f %.2f] "
+                b"/Resources << /Font << %s >> >> /Contents %d 0 R >>"
+            ) % (_PAGES, self.width, self.height, fonts, content_number)),
+        ))
+
+    def finish(self) -> bytes:
+        """Page tree, catalog, info, cross reference table and trailer"""
+        kids = b" ".join(b"%d 0 R" % number for number in self._pages)
+        info_number = self._allocate()
+        chunks = [
+            self._object(
+                _PAGES, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._pages))
+            ),
+            self._object(_CATALOG, b"<< /Type /Catalog /Pages %d 0 R >>" % _PAGES),
+            self._object(
+                info_number, b"<< /Title (%s) /Producer (Derby Director) >>" % _escape(self.title)
+            ),
+        ]
+
+        xref_offset = self._position
+        count = self._next_object
+        xref = [b"xref\n0 %d\n" % count, b"0000000000 65535 f \n"]
+        for number in range(1, count):
+            xref.append(b"%010d 00000 n \n" % self._offsets[number])
+        chunks.append(b"".join(xref))
+        chunks.append(
+            b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (count, _CATALOG, info_number, xref_offset)
+        )
+        return b"".join(chunks)
@@ -0,0 +1,169 @@
+# backend/api/services/photos.py
+"""
+Racer photo storage for Derby Director
+
+Uploads are streamed to disk while being hashed, and stored under their
+SHA-256 digest, so the same photo uploaded twice is stored (and resized)
+once, and a variant's URL never changes meaning. That lets the variants be
+cached by browsers and displays forever.
+
+Each original gets a set of JPEG variants sized for what shows it: a
+thumbnail for lists, a display size for the race board and a print size for
+certificates. Resizing runs in a process pool so a burst of full-size phone
+photos at check-in never stalls the event loop; Pillow is only imported in
+the worker processes.
+
+Layout:
+    PHOTO_DIR/ab/abcdef.../original
+    PHOTO_DIR/ab/abcdef.../thumb.jpg, display.jpg, print.jpg
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import AsyncIterable, Dict, Optional
+
+from backend.config import PHOTO_DIR, PHOTO_MAX_BYTES, PHOTO_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# Variant name -> longest edge in pixels
+VARIANTS: Dict[str, int] = {
+    "thumb": 160,
+    "display": 800,
+    "print": 2000,
+}
+
+JPEG_QUALITY = 85
+
+_DIGEST = re.compile(r"^[0-9a-f]{64}$")
+
+
+class PhotoTooLargeError(ValueError):
+    """Raised when an upload exceeds PHOTO_MAX_BYTES"""
+
+
+def is_photo_digest(value: Optional[str]) -> bool:
+    return bool(value) and bool(_DIGEST.match(value))
+
+
+def render_variants(original: str, dest_dir: str, sizes: Dict[str, int]) -> Dict[str, int]:
+    """
+    Resize one original into every variant (runs in a worker process).
+
+    Returns the size in bytes of each variant written.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with Image.open(original) as image:
+            # Let the JPEG decoder downscale while decoding; far cheaper than a full decode
+            image.draft("RGB", (max(sizes.values()),) * 2)
+            image = ImageOps.exif_transpose(image).convert("RGB")
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise ValueError(f"Not a usable image: {e}") from None
+
+    written = {}
+    # Largest first, so each smaller variant resizes an already reduced image
+    for name, edge in sorted(sizes.items(), key=lambda item: item[1], reverse=True):
+        image.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        target = Path(dest_dir) / f"{name}.jpg"
+        partial = target.with_suffix(".part")
+        image.save(partial, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        os.replace(partial, target)
+        written[name] = target.stat().st_size
+    return written
+
+
+class PhotoStore:
+    """Content-addressed photo storage with off-loop resizing"""
+
+    def __init__(self, root: Path = PHOTO_DIR, workers: int = PHOTO_WORKERS,
+                 max_bytes: int = PHOTO_MAX_BYTES):
+        self.root = root
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def directory(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def variant_path(self, digest: str, variant: str) -> Optional[Path]:
+        """Path of a stored variant, or None if there is no such photo or variant"""
+        if not is_photo_digest(digest) or variant not in VARIANTS:
+            return None
+        path = self.directory(digest) / f"{variant}.jpg"
+        return path if path.is_file() else None
+
+    def _has_variants(self, digest: str) -> bool:
+        directory = self.directory(digest)
+        return all((directory / f"{name}.jpg").is_file() for name in VARIANTS)
+
+    async def save(self, chunks: AsyncIterable[bytes]) -> str:
+        """
+        Store an uploaded photo and its variants.
+
+        Returns the photo's digest. Raises ValueError if the upload is not an
+        image, or PhotoTooLargeError if it is over the size limit.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+
+        fd, partial = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise PhotoTooLargeError(
+                            f"Photo is larger than {self.max_bytes // (1024 * 1024)} MB"
+                        )
+                    digest.update(chunk)
+                    out.write(chunk)
+            if not size:
+                raise ValueError("Empty upload")
+
+            key = digest.hexdigest()
+            if self._has_variants(key):
+                return key
+
+            directory = self.directory(key)
+            directory.mkdir(parents=True, exist_ok=True)
+            original = directory / "original"
+            os.replace(partial, original)
+        finally:
+            if os.path.exists(partial):
+                os.unlink(partial)
+
+        try:
+            written = await asyncio.get_running_loop().run_in_executor(
+                self._executor(), render_variants, str(original), str(directory), VARIANTS
+            )
+        except ValueError:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise
+
+        logger.info(f"Stored photo {key[:12]} ({size} bytes): {written}")
+        return key
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def close(self) -> None:
+        """Shut down the worker processes (shutdown hook)"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+# Shared store used by the racer and photo controllers
+photo_store = PhotoStore()
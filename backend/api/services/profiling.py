@@ -0,0 +1,228 @@
+# backend/api/services/profiling.py
+"""
+On-demand request profiling for Derby Director
+
+Two profilers are available for a single request:
+
+- "cprofile": deterministic cProfile, written as a .pstats file for
+  `python -m pstats`, snakeviz and friends
+- "sample": a background thread samples the event loop thread's stack every
+  PROFILE_SAMPLE_INTERVAL seconds and writes speedscope JSON, which opens as
+  a flame graph at https://www.speedscope.app
+
+Both profile the event loop thread, so anything else the loop runs while the
+request is in flight shows up too. That is usually what you want when a
+race-day endpoint is slow, but it is worth keeping in mind when reading the
+output.
+
+Besides profiling a request on demand, a sampling window can be opened to
+profile one request in every N for a fixed period.
+"""
+
+import cProfile
+import json
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.config import PROFILE_DIR, PROFILE_SAMPLE_INTERVAL
+
+MODES = ("cprofile", "sample")
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+Frame = Tuple[str, str, int]
+
+
+class StackSampler:
+    """Samples one thread's Python stack from a background thread"""
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.frames: List[Frame] = []
+        self.samples: List[List[int]] = []
+        self.weights: List[float] = []
+        self._frame_index: Dict[Frame, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self._elapsed = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._elapsed = time.perf_counter() - self._started
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._record(frame, now - last)
+            last = now
+
+    def _record(self, frame, weight: float) -> None:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            name = getattr(code, "co_qualname", code.co_name)
+            key = (name, code.co_filename, code.co_firstlineno)
+            index = self._frame_index.get(key)
+            if index is None:
+                index = self._frame_index[key] = len(self.frames)
+                self.frames.append(key)
+            stack.append(index)
+            frame = frame.f_back
+        # speedscope wants stacks outermost first
+        stack.reverse()
+        self.samples.append(stack)
+        self.weights.append(weight)
+
+    def speedscope(self, name: str) -> Dict[str, Any]:
+        """The samples in speedscope's file format"""
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {
+                "frames": [
+                    {"name": fn, "file": file, "line": line} for fn, file, line in self.frames
+                ],
+            },
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self._elapsed,
+                "samples": self.samples,
+                "weights": self.weights,
+            }],
+            "name": name,
+            "exporter": "derby-director",
+        }
+
+
+class RequestProfile:
+    """Profiler for one request, started and stopped around the handler"""
+
+    def __init__(self, mode: str, method: str, path: str, profile_dir: Path):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.mode = mode
+        self.name = f"{method} {path}"
+
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        slug = _UNSAFE.sub("_", path.strip("/")) or "root"
+        suffix = "pstats" if mode == "cprofile" else "speedscope.json"
+        self.path = profile_dir / f"{stamp}-{method.lower()}-{slug}.{suffix}"
+
+        self._profiler = cProfile.Profile() if mode == "cprofile" else StackSampler()
+
+    def start(self) -> None:
+        if self.mode == "cprofile":
+            self._profiler.enable()
+        else:
+            self._profiler.start()
+
+    def stop(self) -> Path:
+        """Stop profiling and write the output file"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.mode == "cprofile":
+            self._profiler.disable()
+            self._profiler.dump_stats(self.path)
+        else:
+            self._profiler.stop()
+            self.path.write_text(json.dumps(self._profiler.speedscope(self.name)))
+        return self.path
+
+
+class RequestProfiler:
+    """Decides which requests to profile and creates their profilers"""
+
+    def __init__(self, profile_dir: Path = PROFILE_DIR):
+        self.profile_dir = profile_dir
+        self.every = 0
+        self.mode = "sample"
+        self.until = 0.0
+        self._seen = 0
+        self._active = False
+
+    def start_sampling(self, every: int, duration: float, mode: str = "sample") -> None:
+        """Profile one request in `every` for the next `duration` seconds"""
+        if every < 1:
+            raise ValueError("Sampling rate must be at least 1")
+        if duration <= 0:
+            raise ValueError("Sampling duration must be positive")
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.every = every
+        self.mode = mode
+        self.until = time.monotonic() + duration
+        self._seen = 0
+
+    def stop_sampling(self) -> None:
+        self.every = 0
+        self.until = 0.0
+
+    def sampling_status(self) -> Dict[str, Any]:
+        remaining = max(0.0, self.until - time.monotonic()) if self.every else 0.0
+        return {
+            "active": remaining > 0,
+            "every": self.every,
+            "mode": self.mode,
+            "remaining_seconds": round(remaining, 1),
+            "requests_seen": self._seen,
+        }
+
+    def sampled_mode(self) -> Optional[str]:
+        """The mode to profile this request in, if the sampling window picks it"""
+        if not self.every:
+            return None
+        if time.monotonic() >= self.until:
+            self.stop_sampling()
+            return None
+        self._seen += 1
+        return self.mode if self._seen % self.every == 0 else None
+
+    def begin(self, mode: str, method: str, path: str) -> Optional[RequestProfile]:
+        """
+        Start profiling a request.
+
+        Returns None while another request is being profiled: cProfile cannot
+        nest, and overlapping profiles of the same loop would double count.
+        """
+        if self._active:
+            return None
+        profile = RequestProfile(mode, method, path, self.profile_dir)
+        profile.start()
+        self._active = True
+        return profile
+
+    def end(self, profile: RequestProfile) -> Path:
+        try:
+            return profile.stop()
+        finally:
+            self._active = False
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """Profile files on disk, newest first"""
+        if not self.profile_dir.exists():
+            return []
+        files = [p for p in self.profile_dir.iterdir() if p.is_file()]
+        files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        return [{"name": p.name, "size": p.stat().st_size} for p in files]
+
+
+# Shared profiler used by the middleware and controller
+request_profiler = RequestProfiler()
@@ -0,0 +1,572 @@
+# backend/api/services/race_analytics.py
+"""
+Precomputed race reports for Derby Director.
+
+Report pages (standings, a racer's history, a round's results) are read far
+more often than results change, and while racing is under way each heat only
+touches a handful of racers. Rather than aggregating race_results on every
+request, the analytics keep each heat's finishes in memory together with the
+totals derived from them: per racer, per round and the standings overall and
+by rank.
+
+Whenever heats change (results recorded or corrected, heats scheduled or
+removed, rounds edited) the writer calls refresh_heats or refresh_round with
+just the heats involved. Those are reloaded with one query and only the
+racers and rounds they touch are recomputed; standings are re-sorted on the
+next read. Like the check-in index, the analytics are loaded once per process
+at startup and kept coherent by the write handlers.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.models import Division, Heat, Racer, RaceResult, Rank, Round
+from backend.api.schemas import RacerHistoryEntry, RacerResultResponse
+
+logger = logging.getLogger(__name__)
+
+# Results from these rounds appear in racer histories and round reports but
+# not in the standings, since only the fastest racers run them
+FINAL_PHASES = ("semifinal", "final", "championship")
+
+
+class RacerInfo(NamedTuple):
+    first_name: str
+    last_name: str
+    car_number: Optional[str]
+    rank: str
+    den: Optional[str]
+
+
+class RoundInfo(NamedTuple):
+    name: str
+    phase: str
+    charttype: str
+    roundno: int
+
+
+class Finish(NamedTuple):
+    """One racer's completed lane in a heat"""
+    racer_id: int
+    time: Optional[float]
+    place: Optional[int]
+    points: int
+
+
+class HeatEntry(NamedTuple):
+    round_id: int
+    status: str
+    completed_time: Optional[datetime]
+    finishes: Tuple[Finish, ...]
+
+
+class RacerTotals(NamedTuple):
+    """Aggregates over a set of a racer's finishes"""
+    racer_id: int
+    total_points: int
+    avg_time: Optional[float]
+    fastest_time: Optional[float]
+    races_completed: int
+    last_raced: Optional[datetime]
+
+
+class RoundSummary(NamedTuple):
+    race_id: int
+    name: str
+    race_type: str
+    phase: str
+    status: str
+    total_heats: int
+    completed_heats: int
+    completed_at: Optional[datetime]
+
+
+def finish_points(place: Optional[int], lanes: int) -> int:
+    """Points for a finish: one per racer beaten, plus one for finishing"""
+    if not place:
+        return 0
+    return max(lanes + 1 - place, 0)
+
+
+def total_finishes(
+    racer_id: int, entries: Iterable[Tuple[Finish, Optional[datetime]]]
+) -> RacerTotals:
+    """Totals for a racer from (finish, heat completed time) pairs"""
+    points = races = 0
+    times: List[float] = []
+    last_raced = None
+    for finish, completed_time in entries:
+        races += 1
+        points += finish.points
+        if finish.time is not None:
+            times.append(finish.time)
+        if completed_time is not None and (last_raced is None or completed_time > last_raced):
+            last_raced = completed_time
+
+    return RacerTotals(
+        racer_id=racer_id,
+        total_points=points,
+        avg_time=round(sum(times) / len(times), 3) if times else None,
+        fastest_time=round(min(times), 3) if times else None,
+        races_completed=races,
+        last_raced=last_raced
+    )
+
+
+def _car_sort_key(car_number: Optional[str]) -> Tuple[int, str]:
+    car_number = car_number or ""
+    return (int(car_number), "") if car_number.isdigit() else (10 ** 9, car_number)
+
+
+class RaceAnalytics:
+    """Process-wide precomputed standings, racer histories and round reports"""
+
+    def __init__(self):
+        self._locks: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all state; the next read reloads it"""
+        self._racers: Dict[int, RacerInfo] = {}
+        self._ranks: Dict[str, str] = {}
+        self._rounds: Dict[int, RoundInfo] = {}
+        self._heats: Dict[int, HeatEntry] = {}
+        self._round_heats: Dict[int, Set[int]] = {}
+        self._racer_heats: Dict[int, Set[int]] = {}
+
+        # Derived from the above
+        self._qualifying: Dict[int, RacerTotals] = {}
+        self._round_results: Dict[int, List[RacerTotals]] = {}
+        self._round_positions: Dict[int, Dict[int, int]] = {}
+        self._round_summaries: Dict[int, RoundSummary] = {}
+        self._standings: Optional[Dict[Optional[str], List[RacerTotals]]] = None
+
+        self.loaded = False
+
+    def invalidate(self) -> None:
+        """Mark the analytics stale (e.g. after division or bulk racer changes)"""
+        self.loaded = False
+
+    def _lock(self) -> asyncio.Lock:
+        # One lock per event loop, so test clients on fresh loops do not share one
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            self._locks = {loop: asyncio.Lock()}
+            lock = self._locks[loop]
+        return lock
+
+    # Loading and incremental refresh
+
+    async def load(self, session: AsyncSession) -> None:
+        """(Re)build everything from the database"""
+        async with self._lock():
+            racers = await session.execute(
+                select(
+                    Racer.id, Racer.firstname, Racer.lastname, Racer.carno, Rank.name, Division.name
+                )
+                .outerjoin(Rank, Racer.rankid == Rank.id)
+                .outerjoin(Division, Racer.divisionid == Division.id)
+            )
+            racer_rows = racers.all()
+            rank_names = (await session.execute(select(Rank.name))).scalars().all()
+            round_rows = (await session.execute(
+                select(Round.id, Round.name, Round.phase, Round.charttype, Round.roundno)
+            )).all()
+            heat_rows = (await session.execute(self._heats_query())).all()
+
+            self.clear()
+            for racer_id, first, last, carno, rank, division in racer_rows:
+                self._racers[racer_id] = RacerInfo(first, last, carno, rank or "", division)
+            self._ranks = {name.lower(): name for name in rank_names if name}
+            for round_id, name, phase, charttype, roundno in round_rows:
+                self._rounds[round_id] = RoundInfo(
+                    name, phase or "normal", charttype or "roster", roundno or 0
+                )
+                self._round_heats[round_id] = set()
+            self._apply_heats((), heat_rows, rounds=set(self._rounds))
+            self.loaded = True
+
+        logger.info(
+            f"Race analytics loaded with {len(self._heats)} heats "
+            f"and {len(self._qualifying)} ranked racers"
+        )
+
+    async def ensure_loaded(self, session: AsyncSession) -> None:
+        """Load the analytics if startup loading was skipped, failed or invalidated"""
+        if not self.loaded:
+            await self.load(session)
+
+    async def refresh_heats(self, session: AsyncSession, heat_ids: Iterable[int]) -> None:
+        """Reload the given heats (deleted ones are dropped) and recompute what they touch"""
+        heat_ids = set(heat_ids)
+        if not self.loaded or not heat_ids:
+            return
+
+        try:
+            async with self._lock():
+                rows = (
+                    await session.execute(self._heats_query().where(Heat.id.in_(heat_ids)))
+                ).all()
+                self._apply_heats(heat_ids, rows)
+        except Exception as e:
+            # The write itself succeeded; reload from scratch on the next read
+            logger.error(f"Failed to refresh race analytics for heats {sorted(heat_ids)}: {str(e)}")
+            self.invalidate()
+
+    async def refresh_round(self, session: AsyncSession, round_id: int) -> None:
+        """Reload a round's details and all of its heats (a deleted round is dropped)"""
+        if not self.loaded:
+            return
+
+        try:
+            async with self._lock():
+                round_row = (await session.execute(
+                    select(Round.name, Round.phase, Round.charttype, Round.roundno)
+                    .where(Round.id == round_id)
+                )).one_or_none()
+                rows = (await session.execute(
+                    self._heats_query().where(Heat.roundid == round_id)
+                )).all()
+
+                stale = set(self._round_heats.get(round_id, ()))
+                if round_row is None:
+                    self._rounds.pop(round_id, None)
+                else:
+                    name, phase, charttype, roundno = round_row
+                    self._rounds[round_id] = RoundInfo(
+                        name, phase or "normal", charttype or "roster", roundno or 0
+                    )
+                    self._round_heats.setdefault(round_id, set())
+                self._apply_heats(stale | {row[0] for row in rows}, rows, rounds={round_id})
+        except Exception as e:
+            logger.error(f"Failed to refresh race analytics for round {round_id}: {str(e)}")
+            self.invalidate()
+
+    async def refresh_racers(self, session: AsyncSession, racer_ids: Iterable[int]) -> None:
+        """Reload racer details (name, car number, rank, den) after a racer is edited"""
+        racer_ids = set(racer_ids)
+        if not self.loaded or not racer_ids:
+            return
+
+        try:
+            async with self._lock():
+                rows = (await session.execute(
+                    select(Racer.id, Racer.firstname, Racer.lastname, Racer.carno,
+                           Rank.name, Division.name)
+                    .outerjoin(Rank, Racer.rankid == Rank.id)
+                    .outerjoin(Division, Racer.divisionid == Division.id)
+                    .where(Racer.id.in_(racer_ids))
+                )).all()
+                for racer_id in racer_ids:
+                    self._racers.pop(racer_id, None)
+                for racer_id, first, last, carno, rank, division in rows:
+                    self._racers[racer_id] = RacerInfo(first, last, carno, rank or "", division)
+                    if rank and rank.lower() not in self._ranks:
+                        self._ranks[rank.lower()] = rank
+
+                heat_ids = {heat_id for racer_id in racer_ids
+                            for heat_id in self._racer_heats.get(racer_id, ())}
+                for round_id in {self._heats[heat_id].round_id for heat_id in heat_ids}:
+                    self._update_round(round_id)
+                self._standings = None
+        except Exception as e:
+            logger.error(
+                f"Failed to refresh race analytics for racers {sorted(racer_ids)}: {str(e)}"
+            )
+            self.invalidate()
+
+    @staticmethod
+    def _heats_query():
+        return (
+            select(Heat.id, Heat.roundid, Heat.status, Heat.completed_time,
+                   RaceResult.racer_id, RaceResult.time, RaceResult.place)
+            .outerjoin(RaceResult,
+                       and_(RaceResult.heat_id == Heat.id, RaceResult.completed == True))
+            .order_by(Heat.id, RaceResult.lane)
+        )
+
+    def _apply_heats(
+        self, heat_ids: Iterable[int], rows, rounds: Optional[Set[int]] = None
+    ) -> None:
+        """
+        Replace heats with freshly loaded rows and recompute the racers and rounds involved.
+
+        rounds lists rounds whose details were reloaded too; every racer in them is
+        recomputed, since a round's phase decides whether it counts towards the standings.
+        """
+        racers: Set[int] = set()
+        changed_rounds = set(rounds or ())
+        rounds = set(changed_rounds)
+
+        for heat_id in heat_ids:
+            old = self._heats.pop(heat_id, None)
+            if old is None:
+                continue
+            rounds.add(old.round_id)
+            self._round_heats.get(old.round_id, set()).discard(heat_id)
+            for finish in old.finishes:
+                racers.add(finish.racer_id)
+                self._racer_heats.get(finish.racer_id, set()).discard(heat_id)
+
+        grouped: Dict[
+            int,
+            Tuple[int, str, Optional[datetime], List[Tuple[int, Optional[float], Optional[int]]]],
+        ] = {}
+        for heat_id, round_id, status, completed_time, racer_id, time, place in rows:
+            if heat_id not in grouped:
+                grouped[heat_id] = (round_id, status or "scheduled", completed_time, [])
+            if racer_id is not None:
+                grouped[heat_id][3].append((racer_id, time, place))
+
+        for heat_id, (round_id, status, completed_time, results) in grouped.items():
+            finishes = tuple(Finish(racer_id, time, place, finish_points(place, len(results)))
+                             for racer_id, time, place in results)
+            self._heats[heat_id] = HeatEntry(round_id, status, completed_time, finishes)
+            self._round_heats.setdefault(round_id, set()).add(heat_id)
+            rounds.add(round_id)
+            for finish in finishes:
+                racers.add(finish.racer_id)
+                self._racer_heats.setdefault(finish.racer_id, set()).add(heat_id)
+
+        for round_id in changed_rounds:
+            for heat_id in self._round_heats.get(round_id, ()):
+                racers.update(finish.racer_id for finish in self._heats[heat_id].finishes)
+
+        for racer_id in racers:
+            self._update_racer(racer_id)
+        for round_id in rounds:
+            self._update_round(round_id)
+        self._standings = None
+
+    def _racer_finishes(self, racer_id: int, heat_ids: Iterable[int]):
+        for heat_id in heat_ids:
+            heat = self._heats[heat_id]
+            for finish in heat.finishes:
+                if finish.racer_id == racer_id:
+                    yield heat, finish
+
+    def _update_racer(self, racer_id: int) -> None:
+        """Recompute a racer's standings totals from their qualifying heats"""
+        entries = [
+            (finish, heat.completed_time)
+            for heat, finish in self._racer_finishes(racer_id, self._racer_heats.get(racer_id, ()))
+            if heat.round_id in self._rounds
+            and self._rounds[heat.round_id].phase not in FINAL_PHASES
+        ]
+        if entries:
+            self._qualifying[racer_id] = total_finishes(racer_id, entries)
+        else:
+            self._qualifying.pop(racer_id, None)
+
+    def _update_round(self, round_id: int) -> None:
+        """Recompute a round's summary and finishing order"""
+        info = self._rounds.get(round_id)
+        heat_ids = self._round_heats.get(round_id, set())
+        if info is None:
+            # Round deleted; its heats go with it
+            self._round_heats.pop(round_id, None)
+            self._round_results.pop(round_id, None)
+            self._round_positions.pop(round_id, None)
+            self._round_summaries.pop(round_id, None)
+            return
+
+        by_racer: Dict[int, List[Tuple[Finish, Optional[datetime]]]] = {}
+        completed = 0
+        completed_at = None
+        for heat_id in heat_ids:
+            heat = self._heats[heat_id]
+            if heat.status == "completed":
+                completed += 1
+                if heat.completed_time is not None and (
+                    completed_at is None or heat.completed_time > completed_at
+                ):
+                    completed_at = heat.completed_time
+            for finish in heat.finishes:
+                by_racer.setdefault(finish.racer_id, []).append((finish, heat.completed_time))
+
+        results = self._ordered(
+            total_finishes(racer_id, entries) for racer_id, entries in by_racer.items()
+        )
+        self._round_results[round_id] = results
+        self._round_positions[round_id] = {
+            totals.racer_id: position for position, totals in enumerate(results, 1)
+        }
+
+        if heat_ids and completed == len(heat_ids):
+            status = "completed"
+        elif completed or by_racer:
+            status = "in_progress"
+        else:
+            status = "pending"
+        self._round_summaries[round_id] = RoundSummary(
+            race_id=round_id,
+            name=info.name,
+            race_type=info.charttype,
+            phase=info.phase,
+            status=status,
+            total_heats=len(heat_ids),
+            completed_heats=completed,
+            completed_at=completed_at if status == "completed" else None
+        )
+
+    def _ordered(self, totals: Iterable[RacerTotals]) -> List[RacerTotals]:
+        """Fastest average first, then most points; racers without a time last"""
+        def key(entry: RacerTotals):
+            racer = self._racers.get(entry.racer_id)
+            return (
+                entry.avg_time is None,
+                entry.avg_time or 0.0,
+                -entry.total_points,
+                _car_sort_key(racer.car_number if racer else None),
+                entry.racer_id
+            )
+        return sorted(totals, key=key)
+
+    # Reads
+
+    def racer(self, racer_id: int) -> Optional[RacerInfo]:
+        return self._racers.get(racer_id)
+
+    def racer_ids(self) -> List[int]:
+        return sorted(self._racers)
+
+    def ranks(self) -> List[str]:
+        """Rank names, as entered"""
+        return sorted(self._ranks.values(), key=str.lower)
+
+    def heat_rounds(self, heat_ids: Iterable[int]) -> Set[int]:
+        """Rounds the given heats belong to (unknown heats are skipped)"""
+        return {self._heats[heat_id].round_id for heat_id in heat_ids if heat_id in self._heats}
+
+    def racer_rounds(self, racer_ids: Iterable[int]) -> Set[int]:
+        """Rounds the given racers have finishes in"""
+        return {self._heats[heat_id].round_id
+                for racer_id in racer_ids for heat_id in self._racer_heats.get(racer_id, ())}
+
+    def standings(self, rank: Optional[str] = None) -> Optional[List[RacerTotals]]:
+        """Standings overall or for one rank (case-insensitive); None for an unknown rank"""
+        if self._standings is None:
+            overall = self._ordered(self._qualifying.values())
+            standings: Dict[Optional[str], List[RacerTotals]] = {None: overall}
+            for totals in overall:
+                racer = self._racers.get(totals.racer_id)
+                key = racer.rank.lower() if racer and racer.rank else ""
+                standings.setdefault(key, []).append(totals)
+            self._standings = standings
+
+        if rank is None:
+            return self._standings[None]
+        rank = rank.strip().lower()
+        if rank not in self._ranks:
+            return None
+        return self._standings.get(rank, [])
+
+    def round_summaries(self) -> List[RoundSummary]:
+        """Every round, in running order"""
+        return sorted(
+            self._round_summaries.values(),
+            key=lambda summary: (self._rounds[summary.race_id].roundno, summary.race_id)
+        )
+
+    def round_report(self, round_id: int) -> Optional[Tuple[RoundSummary, List[RacerTotals]]]:
+        """A round's summary and its racers in finishing order; None if it does not exist"""
+        summary = self._round_summaries.get(round_id)
+        if summary is None:
+            return None
+        return summary, self._round_results.get(round_id, [])
+
+    def racer_history(self, racer_id: int) -> Optional[List[Tuple[RoundSummary, int, RacerTotals]]]:
+        """(round, position in it, totals) for each round a racer has raced
+
+        None for an unknown racer.
+        """
+        if racer_id not in self._racers:
+            return None
+
+        round_ids = {
+            self._heats[heat_id].round_id for heat_id in self._racer_heats.get(racer_id, ())
+        }
+        history = []
+        for round_id in round_ids:
+            positions = self._round_positions.get(round_id)
+            if positions is None or racer_id not in positions:
+                continue
+            position = positions[racer_id]
+            history.append((self._round_summaries[round_id], position,
+                            self._round_results[round_id][position - 1]))
+
+        history.sort(key=lambda item: (self._rounds[item[0].race_id].roundno, item[0].race_id))
+        return history
+
+
+# Shared analytics for the application process
+race_analytics = RaceAnalytics()
+
+
+def racer_results(standings: List[RacerTotals]) -> List[RacerResultResponse]:
+    """Response rows for racers in finishing order"""
+    results = []
+    for position, totals in enumerate(standings, 1):
+        racer = race_analytics.racer(totals.racer_id)
+        if racer is None:
+            continue
+        results.append(RacerResultResponse(
+            racer_id=totals.racer_id,
+            first_name=racer.first_name,
+            last_name=racer.last_name,
+            car_number=racer.car_number,
+            rank=racer.rank,
+            den=racer.den,
+            total_points=totals.total_points,
+            avg_time=totals.avg_time,
+            fastest_time=totals.fastest_time,
+            races_completed=totals.races_completed,
+            position=position
+        ))
+    return results
+
+
+def racer_history_entries(
+    history: List[Tuple[RoundSummary, int, RacerTotals]]
+) -> List[RacerHistoryEntry]:
+    """Response rows for a racer's history"""
+    return [
+        RacerHistoryEntry(
+            race_id=summary.race_id,
+            race_name=summary.name,
+            phase=summary.phase,
+            position=position,
+            total_points=totals.total_points,
+            avg_time=totals.avg_time,
+            fastest_time=totals.fastest_time,
+            races_completed=totals.races_completed,
+            race_date=totals.last_raced
+        )
+        for summary, position, totals in history
+    ]
+
+
+async def load_race_analytics() -> None:
+    """Startup hook: build the race analytics from the configured database"""
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from backend.config import DATABASE_URL
+
+    engine = create_async_engine(DATABASE_URL)
+    async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+    try:
+        async with async_session() as session:
+            await race_analytics.load(session)
+    except Exception as e:
+        # Not fatal: report handlers load the analytics lazily on first use
+        logger.error(f"Failed to load race analytics at startup: {str(e)}")
+        race_analytics.clear()
+    finally:
+        await engine.dispose()
@@ -0,0 +1,399 @@
+# backend/api/services/race_queue.py
+"""
+Now-racing board for Derby Director.
+
+The arena display polls constantly for the heat on the track, the heats on
+deck and the last heat's results. RaceQueue keeps exactly that in memory for
+a track: the heats still to run in running order, with their lanes, and the
+most recently completed heat. Heat status transitions (a heat starting,
+results being recorded or cleared, heats being scheduled) refresh the heats
+involved and re-render the board once, as JSON bytes; serving the board is
+then a memory read with no database I/O.
+
+The same render indexes each racer's remaining heats in running order, and
+the queue keeps the completion times of recent heats, so a racer's itinerary
+(lane, place in the queue and an ETA from the recent heat cycle time) is a
+memory read as well.
+
+The schema has no notion of separate tracks, so the app runs a single queue
+for the track the timer is attached to.
+"""
+
+import asyncio
+import bisect
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.models import Heat, Racer, RaceResult, RacerHeat, Round
+from backend.api.schemas import BoardHeat, BoardLane, RaceBoard
+from backend.config import (
+    BOARD_ON_DECK,
+    ITINERARY_CYCLE_SAMPLES,
+    ITINERARY_DEFAULT_CYCLE,
+    ITINERARY_MAX_CYCLE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class QueueLane(NamedTuple):
+    lane: int
+    racer_id: int
+    racer_name: str
+    car_number: Optional[str]
+    time: Optional[float]
+    place: Optional[int]
+
+
+class QueueHeat(NamedTuple):
+    heat_id: int
+    round_id: int
+    round_name: str
+    roundno: int
+    heat: int
+    status: str
+    completed_time: Optional[datetime]
+    lanes: Tuple[QueueLane, ...]
+
+    @property
+    def order(self) -> Tuple[int, int, int, int]:
+        """Running order: by round, then heat number"""
+        return (self.roundno, self.round_id, self.heat, self.heat_id)
+
+
+class ItineraryStop(NamedTuple):
+    heat: QueueHeat
+    lane: QueueLane
+    position: int  # heats ahead of this one; 0 is on the track or next up
+    eta: datetime
+
+
+class RaceQueue:
+    """Heats still to run on a track, and the last result, pre-rendered for the board"""
+
+    def __init__(self, track: str = "main", on_deck: int = BOARD_ON_DECK):
+        self.track = track
+        self.on_deck = on_deck
+        self._locks: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+        # Distinguishes board versions across restarts
+        self._epoch = uuid.uuid4().hex[:8]
+        self.version = 0
+        self.clear()
+
+    def clear(self) -> None:
+        self._pending: Dict[int, QueueHeat] = {}
+        self._order: List[Tuple[int, int, int, int]] = []
+        self._running: Set[int] = set()
+        self._last: Optional[QueueHeat] = None
+        # (completed_time, heat_id) of the most recent heats, oldest first
+        self._completions: List[Tuple[datetime, int]] = []
+        # Rebuilt on every render: racer_id -> [(heat_id, lane)] in running order
+        self._racer_heats: Dict[int, List[Tuple[int, QueueLane]]] = {}
+        self._positions: Dict[int, int] = {}
+        self._cars: Dict[str, int] = {}
+        self._board: Optional[bytes] = None
+        self.loaded = False
+
+    def _lock(self) -> asyncio.Lock:
+        # One lock per event loop, so test clients on fresh loops do not share one
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            self._locks = {loop: asyncio.Lock()}
+            lock = self._locks[loop]
+        return lock
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.track}-{self._epoch}-{self.version}"'
+
+    def board(self) -> Optional[bytes]:
+        """The rendered board, or None until the queue has been loaded"""
+        return self._board
+
+    # Loading and refresh
+
+    async def load(self, session: AsyncSession) -> None:
+        """(Re)build the queue from every heat not yet completed, plus the last result"""
+        async with self._lock():
+            await self._load(session)
+
+    async def _load(self, session: AsyncSession) -> None:
+        rows = (await session.execute(self._heats_query().where(Heat.status != "completed"))).all()
+        last = await self._latest_completed(session)
+        completions = (await session.execute(
+            select(Heat.completed_time, Heat.id)
+            .where(Heat.status == "completed", Heat.completed_time.is_not(None))
+            .order_by(Heat.completed_time.desc(), Heat.id.desc())
+            .limit(ITINERARY_CYCLE_SAMPLES + 1)
+        )).all()
+
+        self.clear()
+        for heat in self._group(rows):
+            self._add(heat)
+        self._last = last
+        self._completions = sorted(tuple(row) for row in completions)
+        self.loaded = True
+        self._render()
+
+        logger.info(
+            f"Race queue for track {self.track} loaded with {len(self._pending)} heats to run"
+        )
+
+    async def refresh_heats(self, session: AsyncSession, heat_ids: Iterable[int]) -> None:
+        """Reload heats after a status, lane or result change (deleted heats are dropped)"""
+        heat_ids = set(heat_ids)
+        if not heat_ids and self.loaded:
+            return
+
+        try:
+            async with self._lock():
+                if not self.loaded:
+                    await self._load(session)
+                    return
+
+                rows = (
+                    await session.execute(self._heats_query().where(Heat.id.in_(heat_ids)))
+                ).all()
+                for heat_id in heat_ids:
+                    self._remove(heat_id)
+
+                last_changed = self._last is not None and self._last.heat_id in heat_ids
+                if last_changed:
+                    self._last = None
+                self._completions = [
+                    entry for entry in self._completions if entry[1] not in heat_ids
+                ]
+                for heat in self._group(rows):
+                    if heat.status != "completed":
+                        self._add(heat)
+                        continue
+                    if heat.completed_time is not None:
+                        self._record_completion(heat)
+                    if self._last is None or (heat.completed_time or datetime.min) >= (
+                            self._last.completed_time or datetime.min):
+                        self._last = heat
+
+                if last_changed and (self._last is None or self._last.status != "completed"):
+                    # The last result was cleared or removed; fall back to the one before it
+                    self._last = await self._latest_completed(session)
+
+                self._render()
+        except Exception as e:
+            logger.error(f"Failed to refresh race queue for heats {sorted(heat_ids)}: {str(e)}")
+            self.loaded = False
+
+    async def refresh_round(self, session: AsyncSession, round_id: int) -> None:
+        """Reload a round's heats after it is scheduled or edited"""
+        heat_ids = {heat.heat_id for heat in self._pending.values() if heat.round_id == round_id}
+        if self._last is not None and self._last.round_id == round_id:
+            heat_ids.add(self._last.heat_id)
+        try:
+            result = await session.execute(
+                select(Heat.id).where(Heat.roundid == round_id, Heat.status != "completed")
+            )
+            heat_ids.update(result.scalars())
+        except Exception as e:
+            logger.error(f"Failed to refresh race queue for round {round_id}: {str(e)}")
+            self.loaded = False
+            return
+        await self.refresh_heats(session, heat_ids)
+
+    async def refresh_racers(self, session: AsyncSession, racer_ids: Iterable[int]) -> None:
+        """Re-render heats showing racers whose name or car number changed"""
+        racer_ids = set(racer_ids)
+        heats = list(self._pending.values()) + ([self._last] if self._last else [])
+        await self.refresh_heats(session, {
+            heat.heat_id for heat in heats if any(lane.racer_id in racer_ids for lane in heat.lanes)
+        })
+
+    @staticmethod
+    def _heats_query():
+        # A corrected result names the racer who actually ran the lane
+        racer_id = func.coalesce(RaceResult.racer_id, RacerHeat.racer_id)
+        return (
+            select(Heat.id, Heat.roundid, Round.name, Round.roundno, Heat.heat, Heat.status,
+                   Heat.completed_time, RacerHeat.lane, Racer.id, Racer.firstname, Racer.lastname,
+                   Racer.carno, RaceResult.time, RaceResult.place)
+            .select_from(Heat)
+            .join(Round, Heat.roundid == Round.id)
+            .outerjoin(RacerHeat, RacerHeat.heat_id == Heat.id)
+            .outerjoin(
+                RaceResult, and_(RaceResult.heat_id == Heat.id, RaceResult.lane == RacerHeat.lane)
+            )
+            .outerjoin(Racer, Racer.id == racer_id)
+            .order_by(Heat.id, RacerHeat.lane)
+        )
+
+    async def _latest_completed(self, session: AsyncSession) -> Optional[QueueHeat]:
+        heat_id = await session.scalar(
+            select(Heat.id)
+            .where(Heat.status == "completed")
+            .order_by(Heat.completed_time.desc(), Heat.id.desc())
+            .limit(1)
+        )
+        if heat_id is None:
+            return None
+        rows = (await session.execute(self._heats_query().where(Heat.id == heat_id))).all()
+        heats = self._group(rows)
+        return heats[0] if heats else None
+
+    @staticmethod
+    def _group(rows) -> List[QueueHeat]:
+        heats: Dict[int, QueueHeat] = {}
+        lanes: Dict[int, List[QueueLane]] = {}
+        for (heat_id, round_id, round_name, roundno, heat_no, status, completed_time,
+             lane, racer_id, firstname, lastname, carno, time, place) in rows:
+            if heat_id not in heats:
+                heats[heat_id] = QueueHeat(heat_id, round_id, round_name, roundno or 0, heat_no,
+                                           status or "scheduled", completed_time, ())
+                lanes[heat_id] = []
+            if lane is not None and racer_id is not None:
+                lanes[heat_id].append(
+                    QueueLane(lane, racer_id, f"{firstname} {lastname}", carno, time, place)
+                )
+        return [heat._replace(lanes=tuple(lanes[heat_id])) for heat_id, heat in heats.items()]
+
+    def _add(self, heat: QueueHeat) -> None:
+        self._pending[heat.heat_id] = heat
+        bisect.insort(self._order, heat.order)
+        if heat.status == "in_progress":
+            self._running.add(heat.heat_id)
+
+    def _record_completion(self, heat: QueueHeat) -> None:
+        bisect.insort(self._completions, (heat.completed_time, heat.heat_id))
+        del self._completions[:-(ITINERARY_CYCLE_SAMPLES + 1)]
+
+    def _remove(self, heat_id: int) -> None:
+        heat = self._pending.pop(heat_id, None)
+        if heat is None:
+            return
+        index = bisect.bisect_left(self._order, heat.order)
+        if index < len(self._order) and self._order[index] == heat.order:
+            del self._order[index]
+        self._running.discard(heat_id)
+
+    # Rendering
+
+    def _render(self) -> None:
+        """Serialize the board once, for every display that polls it until the next change"""
+        current = None
+        if self._running:
+            current = min(
+                (self._pending[heat_id] for heat_id in self._running), key=lambda heat: heat.order
+            )
+        elif self._order:
+            current = self._pending[self._order[0][3]]
+
+        on_deck = []
+        for order in self._order:
+            if len(on_deck) >= self.on_deck:
+                break
+            if current is None or order[3] != current.heat_id:
+                on_deck.append(self._pending[order[3]])
+
+        self._index(current)
+
+        self.version += 1
+        self._board = RaceBoard(
+            track=self.track,
+            version=self.version,
+            updated_at=datetime.utcnow(),
+            current=_board_heat(current),
+            on_deck=[_board_heat(heat) for heat in on_deck],
+            last_result=_board_heat(self._last),
+            remaining=len(self._pending)
+        ).model_dump_json().encode()
+
+    def _index(self, current: Optional[QueueHeat]) -> None:
+        """Index each racer's remaining heats, and every heat's place in the queue"""
+        running_order = [order[3] for order in self._order]
+        if current is not None:
+            running_order.remove(current.heat_id)
+            running_order.insert(0, current.heat_id)
+
+        self._positions = {}
+        self._racer_heats = {}
+        self._cars = {}
+        for position, heat_id in enumerate(running_order):
+            self._positions[heat_id] = position
+            for lane in self._pending[heat_id].lanes:
+                self._racer_heats.setdefault(lane.racer_id, []).append((heat_id, lane))
+                if lane.car_number:
+                    self._cars[lane.car_number] = lane.racer_id
+
+    # Itineraries
+
+    def cycle_time(self) -> float:
+        """Average seconds between recent heat completions, skipping breaks"""
+        times = [completed for completed, _ in self._completions]
+        gaps = ((later - earlier).total_seconds() for earlier, later in zip(times, times[1:]))
+        cycles = [gap for gap in gaps if 0 < gap <= ITINERARY_MAX_CYCLE]
+        return sum(cycles) / len(cycles) if cycles else ITINERARY_DEFAULT_CYCLE
+
+    def racer_for_car(self, car_number: str) -> Optional[int]:
+        """Racer ID for a car number, if that car has heats still to run"""
+        return self._cars.get(car_number)
+
+    def itinerary(self, racer_id: int, now: Optional[datetime] = None) -> List[ItineraryStop]:
+        """A racer's remaining heats in running order, with an ETA for each"""
+        heats = self._racer_heats.get(racer_id)
+        if not heats:
+            return []
+
+        now = now or datetime.utcnow()
+        cycle = timedelta(seconds=self.cycle_time())
+        # The next heat starts a cycle after the last one finished, or now if that has passed
+        next_start = max(now, self._completions[-1][0] + cycle) if self._completions else now
+
+        return [
+            ItineraryStop(
+                heat=self._pending[heat_id],
+                lane=lane,
+                position=self._positions[heat_id],
+                eta=next_start + cycle * self._positions[heat_id]
+            )
+            for heat_id, lane in heats
+        ]
+
+
+def _board_heat(heat: Optional[QueueHeat]) -> Optional[BoardHeat]:
+    if heat is None:
+        return None
+    return BoardHeat(
+        heat_id=heat.heat_id,
+        round_id=heat.round_id,
+        round_name=heat.round_name,
+        heat=heat.heat,
+        status=heat.status,
+        lanes=[BoardLane(**lane._asdict()) for lane in heat.lanes]
+    )
+
+
+# Queue for the track the timer is attached to
+race_queue = RaceQueue()
+
+
+async def load_race_queue() -> None:
+    """Startup hook: build the race queue from the configured database"""
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from backend.config import DATABASE_URL
+
+    engine = create_async_engine(DATABASE_URL)
+    async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+    try:
+        async with async_session() as session:
+            await race_queue.load(session)
+    except Exception as e:
+        # Not fatal: the next heat change loads the queue
+        logger.error(f"Failed to load race queue at startup: {str(e)}")
+        race_queue.clear()
+    finally:
+        await engine.dispose()
@@ -8,6 +8,7 @@ ensuring fair lane assignments, and managing advancement between rounds.
 
 import random
 import logging
+import time
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy import select, func
@@ -15,6 +16,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from backend.api.models import Round, Heat, Racer, RacerHeat, RaceResult, Division
+from .journal import result_journal
+from .heat_events import round_changed
+from .metrics import racer_count_bucket, scheduler_generate_duration, standings_duration
 
 logger = logging.getLogger(__name__)
 
@@ -180,6 +184,8 @@ class RaceScheduler:
         if heat_count.scalar() > 0:
             raise ValueError(f"Heats already exist for round {round_obj.name}")
         
+        started = time.perf_counter()
+        
         # Get racers based on round type
         racers = await self._get_racers_for_round(round_obj, lanes_per_heat)
         
@@ -187,7 +193,12 @@ class RaceScheduler:
             raise ValueError(f"No eligible racers found for round {round_obj.name}")
         
         # Create heats and assign racers
-        return await self._create_heats_with_racers(round_obj, racers, lanes_per_heat)
+        heats = await self._create_heats_with_racers(round_obj, racers, lanes_per_heat)
+        
+        scheduler_generate_duration.observe(
+            time.perf_counter() - started, racers=racer_count_bucket(len(racers))
+        )
+        return heats
     
     async def _get_racers_for_round(
         self, 
@@ -451,8 +462,29 @@ class RaceScheduler:
                 created_heats.append(heat)
         
         await self.session.commit()
+        await self._journal_schedule(round_obj.id, created_heats)
         return created_heats
     
+    async def _journal_schedule(self, round_id: int, heats: List[Heat]) -> None:
+        """Record newly scheduled heats and their lanes in the journal and in-memory views"""
+        if not heats:
+            return
+            
+        lanes_query = (
+            select(RacerHeat.heat_id, RacerHeat.lane, RacerHeat.racer_id)
+            .where(RacerHeat.heat_id.in_([heat.id for heat in heats]))
+            .order_by(RacerHeat.heat_id, RacerHeat.lane)
+        )
+        lanes_by_heat: Dict[int, List[List[int]]] = {}
+        for heat_id, lane, racer_id in await self.session.execute(lanes_query):
+            lanes_by_heat.setdefault(heat_id, []).append([lane, racer_id])
+            
+        await result_journal.append("schedule", round_id=round_id, heats=[
+            {"heat_id": heat.id, "heat": heat.heat, "lanes": lanes_by_heat.get(heat.id, [])}
+            for heat in heats
+        ])
+        await round_changed(self.session, round_id)
+    
     def _generate_balanced_lanes(
         self, 
         racers: List[Dict[str, Any]], 
@@ -727,6 +759,7 @@ class RaceScheduler:
             self.session.add(racer_heat)
             
         await self.session.commit()
+        await self._journal_schedule(final_round_id, [heat])
         
         return [heat]
     
@@ -849,6 +882,7 @@ class RaceScheduler:
                 self.session.add(racer_heat)
             
             await self.session.commit()
+            await self._journal_schedule(round_id, [heat])
             return [heat]
         else:
             # Need multiple heats for championship
@@ -879,6 +913,7 @@ class RaceScheduler:
                 self.session.add(racer_heat)
             
             await self.session.commit()
+            await self._journal_schedule(round_id, [heat])
             return [heat]
             
     async def get_race_standings(self, division_id: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -891,6 +926,8 @@ class RaceScheduler:
         Returns:
             List of racer standings with average times and race counts
         """
+        started = time.perf_counter()
+        
         # Build query to get results for all completed heats
         query = (
             select(
@@ -972,4 +1009,5 @@ class RaceScheduler:
                     # Add racers from this division (already sorted by avg_time)
                     standings.extend(standings_by_division[division.id])
         
+        standings_duration.observe(time.perf_counter() - started)
         return standings
\ No newline at end of file
@@ -0,0 +1,319 @@
+# backend/api/services/racer_import.py
+"""
+Bulk racer import service for Derby Director.
+
+Registration spreadsheets (CSV or XLSX) are read row by row, validated against
+RacerCreate and inserted in chunked executemany batches inside a single
+transaction. Division and rank names are resolved through one prefetch each,
+so the number of queries does not grow with the number of rows.
+"""
+
+import codecs
+import csv
+import logging
+import re
+import zipfile
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+from xml.etree.ElementTree import iterparse
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.models import Division, Racer, Rank
+from backend.api.schemas import RacerCreate
+
+logger = logging.getLogger(__name__)
+
+# Number of racers per executemany batch
+IMPORT_BATCH_SIZE = 500
+
+# Maximum number of row errors returned in a report
+MAX_REPORTED_ERRORS = 1000
+
+# Spreadsheet header aliases, keyed by normalized header text
+HEADER_ALIASES: Dict[str, str] = {
+    "firstname": "firstname",
+    "first": "firstname",
+    "firstnames": "firstname",
+    "lastname": "lastname",
+    "last": "lastname",
+    "surname": "lastname",
+    "division": "division",
+    "divisionname": "division",
+    "divisionid": "divisionid",
+    "rank": "rank",
+    "rankname": "rank",
+    "rankid": "rankid",
+    "carno": "carno",
+    "carnumber": "carno",
+    "car": "carno",
+    "carname": "carname",
+    "barcode": "barcode",
+}
+
+_XLSX_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+def normalize_header(header: str) -> Optional[str]:
+    """Map a spreadsheet column header to a racer field name"""
+    key = re.sub(r"[^a-z]", "", header.lower())
+    return HEADER_ALIASES.get(key)
+
+
+def iter_csv_rows(fileobj: BinaryIO, encoding: str = "utf-8-sig") -> Iterator[List[str]]:
+    """Yield CSV rows from a binary file without reading it all into memory"""
+    reader = codecs.getreader(encoding)(fileobj, errors="replace")
+    yield from csv.reader(reader)
+
+
+def _column_index(cell_ref: str) -> int:
+    """Convert a cell reference like 'C12' to a zero-based column index"""
+    index = 0
+    for char in cell_ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + (ord(char.upper()) - ord("A") + 1)
+    return index - 1
+
+
+def _read_shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    """Read the shared string table of an XLSX workbook"""
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+
+    strings = []
+    with archive.open("xl/sharedStrings.xml") as handle:
+        for _, elem in iterparse(handle):
+            if elem.tag == f"{_XLSX_NS}si":
+                strings.append("".join(t.text or "" for t in elem.iter(f"{_XLSX_NS}t")))
+                elem.clear()
+    return strings
+
+
+def iter_xlsx_rows(fileobj: BinaryIO) -> Iterator[List[str]]:
+    """
+    Yield rows from the first worksheet of an XLSX workbook.
+
+    Uses the standard library only: the worksheet XML is parsed incrementally
+    and each row element is discarded once it has been converted.
+    """
+    with zipfile.ZipFile(fileobj) as archive:
+        sheets = sorted(
+            name for name in archive.namelist()
+            if re.fullmatch(r"xl/worksheets/sheet\d+\.xml", name)
+        )
+        if not sheets:
+            raise ValueError("Workbook does not contain any worksheets")
+        sheet = "xl/worksheets/sheet1.xml" if "xl/worksheets/sheet1.xml" in sheets else sheets[0]
+
+        shared_strings = _read_shared_strings(archive)
+
+        with archive.open(sheet) as handle:
+            for _, elem in iterparse(handle):
+                if elem.tag != f"{_XLSX_NS}row":
+                    continue
+
+                cells: Dict[int, str] = {}
+                for position, cell in enumerate(elem.iter(f"{_XLSX_NS}c")):
+                    ref = cell.get("r")
+                    column = _column_index(ref) if ref else position
+                    cell_type = cell.get("t")
+
+                    if cell_type == "inlineStr":
+                        value = "".join(t.text or "" for t in cell.iter(f"{_XLSX_NS}t"))
+                    else:
+                        v = cell.find(f"{_XLSX_NS}v")
+                        value = v.text if v is not None and v.text is not None else ""
+                        if cell_type == "s" and value:
+                            value = shared_strings[int(value)]
+                        elif cell_type is None and value.endswith(".0"):
+                            # Whole numbers (car numbers) are stored as floats
+                            value = value[:-2]
+                    cells[column] = value
+
+                elem.clear()
+                if cells:
+                    yield [cells.get(i, "") for i in range(max(cells) + 1)]
+                else:
+                    yield []
+
+
+def iter_upload_rows(
+    fileobj: BinaryIO, filename: str, content_type: str = ""
+) -> Iterator[List[str]]:
+    """Pick a row reader for an uploaded file based on its name or content type"""
+    if filename.lower().endswith(".xlsx") or "spreadsheetml" in content_type:
+        return iter_xlsx_rows(fileobj)
+    return iter_csv_rows(fileobj)
+
+
+class RacerImporter:
+    """
+    Service for importing many racers in one transaction.
+    """
+
+    def __init__(self, session: AsyncSession, batch_size: int = IMPORT_BATCH_SIZE):
+        """Initialize with a database session."""
+        self.session = session
+        self.batch_size = batch_size
+        self.errors: List[Dict[str, Any]] = []
+        self.error_count = 0
+
+    def _add_error(self, row: int, field: Optional[str], message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "field": field, "message": message})
+
+    async def _prefetch(
+        self,
+    ) -> Tuple[Dict[str, int], Dict[str, int], Set[int], Set[int], Set[str]]:
+        """Load lookup tables needed to resolve and validate every row"""
+        divisions = (await self.session.execute(select(Division.id, Division.name))).all()
+        ranks = (await self.session.execute(select(Rank.id, Rank.name))).all()
+        barcodes = await self.session.execute(
+            select(Racer.barcode).filter(Racer.barcode.is_not(None))
+        )
+
+        return (
+            {name.strip().lower(): id_ for id_, name in divisions},
+            {name.strip().lower(): id_ for id_, name in ranks},
+            {id_ for id_, _ in divisions},
+            {id_ for id_, _ in ranks},
+            {barcode.strip().upper() for barcode in barcodes.scalars()},
+        )
+
+    async def import_rows(self, rows: Iterator[List[str]], dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Validate and insert racers from spreadsheet rows.
+
+        Args:
+            rows: Row iterator whose first row is the header
+            dry_run: Validate only; roll back instead of committing
+
+        Returns:
+            Summary with counts and a per-row error report
+        """
+        header = next(rows, None)
+        if not header:
+            raise ValueError("Import file is empty")
+
+        fields = [normalize_header(h) for h in header]
+        if "firstname" not in fields or "lastname" not in fields:
+            raise ValueError("Import file must have first name and last name columns")
+        if "division" not in fields and "divisionid" not in fields:
+            raise ValueError("Import file must have a division column")
+
+        division_ids, rank_ids, valid_division_ids, valid_rank_ids, barcodes = (
+            await self._prefetch()
+        )
+
+        total_rows = 0
+        imported = 0
+        batch: List[Dict[str, Any]] = []
+
+        # Header is spreadsheet row 1, so data rows start at 2
+        for row_number, row in enumerate(rows, start=2):
+            values = {
+                field: value.strip()
+                for field, value in zip(fields, row)
+                if field is not None and value is not None and value.strip()
+            }
+            if not values:
+                continue  # Skip blank lines
+            total_rows += 1
+
+            record, ok = self._resolve_row(
+                row_number, values, division_ids, rank_ids, valid_division_ids, valid_rank_ids
+            )
+            if not ok:
+                continue
+
+            try:
+                racer = RacerCreate.model_validate(record)
+            except ValidationError as e:
+                for error in e.errors():
+                    field = ".".join(str(part) for part in error["loc"]) or None
+                    self._add_error(row_number, field, error["msg"])
+                continue
+
+            if racer.barcode:
+                barcode = racer.barcode.upper()
+                if barcode in barcodes:
+                    self._add_error(row_number, "barcode", f"Duplicate barcode '{racer.barcode}'")
+                    continue
+                barcodes.add(barcode)
+
+            batch.append(racer.model_dump())
+            if len(batch) >= self.batch_size:
+                imported += await self._flush_batch(batch)
+                batch = []
+
+        if batch:
+            imported += await self._flush_batch(batch)
+
+        if dry_run:
+            await self.session.rollback()
+        else:
+            await self.session.commit()
+
+        logger.info(
+            f"Racer import: {imported} imported, {self.error_count} errors"
+            f"{' (dry run)' if dry_run else ''}"
+        )
+
+        return {
+            "total_rows": total_rows,
+            "imported": imported,
+            "failed": total_rows - imported,
+            "dry_run": dry_run,
+            "errors": self.errors,
+        }
+
+    def _resolve_row(
+        self,
+        row_number: int,
+        values: Dict[str, str],
+        division_ids: Dict[str, int],
+        rank_ids: Dict[str, int],
+        valid_division_ids: Set[int],
+        valid_rank_ids: Set[int],
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Turn division/rank names into IDs; returns the record and whether it resolved"""
+        record: Dict[str, Any] = {
+            key: value for key, value in values.items()
+            if key not in ("division", "divisionid", "rank", "rankid")
+        }
+
+        if "divisionid" in values:
+            record["divisionid"] = values["divisionid"]
+            if (values["divisionid"].isdigit()
+                    and int(values["divisionid"]) not in valid_division_ids):
+                self._add_error(row_number, "divisionid",
+                                f"Unknown division ID {values['divisionid']}")
+                return record, False
+        elif "division" in values:
+            division_id = division_ids.get(values["division"].lower())
+            if division_id is None:
+                self._add_error(row_number, "division", f"Unknown division '{values['division']}'")
+                return record, False
+            record["divisionid"] = division_id
+
+        if "rankid" in values:
+            record["rankid"] = values["rankid"]
+            if values["rankid"].isdigit() and int(values["rankid"]) not in valid_rank_ids:
+                self._add_error(row_number, "rankid", f"Unknown rank ID {values['rankid']}")
+                return record, False
+        elif "rank" in values:
+            rank_id = rank_ids.get(values["rank"].lower())
+            if rank_id is None:
+                self._add_error(row_number, "rank", f"Unknown rank '{values['rank']}'")
+                return record, False
+            record["rankid"] = rank_id
+
+        return record, True
+
+    async def _flush_batch(self, batch: List[Dict[str, Any]]) -> int:
+        """Insert a batch of validated racers with a single executemany"""
+        await self.session.execute(insert(Racer), batch)
+        return len(batch)
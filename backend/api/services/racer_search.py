@@ -0,0 +1,102 @@
+# backend/api/services/racer_search.py
+"""
+Racer search service for Derby Director.
+
+On SQLite the search uses the racers_fts FTS5 index created by migration 002,
+which gives ranked prefix matching in roughly constant time regardless of how
+many racers are registered. Other backends (or databases that have not been
+migrated yet) fall back to a case-insensitive LIKE scan.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional
+
+from sqlalchemy import Select, column, func, literal_column, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.models import Racer
+
+logger = logging.getLogger(__name__)
+
+# Lightweight handle on the FTS5 table; deliberately not part of Base.metadata
+racers_fts = table("racers_fts", column("rowid"), column("rank"))
+
+# Cache of whether the FTS index exists, keyed by database URL
+_fts_available: Dict[str, bool] = {}
+
+# Characters that carry meaning in the FTS5 query syntax
+_FTS_SPECIAL = re.compile(r'["*^():{}+\-]')
+
+
+def build_fts_query(search: str) -> Optional[str]:
+    """
+    Convert free text from the search box into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term, so "jo smi" matches "John Smith".
+    Returns None when the search contains nothing indexable.
+    """
+    terms: List[str] = []
+    for token in _FTS_SPECIAL.sub(" ", search).split():
+        terms.append(f'"{token}"*')
+
+    if not terms:
+        return None
+
+    return " ".join(terms)
+
+
+async def fts_available(session: AsyncSession) -> bool:
+    """Check (once per database) whether the racers_fts index can be used"""
+    bind = session.get_bind()
+    if bind.dialect.name != "sqlite":
+        return False
+
+    key = str(bind.url)
+    if key not in _fts_available:
+        result = await session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'racers_fts'")
+        )
+        _fts_available[key] = result.scalar() is not None
+        if not _fts_available[key]:
+            logger.warning("racers_fts index not found; racer search will use LIKE scans")
+
+    return _fts_available[key]
+
+
+def apply_like_search(query: Select, search: str) -> Select:
+    """Filter a racer query with a case-insensitive substring match"""
+    search_term = f"%{search.lower()}%"
+    return query.filter(
+        (func.lower(Racer.firstname).like(search_term)) |
+        (func.lower(Racer.lastname).like(search_term)) |
+        (func.lower(Racer.carno).like(search_term)) |
+        (func.lower(Racer.carname).like(search_term))
+    )
+
+
+async def apply_racer_search(session: AsyncSession, query: Select, search: str) -> Select:
+    """
+    Restrict a select(Racer) query to racers matching the search text.
+
+    Args:
+        session: Database session (used to detect FTS support)
+        query: A query selecting from the racers table
+        search: Raw text typed by the user
+
+    Returns:
+        The filtered query, ordered by relevance when the FTS index is used
+    """
+    if not await fts_available(session):
+        return apply_like_search(query, search)
+
+    fts_query = build_fts_query(search)
+    if fts_query is None:
+        return apply_like_search(query, search)
+
+    return (
+        query
+        .join(racers_fts, racers_fts.c.rowid == Racer.id)
+        .filter(literal_column("racers_fts").op("MATCH")(fts_query))
+        .order_by(racers_fts.c.rank)
+    )
@@ -0,0 +1,63 @@
+# backend/api/services/render_pool.py
+"""
+Worker processes for document rendering
+
+PDF rendering is pure CPU work in reportlab, so it runs in a process pool
+rather than on the event loop. The pool starts on first use and the workers
+stay up, which keeps what each worker caches between jobs (registered
+fonts, decoded images) warm for the next request.
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterable, Optional, Tuple
+
+from backend.config import REPORT_WORKERS
+
+
+class RenderPool:
+    """Lazily started process pool for rendering jobs"""
+
+    def __init__(self, workers: int = REPORT_WORKERS):
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run one job in a worker"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor(), fn, *args)
+
+    async def map_ordered(self, fn: Callable[..., Any], jobs: Iterable[Tuple[Any, ...]],
+                          window: Optional[int] = None) -> AsyncIterator[Any]:
+        """
+        Run jobs in parallel and yield their results in submission order.
+
+        At most `window` jobs (default: twice the worker count) are in flight
+        or waiting to be consumed, so a slow consumer bounds memory use.
+        """
+        window = window or self.workers * 2
+        pending = []
+        try:
+            for args in jobs:
+                pending.append(asyncio.ensure_future(self.run(fn, *args)))
+                if len(pending) >= window:
+                    yield await pending.pop(0)
+            while pending:
+                yield await pending.pop(0)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        """Shut down the worker processes (shutdown hook)"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+# Shared pool for report and certificate rendering
+render_pool = RenderPool()
@@ -0,0 +1,237 @@
+# backend/api/services/result_recorder.py
+"""
+Result recording service for Derby Director.
+
+All heat result writes go through ResultRecorder so that one heat and a
+backlog of dozens of heats share the same set-based validation and are
+applied in a single transaction.
+
+Results are upserted on (heat_id, lane) rather than deleted and reinserted,
+so corrections keep their row IDs and do not churn the SQLite free list.
+Every write bumps Heat.version for the heats it touched and notifies the
+in-memory views (race analytics, race queue) of just those heats.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import Insert, and_, delete, false, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.models import Heat, Racer, RaceResult
+from backend.api.schemas import HeatResultRequest
+
+from .heat_events import heats_changed
+from .journal import result_journal
+
+logger = logging.getLogger(__name__)
+
+
+class MissingRecordError(LookupError):
+    """Raised when a submission references a heat or racer that does not exist"""
+    pass
+
+
+class ResultRecorder:
+    """
+    Service for writing heat results.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """Initialize with a database session."""
+        self.session = session
+
+    async def record_heats(self, submissions: List[HeatResultRequest]) -> List[Heat]:
+        """
+        Record results for one or more heats and mark them completed.
+
+        If the same heat appears more than once, the last submission wins,
+        which makes replaying an operator backlog idempotent.
+
+        Args:
+            submissions: Heat result submissions, in the order they were taken
+
+        Returns:
+            The completed Heat objects, in submission order
+
+        Raises:
+            MissingRecordError: If any heat or racer does not exist
+            ValueError: If a heat has no results or lists the same lane twice
+        """
+        latest: Dict[int, HeatResultRequest] = {}
+        for submission in submissions:
+            latest.pop(submission.heat_id, None)
+            latest[submission.heat_id] = submission
+        if not latest:
+            return []
+
+        racer_ids: Set[int] = set()
+        for submission in latest.values():
+            if not submission.results:
+                # lane.not_in([]) would delete every lane of the heat
+                raise ValueError(
+                    f"Heat {submission.heat_id} has no results; clear the heat instead"
+                )
+            lanes = [result.lane for result in submission.results]
+            if len(lanes) != len(set(lanes)):
+                raise ValueError(f"Heat {submission.heat_id} has more than one result for a lane")
+            racer_ids.update(result.racer_id for result in submission.results)
+
+        heats = await self._load_heats(set(latest))
+        await self._check_racers(racer_ids)
+
+        # Remove lanes that are no longer part of a heat's results; false() keeps
+        # the condition from ever compiling to an unfiltered delete
+        await self.session.execute(
+            delete(RaceResult).where(or_(false(), *(
+                and_(
+                    RaceResult.heat_id == heat_id,
+                    RaceResult.lane.not_in([result.lane for result in submission.results])
+                )
+                for heat_id, submission in latest.items()
+            )))
+        )
+
+        rows = [
+            {
+                "heat_id": heat_id,
+                "racer_id": result.racer_id,
+                "lane": result.lane,
+                "time": result.time,
+                "place": result.place,
+                "completed": True,
+            }
+            for heat_id, submission in latest.items()
+            for result in submission.results
+        ]
+        if rows:
+            upsert = self._upsert_statement()
+            if upsert is None:
+                # No native upsert: fall back to replacing the heats' rows
+                await self.session.execute(
+                    delete(RaceResult).where(RaceResult.heat_id.in_(list(latest)))
+                )
+                upsert = insert(RaceResult)
+            await self.session.execute(upsert, rows)
+
+        now = datetime.utcnow()
+        for heat in heats.values():
+            heat.status = "completed"
+            heat.completed_time = now
+            heat.version = (heat.version or 0) + 1
+
+        await self.session.commit()
+        await heats_changed(self.session, latest)
+
+        await result_journal.append("results", heats=[
+            {
+                "heat_id": heat_id,
+                "results": [
+                    [result.lane, result.racer_id, result.time, result.place]
+                    for result in submission.results
+                ],
+            }
+            for heat_id, submission in latest.items()
+        ])
+
+        logger.info(f"Recorded results for {len(latest)} heats ({len(rows)} lanes)")
+
+        return [heats[heat_id] for heat_id in latest]
+
+    async def update_lane(self, heat_id: int, lane: int, changes: Dict[str, Any]) -> RaceResult:
+        """
+        Correct a single lane result, touching only that row and its heat's version.
+
+        Args:
+            heat_id: The heat the result belongs to
+            lane: Lane number
+            changes: Columns to update (racer_id, time, place, completed)
+
+        Returns:
+            The updated RaceResult
+
+        Raises:
+            MissingRecordError: If there is no result for the lane, or the new racer does not exist
+        """
+        if "racer_id" in changes:
+            await self._check_racers({changes["racer_id"]})
+
+        if changes:
+            result = await self.session.execute(
+                update(RaceResult)
+                .where(RaceResult.heat_id == heat_id, RaceResult.lane == lane)
+                .values(**changes)
+            )
+            if result.rowcount == 0:
+                raise MissingRecordError(f"No result for lane {lane} of heat {heat_id}")
+
+            await self.session.execute(
+                update(Heat).where(Heat.id == heat_id).values(version=Heat.version + 1)
+            )
+
+        race_result = (await self.session.execute(
+            select(RaceResult).filter(RaceResult.heat_id == heat_id, RaceResult.lane == lane)
+        )).scalar_one_or_none()
+        if race_result is None:
+            raise MissingRecordError(f"No result for lane {lane} of heat {heat_id}")
+
+        await self.session.commit()
+
+        if changes:
+            await heats_changed(self.session, [heat_id])
+            await result_journal.append("lane", heat_id=heat_id, lane=lane, changes=changes)
+
+        return race_result
+
+    def _upsert_statement(self) -> Optional[Insert]:
+        """Build an INSERT ... ON CONFLICT(heat_id, lane) DO UPDATE for the current dialect"""
+        dialect = self.session.get_bind().dialect.name
+        columns = ("racer_id", "time", "place", "completed")
+
+        if dialect in ("sqlite", "postgresql"):
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            stmt = dialect_insert(RaceResult)
+            return stmt.on_conflict_do_update(
+                index_elements=["heat_id", "lane"],
+                set_={column: stmt.excluded[column] for column in columns}
+            )
+
+        if dialect in ("mysql", "mariadb"):
+            from sqlalchemy.dialects.mysql import insert as dialect_insert
+            stmt = dialect_insert(RaceResult)
+            return stmt.on_duplicate_key_update(
+                {column: stmt.inserted[column] for column in columns}
+            )
+
+        return None
+
+    async def _load_heats(self, heat_ids: Set[int]) -> Dict[int, Heat]:
+        """Load all referenced heats with one query"""
+        result = await self.session.execute(select(Heat).filter(Heat.id.in_(heat_ids)))
+        heats = {heat.id: heat for heat in result.scalars()}
+
+        missing = sorted(heat_ids - set(heats))
+        if missing:
+            raise MissingRecordError(
+                f"Heat with ID {missing[0]} not found" if len(missing) == 1
+                else f"Heats with IDs {', '.join(map(str, missing))} not found"
+            )
+
+        return heats
+
+    async def _check_racers(self, racer_ids: Set[int]) -> None:
+        """Verify all referenced racers exist with one query"""
+        if not racer_ids:
+            return
+
+        result = await self.session.execute(select(Racer.id).filter(Racer.id.in_(racer_ids)))
+        missing = sorted(racer_ids - set(result.scalars()))
+        if missing:
+            raise MissingRecordError(
+                f"Racer with ID {missing[0]} not found" if len(missing) == 1
+                else f"Racers with IDs {', '.join(map(str, missing))} not found"
+            )
@@ -0,0 +1,326 @@
+# backend/api/services/results_publisher.py
+"""
+Published results snapshot for Derby Director.
+
+During the awards ceremony every phone in the room asks for the same few
+pages at once. The publisher writes those pages to a directory as static
+files so any static file server can carry that traffic without touching the
+app or the database: standings overall and by rank, round results and round
+charts, each racer's history, and a minimal HTML index linking them.
+
+Files sit at the same paths as the API endpoints they mirror, each JSON file
+with a pre-gzipped ".gz" sibling (for nginx gzip_static and the like):
+
+    PUBLISH_DIR/index.html
+    PUBLISH_DIR/reports/results.json
+    PUBLISH_DIR/reports/standings.json, reports/standings/{rank}.json
+    PUBLISH_DIR/reports/races/{round_id}.json
+    PUBLISH_DIR/reports/racers/{racer_id}.json
+    PUBLISH_DIR/rounds/{round_id}/chart.json
+
+After each committed change the heat events name the rounds and racers
+involved and only their files are regenerated (standings and the index are
+rebuilt every time, since any result can move them). Report data comes from
+the in-memory race analytics; only round charts are queried. Files whose
+content has not changed are left alone, and every file is replaced
+atomically so a server never sends a half-written one.
+
+Publishing happens off the request: schedule() only records the rounds and
+racers to regenerate, and a background task publishes them on its own
+database session, so write latency does not depend on how much a change
+touches. Changes scheduled while a publish is queued or running are merged
+into the next one, so a burst of results is published once or twice rather
+than once per request.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import html
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.schemas import (
+    RaceReportResponse,
+    RacerHistoryEntry,
+    RacerResultResponse,
+    RaceSummaryResponse,
+)
+from backend.config import PUBLISH_DIR
+
+from .race_analytics import race_analytics, racer_history_entries, racer_results
+from .round_charts import load_round_chart, round_chart_version
+
+logger = logging.getLogger(__name__)
+
+_results_list = TypeAdapter(List[RacerResultResponse])
+_summaries_list = TypeAdapter(List[RaceSummaryResponse])
+_history_list = TypeAdapter(List[RacerHistoryEntry])
+
+_UNSAFE = re.compile(r"[^a-z0-9_-]+")
+
+
+def rank_slug(rank: str) -> str:
+    """File name for a rank's standings; the API matches ranks case-insensitively"""
+    return _UNSAFE.sub("-", rank.strip().lower()).strip("-") or "unranked"
+
+
+class ResultsPublisher:
+    """Writes the static results snapshot, regenerating only what a change touches"""
+
+    def __init__(self, root: Optional[Path] = PUBLISH_DIR):
+        self.root = root
+        self._locks: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+        # Relative path -> digest of the content last written there
+        self._digests: Dict[str, str] = {}
+        # Racers with a page linked from each round, to refresh when they drop out of it
+        self._round_racers: Dict[int, Set[int]] = {}
+        # Rounds and racers waiting for the background publish
+        self._pending_rounds: Set[int] = set()
+        self._pending_racers: Set[int] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    def _lock(self) -> asyncio.Lock:
+        # One lock per event loop, so test clients on fresh loops do not share one
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            self._locks = {loop: asyncio.Lock()}
+            lock = self._locks[loop]
+        return lock
+
+    def schedule(self, round_ids: Iterable[int] = (), heat_ids: Iterable[int] = (),
+                 racer_ids: Iterable[int] = ()) -> None:
+        """
+        Queue the files for the given rounds, the rounds of the given heats and the given
+        racers to be regenerated in the background. Call after the race analytics have
+        been refreshed for the change; returns without waiting for the publish.
+        """
+        if not self.enabled:
+            return
+
+        self._pending_rounds |= set(round_ids) | race_analytics.heat_rounds(heat_ids)
+        self._pending_racers |= set(racer_ids)
+
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._publish_pending())
+
+    async def flush(self) -> None:
+        """Wait for scheduled changes to be published (tests, shutdown hook)"""
+        loop = asyncio.get_running_loop()
+        # A task that finds more work as it finishes hands it to a new task
+        while self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            await self._task
+
+    async def _publish_pending(self) -> None:
+        """Publish everything scheduled until nothing is left"""
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        from backend.config import DATABASE_URL
+
+        # Let the rest of this loop tick schedule its changes into the same publish
+        await asyncio.sleep(0)
+
+        engine = create_async_engine(DATABASE_URL)
+        async_session = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            while self._pending_rounds or self._pending_racers:
+                round_ids, self._pending_rounds = self._pending_rounds, set()
+                racer_ids, self._pending_racers = self._pending_racers, set()
+                async with async_session() as session:
+                    await self.publish(session, round_ids=round_ids, racer_ids=racer_ids)
+        finally:
+            await engine.dispose()
+
+        # schedule() calls made while the engine was disposed saw this task still
+        # running and left their changes to it
+        if self._pending_rounds or self._pending_racers:
+            self._task = asyncio.get_running_loop().create_task(self._publish_pending())
+
+    async def publish_all(self, session: AsyncSession) -> None:
+        """Write the complete snapshot"""
+        if not self.enabled:
+            return
+        await race_analytics.ensure_loaded(session)
+        await self.publish(
+            session,
+            round_ids=[summary.race_id for summary in race_analytics.round_summaries()],
+            racer_ids=race_analytics.racer_ids()
+        )
+
+    async def publish(self, session: AsyncSession, round_ids: Iterable[int] = (),
+                      heat_ids: Iterable[int] = (), racer_ids: Iterable[int] = ()) -> None:
+        """
+        Regenerate the files for the given rounds, the rounds of the given heats and the
+        given racers, plus the standings and the index. Call after the race analytics
+        have been refreshed for the change.
+        """
+        if not self.enabled:
+            return
+
+        try:
+            async with self._lock():
+                await race_analytics.ensure_loaded(session)
+                round_ids = set(round_ids) | race_analytics.heat_rounds(heat_ids)
+                racer_ids = set(racer_ids)
+
+                files: Dict[str, Optional[bytes]] = {}
+                for round_id in sorted(round_ids):
+                    racer_ids |= await self._round_files(session, round_id, files)
+                for racer_id in sorted(racer_ids):
+                    history = race_analytics.racer_history(racer_id)
+                    files[f"reports/racers/{racer_id}.json"] = (
+                        None
+                        if history is None
+                        else _history_list.dump_json(racer_history_entries(history))
+                    )
+                self._summary_files(files)
+
+                written = await asyncio.get_running_loop().run_in_executor(None, self._write, files)
+                if written:
+                    logger.info(f"Published {written} results files to {self.root}")
+        except Exception as e:
+            # The change itself is committed; the next publish catches the snapshot up
+            logger.error(f"Failed to publish results for rounds {sorted(round_ids)}: {str(e)}")
+
+    async def _round_files(
+        self, session: AsyncSession, round_id: int, files: Dict[str, Optional[bytes]]
+    ) -> Set[int]:
+        """Add a round's report and chart; returns the racers whose pages it affects"""
+        report = race_analytics.round_report(round_id)
+        versioned = await round_chart_version(session, round_id)
+
+        if report is None or versioned is None:
+            files[f"reports/races/{round_id}.json"] = None
+            files[f"rounds/{round_id}/chart.json"] = None
+            return self._round_racers.pop(round_id, set())
+
+        summary, standings = report
+        files[f"reports/races/{round_id}.json"] = RaceReportResponse(
+            **summary._asdict(), results=racer_results(standings)
+        ).model_dump_json().encode()
+
+        info, version = versioned
+        chart = await load_round_chart(session, info, version)
+        files[f"rounds/{round_id}/chart.json"] = chart.model_dump_json().encode()
+
+        racers = {totals.racer_id for totals in standings}
+        affected = racers | self._round_racers.get(round_id, set())
+        self._round_racers[round_id] = racers
+        return affected
+
+    def _summary_files(self, files: Dict[str, Optional[bytes]]) -> None:
+        """Standings, the round list and the index, which any change can move"""
+        summaries = race_analytics.round_summaries()
+        files["reports/results.json"] = _summaries_list.dump_json(
+            [RaceSummaryResponse(**summary._asdict()) for summary in summaries]
+        )
+        files["reports/standings.json"] = _results_list.dump_json(
+            racer_results(race_analytics.standings())
+        )
+
+        ranks = race_analytics.ranks()
+        for rank in ranks:
+            files[f"reports/standings/{rank_slug(rank)}.json"] = _results_list.dump_json(
+                racer_results(race_analytics.standings(rank) or [])
+            )
+
+        files["index.html"] = self._index(summaries, ranks).encode()
+
+    @staticmethod
+    def _index(summaries, ranks: List[str]) -> str:
+        def link(href: str, text: str) -> str:
+            return f'<li><a href="{html.escape(href)}">{html.escape(text)}</a></li>'
+
+        rounds = "\n".join(
+            f'<li>{html.escape(summary.name)}: '
+            f'<a href="reports/races/{summary.race_id}.json">results</a>, '
+            f'<a href="rounds/{summary.race_id}/chart.json">chart</a></li>'
+            for summary in summaries
+        )
+        standings = "\n".join(
+            [link("reports/standings.json", "Overall")]
+            + [link(f"reports/standings/{rank_slug(rank)}.json", rank) for rank in ranks]
+        )
+        racers = []
+        for racer_id in race_analytics.racer_ids():
+            racer = race_analytics.racer(racer_id)
+            label = f"{racer.car_number or '-'} {racer.first_name} {racer.last_name}"
+            racers.append(link(f"reports/racers/{racer_id}.json", label))
+
+        return (
+            "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+            "<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">\n"
+            "<title>Race results</title>\n</head>\n<body>\n"
+            f"<h1>Race results</h1>\n<h2>Standings</h2>\n<ul>\n{standings}\n</ul>\n"
+            f"<h2>Rounds</h2>\n<ul>\n{rounds}\n</ul>\n"
+            f"<h2>Racers</h2>\n<ul>\n{chr(10).join(racers)}\n</ul>\n"
+            "</body>\n</html>\n"
+        )
+
+    def _write(self, files: Dict[str, Optional[bytes]]) -> int:
+        """Write changed files and their .gz siblings, remove deleted ones (runs in a thread)"""
+        written = 0
+        for relative, content in files.items():
+            target = self.root / relative
+            siblings = [target] + (
+                [target.with_name(target.name + ".gz")] if relative.endswith(".json") else []
+            )
+
+            if content is None:
+                self._digests.pop(relative, None)
+                for path in siblings:
+                    path.unlink(missing_ok=True)
+                continue
+
+            digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+            if self._digests.get(relative) == digest and target.exists():
+                continue
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # mtime=0 keeps the gzip bytes identical for identical content
+            bodies = [content, gzip.compress(content, compresslevel=9, mtime=0)]
+            for path, body in zip(siblings, bodies):
+                partial = path.with_name(f".{path.name}.part")
+                partial.write_bytes(body)
+                os.replace(partial, path)
+            self._digests[relative] = digest
+            written += 1
+        return written
+
+
+# Publisher for the configured directory; disabled unless PUBLISH_DIR is set
+results_publisher = ResultsPublisher()
+
+
+async def publish_results() -> None:
+    """Startup hook: write the complete snapshot from the configured database"""
+    if not results_publisher.enabled:
+        return
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from backend.config import DATABASE_URL
+
+    engine = create_async_engine(DATABASE_URL)
+    async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+    try:
+        async with async_session() as session:
+            await results_publisher.publish_all(session)
+    except Exception as e:
+        # Not fatal: the next heat change publishes what it touches
+        logger.error(f"Failed to publish results at startup: {str(e)}")
+    finally:
+        await engine.dispose()
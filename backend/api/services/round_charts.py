@@ -0,0 +1,112 @@
+# backend/api/services/round_charts.py
+"""
+Round chart queries for Derby Director
+
+A round chart is every heat of a round with its lanes, racers and results, in
+columnar form. Its version is computed from one aggregate query, so callers can
+check whether a chart they already have is current without loading it.
+"""
+
+import hashlib
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import and_, distinct, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.models import Heat, Racer, RaceResult, RacerHeat, Round
+from backend.api.schemas import (
+    RoundChart,
+    RoundChartHeats,
+    RoundChartInfo,
+    RoundChartLanes,
+    RoundChartRacers,
+)
+
+
+async def round_chart_version(
+    session: AsyncSession, round_id: int
+) -> Optional[Tuple[RoundChartInfo, str]]:
+    """
+    A round's details and chart version, from one aggregate query; None if the round does not exist.
+
+    Covers the round's details, which heats it has and their versions (bumped on any lane,
+    status or result change), and edits to the racers assigned to them.
+    """
+    query = (
+        select(
+            Round.name, Round.phase, Round.charttype,
+            func.count(distinct(Heat.id)), func.max(Heat.id),
+            func.coalesce(func.sum(Heat.version), 0),
+            func.count(RacerHeat.id), func.max(Racer.updated_at)
+        )
+        .select_from(Round)
+        .outerjoin(Heat, Heat.roundid == Round.id)
+        .outerjoin(RacerHeat, RacerHeat.heat_id == Heat.id)
+        .outerjoin(Racer, Racer.id == RacerHeat.racer_id)
+        .where(Round.id == round_id)
+        .group_by(Round.id)
+    )
+    row = (await session.execute(query)).one_or_none()
+    if row is None:
+        return None
+    name, phase, charttype = row[:3]
+    info = RoundChartInfo(id=round_id, name=name, phase=phase, charttype=charttype)
+    return info, hashlib.blake2b(repr(tuple(row)).encode(), digest_size=8).hexdigest()
+
+
+async def load_round_chart(session: AsyncSession, info: RoundChartInfo, version: str) -> RoundChart:
+    """Every heat of a round with lanes, racers and results, from one joined query"""
+    # A corrected result names the racer who actually ran the lane
+    racer_id = func.coalesce(RaceResult.racer_id, RacerHeat.racer_id)
+    query = (
+        select(
+            Heat.id, Heat.heat, Heat.status, Heat.completed_time, Heat.version,
+            RacerHeat.lane, Racer.id, Racer.firstname, Racer.lastname, Racer.carno,
+            RaceResult.time, RaceResult.place
+        )
+        .select_from(Heat)
+        .outerjoin(RacerHeat, RacerHeat.heat_id == Heat.id)
+        .outerjoin(
+            RaceResult, and_(RaceResult.heat_id == Heat.id, RaceResult.lane == RacerHeat.lane)
+        )
+        .outerjoin(Racer, Racer.id == racer_id)
+        .where(Heat.roundid == info.id)
+        .order_by(Heat.heat, Heat.id, RacerHeat.lane)
+    )
+
+    heats = RoundChartHeats(id=[], heat=[], status=[], completed_time=[], version=[])
+    racers = RoundChartRacers(id=[], name=[], car_number=[])
+    lanes = RoundChartLanes(heat=[], lane=[], racer=[], time=[], place=[])
+    racer_index: Dict[int, int] = {}
+
+    for (heat_id, heat_no, status, completed_time, heat_version, lane, racer, firstname, lastname,
+         carno, time, place) in await session.execute(query):
+        if not heats.id or heats.id[-1] != heat_id:
+            heats.id.append(heat_id)
+            heats.heat.append(heat_no)
+            heats.status.append(status)
+            heats.completed_time.append(completed_time)
+            heats.version.append(heat_version or 0)
+        if lane is None or racer is None:
+            continue
+
+        if racer not in racer_index:
+            racer_index[racer] = len(racers.id)
+            racers.id.append(racer)
+            racers.name.append(f"{firstname} {lastname}")
+            racers.car_number.append(carno)
+
+        lanes.heat.append(len(heats.id) - 1)
+        lanes.lane.append(lane)
+        lanes.racer.append(racer_index[racer])
+        lanes.time.append(time)
+        lanes.place.append(place)
+
+    return RoundChart(
+        round=info,
+        version=version,
+        lane_count=max(lanes.lane, default=0),
+        heats=heats,
+        racers=racers,
+        lanes=lanes
+    )
@@ -1,12 +1,35 @@
 # backend/api/services/timer/__init__.py
 """
 Timer service imports and aggregation for Derby Director
+
+The hardware and replay drivers are only imported when first accessed (the
+factory imports them the same way), so starting the API does not pay for
+timer support it may never use.
 """
 
+import importlib
+from typing import Any
+
 from .base import TimerInterface, TimerService
 from .factory import TimerFactory
-from .smartline import SmartLineTimer
-from .fasttrack import FastTrackTimer
+from .capture import CaptureWriter, read_capture
+
+# Drivers loaded on first use: name -> submodule
+_LAZY_DRIVERS = {
+    'SmartLineTimer': '.smartline',
+    'FastTrackTimer': '.fasttrack',
+    'SmartLineReplayTimer': '.replay',
+    'FastTrackReplayTimer': '.replay',
+    'VirtualTimer': '.virtual',
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_DRIVERS:
+        module = importlib.import_module(_LAZY_DRIVERS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # List of all timer divisions for easy import
 __all__ = [
@@ -15,4 +38,9 @@ __all__ = [
     'TimerFactory',
     'SmartLineTimer',
     'FastTrackTimer',
-]
\ No newline at end of file
+    'CaptureWriter',
+    'read_capture',
+    'SmartLineReplayTimer',
+    'FastTrackReplayTimer',
+    'VirtualTimer',
+]
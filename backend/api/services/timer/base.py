@@ -3,12 +3,18 @@
 Base timer interface for Derby Director
 """
 
+import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Connection supervision defaults (seconds)
+HEALTH_CHECK_INTERVAL = 2.0
+RECONNECT_INITIAL_DELAY = 0.5
+RECONNECT_MAX_DELAY = 30.0
+
 
 class TimerInterface(ABC):
     """Abstract base class for timer hardware interfaces"""
@@ -48,14 +54,33 @@ class TimerInterface(ABC):
     def is_connected(self) -> bool:
         """Check if the timer is connected"""
         pass
+    
+    async def probe(self) -> bool:
+        """Health check used by connection supervision; must not disturb the timer"""
+        return self.is_connected
+    
+    async def reconnect(self) -> bool:
+        """Re-open the same connection after a link failure"""
+        await self.disconnect()
+        return await self.connect()
 
 
 class TimerService:
     """Service for managing timer interfaces and handling race events"""
     
-    def __init__(self):
+    def __init__(self, health_check_interval: float = HEALTH_CHECK_INTERVAL,
+                 reconnect_initial_delay: float = RECONNECT_INITIAL_DELAY,
+                 reconnect_max_delay: float = RECONNECT_MAX_DELAY,
+                 results_delay: float = 1.0):
         self.active_timer: Optional[TimerInterface] = None
         self.result_callbacks: List[Callable[[List[Dict[str, Any]]], None]] = []
+        self.health_check_interval = health_check_interval
+        self.reconnect_initial_delay = reconnect_initial_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.results_delay = results_delay
+        self.reconnects = 0
+        self._supervisor: Optional[asyncio.Task] = None
+        self._last_delivered: Optional[Tuple] = None
     
     def register_callback(self, callback: Callable[[List[Dict[str, Any]]], None]) -> None:
         """Register a callback to be called when results are received"""
@@ -76,11 +101,15 @@ class TimerService:
         success = await timer.connect()
         if success:
             self.active_timer = timer
+            self._supervisor = asyncio.create_task(self._supervise(timer))
             return True
         return False
     
     async def close_timer(self) -> None:
         """Close the active timer connection"""
+        if self._supervisor:
+            self._supervisor.cancel()
+            self._supervisor = None
         if self.active_timer:
             await self.active_timer.disconnect()
             self.active_timer = None
@@ -112,16 +141,73 @@ class TimerService:
             
         # Wait for completion and get results - this would be more sophisticated
         # in a real implementation with proper completion detection
-        import asyncio
-        await asyncio.sleep(1)  # Small delay to ensure timer has results
+        await asyncio.sleep(self.results_delay)  # Small delay to ensure timer has results
         
         results = await self.active_timer.get_results()
-        
-        # Call registered callbacks with results
+        self._deliver_results(results)
+        return results
+    
+    def _deliver_results(self, results: List[Dict[str, Any]]) -> None:
+        """Call registered callbacks with results"""
+        self._last_delivered = self._fingerprint(results)
         for callback in self.result_callbacks:
             try:
                 callback(results)
             except Exception as e:
                 logger.error(f"Error in result callback: {str(e)}")
-                
+    
+    @staticmethod
+    def _fingerprint(results: List[Dict[str, Any]]) -> Tuple:
+        return tuple(sorted((r.get("lane"), r.get("time")) for r in results))
+    
+    async def _supervise(self, timer: TimerInterface) -> None:
+        """Probe the timer periodically and reconnect it when the link drops"""
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            
+            try:
+                healthy = await timer.probe()
+            except Exception as e:
+                logger.error(f"Timer health check failed: {str(e)}")
+                healthy = False
+            if healthy:
+                continue
+            
+            logger.warning("Timer connection lost, reconnecting")
+            await self._reconnect(timer)
+            await self.recover_results()
+    
+    async def _reconnect(self, timer: TimerInterface) -> None:
+        """Re-open the same port with exponential backoff until it succeeds"""
+        delay = self.reconnect_initial_delay
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                if await timer.reconnect():
+                    self.reconnects += 1
+                    logger.info(f"Timer reconnected after {attempt} attempt(s)")
+                    return
+            except Exception as e:
+                logger.error(f"Timer reconnect attempt {attempt} failed: {str(e)}")
+            
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.reconnect_max_delay)
+    
+    async def recover_results(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch results the timer completed while the link was down.
+        
+        Results are pushed through the registered callbacks like any other
+        heat, unless they match the last results already delivered.
+        """
+        if not self.active_timer:
+            return None
+        
+        results = await self.active_timer.get_results()
+        if not results or self._fingerprint(results) == self._last_delivered:
+            return None
+        
+        logger.info(f"Recovered {len(results)} lane results after reconnect")
+        self._deliver_results(results)
         return results
\ No newline at end of file
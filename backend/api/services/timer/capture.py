@@ -0,0 +1,173 @@
+# backend/api/services/timer/capture.py
+"""
+Raw timer wire capture for Derby Director
+
+Serial timer drivers can tee every byte they read and write into a capture
+file so race-day problems can be reproduced afterwards with the replay driver.
+
+File layout: the MAGIC header, then one record per chunk:
+1-byte direction (0 = received from timer, 1 = sent to timer),
+8-byte big-endian nanoseconds since capture start (monotonic clock),
+2-byte big-endian length, then the raw bytes.
+"""
+
+import logging
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"DDCAP\x01"
+
+RX = 0  # Timer -> Derby Director
+TX = 1  # Derby Director -> timer
+
+_RECORD = struct.Struct(">BQH")
+_MAX_CHUNK = 0xFFFF
+
+
+class CaptureEvent(NamedTuple):
+    """One captured chunk of wire traffic"""
+    elapsed: float  # Seconds since capture start
+    direction: int
+    data: bytes
+
+
+class CaptureWriter:
+    """Appends timestamped wire traffic to a capture file"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: Optional[BinaryIO] = open(self.path, "wb")
+        self._file.write(MAGIC)
+        self._start = time.monotonic_ns()
+
+    def record(self, direction: int, data: bytes) -> None:
+        """Record a chunk of traffic in one direction"""
+        if self._file is None or not data:
+            return
+
+        elapsed = time.monotonic_ns() - self._start
+        for offset in range(0, len(data), _MAX_CHUNK):
+            chunk = data[offset:offset + _MAX_CHUNK]
+            self._file.write(_RECORD.pack(direction, elapsed, len(chunk)))
+            self._file.write(chunk)
+        # Flush per chunk so a crash keeps everything up to the failure
+        self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close the capture file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def open_capture(capture_dir: Optional[str], timer_name: str) -> Optional[CaptureWriter]:
+    """
+    Start a new capture file for a timer connection.
+
+    Each connection gets its own timestamped file so reconnects never
+    overwrite earlier traffic.
+    """
+    if not capture_dir:
+        return None
+
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    path = Path(capture_dir) / f"{timer_name}-{stamp}.ddcap"
+    try:
+        writer = CaptureWriter(path)
+    except OSError as e:
+        # Capturing is diagnostic only; never block the timer connection on it
+        logger.error(f"Failed to open timer capture file {path}: {str(e)}")
+        return None
+
+    logger.info(f"Capturing {timer_name} timer traffic to {path}")
+    return writer
+
+
+def read_capture(path: Path) -> List[CaptureEvent]:
+    """Read every complete record from a capture file"""
+    with open(path, "rb") as handle:
+        data = handle.read()
+
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a timer capture file")
+
+    events = []
+    offset = len(MAGIC)
+    while offset + _RECORD.size <= len(data):
+        direction, elapsed, length = _RECORD.unpack_from(data, offset)
+        start = offset + _RECORD.size
+        if start + length > len(data):
+            break  # Capture was cut off mid-record
+        events.append(CaptureEvent(elapsed / 1e9, direction, data[start:start + length]))
+        offset = start + length
+
+    return events
+
+
+class CapturingReader:
+    """StreamReader wrapper that records everything read"""
+
+    def __init__(self, reader, capture: CaptureWriter):
+        self._reader = reader
+        self._capture = capture
+
+    async def read(self, n: int = -1) -> bytes:
+        data = await self._reader.read(n)
+        self._capture.record(RX, data)
+        return data
+
+    async def readline(self) -> bytes:
+        data = await self._reader.readline()
+        self._capture.record(RX, data)
+        return data
+
+    async def readexactly(self, n: int) -> bytes:
+        data = await self._reader.readexactly(n)
+        self._capture.record(RX, data)
+        return data
+
+    async def readuntil(self, separator: bytes = b"\n") -> bytes:
+        data = await self._reader.readuntil(separator)
+        self._capture.record(RX, data)
+        return data
+
+    def at_eof(self) -> bool:
+        return self._reader.at_eof()
+
+
+class CapturingWriter:
+    """StreamWriter wrapper that records everything written"""
+
+    def __init__(self, writer, capture: CaptureWriter):
+        self._writer = writer
+        self._capture = capture
+
+    def write(self, data: bytes) -> None:
+        self._capture.record(TX, data)
+        self._writer.write(data)
+
+    async def drain(self) -> None:
+        await self._writer.drain()
+
+    def is_closing(self) -> bool:
+        return self._writer.is_closing()
+
+    def close(self) -> None:
+        self._capture.close()
+        self._writer.close()
+
+    async def wait_closed(self) -> None:
+        await self._writer.wait_closed()
+
+
+def wrap_streams(reader, writer, capture: Optional[CaptureWriter]):
+    """Tee a reader/writer pair into a capture file, if one is open"""
+    if capture is None:
+        return reader, writer
+    return CapturingReader(reader, capture), CapturingWriter(writer, capture)
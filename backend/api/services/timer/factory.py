@@ -28,6 +28,7 @@ class TimerFactory:
         if connection_type == "serial":
             port = config.get("port")
             baudrate = int(config.get("baudrate", 9600))
+            capture_dir = config.get("capture_dir") or None
             
             if not port:
                 logger.error("Missing serial port in configuration")
@@ -35,17 +36,44 @@ class TimerFactory:
                 
             if timer_type == "smartline":
                 from .smartline import SmartLineTimer
-                return SmartLineTimer(port, baudrate)
+                return SmartLineTimer(port, baudrate, capture_dir=capture_dir)
                 
             elif timer_type == "fasttrack":
                 from .fasttrack import FastTrackTimer
-                return FastTrackTimer(port, baudrate)
+                return FastTrackTimer(port, baudrate, capture_dir=capture_dir)
                 
             elif timer_type == "newbold":
                 # Placeholder for future implementation
                 logger.error("NewBold timer not yet implemented")
                 return None
                 
+        # Handle replay of a recorded wire capture
+        elif connection_type == "replay":
+            capture_file = config.get("capture_file")
+            speed = float(config.get("speed", 1.0))
+            
+            if not capture_file:
+                logger.error("Missing capture file in configuration")
+                return None
+            
+            if timer_type == "smartline":
+                from .replay import SmartLineReplayTimer
+                return SmartLineReplayTimer(capture_file, speed)
+                
+            elif timer_type == "fasttrack":
+                from .replay import FastTrackReplayTimer
+                return FastTrackReplayTimer(capture_file, speed)
+                
+        # In-process simulated timer
+        elif connection_type == "virtual":
+            from .virtual import VirtualTimer
+            seed = config.get("seed")
+            return VirtualTimer(
+                lanes=int(config.get("lanes", 4)),
+                seed=int(seed) if seed is not None else None,
+                speed=float(config.get("speed", 0.0)),
+            )
+            
         # Handle network connections
         elif connection_type == "network":
             host = config.get("host")
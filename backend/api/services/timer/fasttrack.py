@@ -7,9 +7,9 @@ import asyncio
 import json
 import logging
 from typing import Dict, List, Optional, Any
-import serial_asyncio
 
 from .base import TimerInterface
+from .capture import open_capture, wrap_streams
 
 logger = logging.getLogger(__name__)
 
@@ -17,10 +17,12 @@ logger = logging.getLogger(__name__)
 class FastTrackTimer(TimerInterface):
     """Implementation for FastTrack timer hardware"""
     
-    def __init__(self, port: str, baudrate: int = 9600, timeout: float = 1.0):
+    def __init__(self, port: str, baudrate: int = 9600, timeout: float = 1.0,
+                 capture_dir: Optional[str] = None):
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
+        self.capture_dir = capture_dir
         self._reader = None
         self._writer = None
         self._connected = False
@@ -29,9 +31,9 @@ class FastTrackTimer(TimerInterface):
     async def connect(self) -> bool:
         """Connect to the FastTrack timer via serial port"""
         try:
-            self._reader, self._writer = await serial_asyncio.open_serial_connection(
-                url=self.port,
-                baudrate=self.baudrate
+            reader, writer = await self._open_connection()
+            self._reader, self._writer = wrap_streams(
+                reader, writer, open_capture(self.capture_dir, "fasttrack")
             )
             self._connected = True
             logger.info(f"Connected to FastTrack timer on {self.port}")
@@ -49,6 +51,23 @@ class FastTrackTimer(TimerInterface):
             self._connected = False
             return False
     
+    async def probe(self) -> bool:
+        """Check the serial link and that the timer still answers"""
+        if not self._connected or not self._writer or self._writer.is_closing():
+            return False
+        response = await self._send_command("ID")
+        return bool(response) and "FASTTRACK" in response.upper()
+    
+    async def _open_connection(self):
+        """Open the serial port; returns a (reader, writer) pair"""
+        # pyserial is only needed with real hardware, so it loads on first connect
+        import serial_asyncio
+        
+        return await serial_asyncio.open_serial_connection(
+            url=self.port,
+            baudrate=self.baudrate
+        )
+    
     async def disconnect(self) -> None:
         """Disconnect from the FastTrack timer"""
         if self._writer:
@@ -77,13 +96,19 @@ class FastTrackTimer(TimerInterface):
                     response_future = asyncio.create_task(self._reader.readline())
                     try:
                         response = await asyncio.wait_for(response_future, self.timeout)
+                        if not response and self._reader.at_eof():
+                            logger.error("FastTrack timer closed the connection")
+                            self._connected = False
+                            return None
                         return response.decode().strip()
                     except asyncio.TimeoutError:
                         logger.error(f"Timeout waiting for response to command: {command}")
                         return None
                 return None
             except Exception as e:
+                # Serial errors mean the link is gone; let the supervisor reconnect
                 logger.error(f"Error sending command {command} to FastTrack timer: {str(e)}")
+                self._connected = False
                 return None
     
     async def reset(self) -> bool:
@@ -0,0 +1,152 @@
+# backend/api/services/timer/replay.py
+"""
+Capture replay driver for Derby Director
+
+Feeds a recorded timer capture back to the real protocol drivers in place of
+the serial port, so parsing and result handling can be regression-tested and
+benchmarked against race-day traffic. Received bytes are released with their
+original spacing divided by `speed`; speed 0 replays as fast as possible.
+Commands the driver sends are compared against the capture and any
+divergence is counted and logged.
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+from .capture import RX, TX, CaptureEvent, read_capture
+from .fasttrack import FastTrackTimer
+from .smartline import SmartLineTimer
+
+logger = logging.getLogger(__name__)
+
+# How long to wait for the driver to send a recorded command before moving on
+TX_WAIT_TIMEOUT = 5.0
+
+
+class ReplayWriter:
+    """Stand-in StreamWriter that collects what the driver sends"""
+
+    def __init__(self):
+        self.sent = bytearray()
+        self._closed = False
+        self._changed = asyncio.Event()
+
+    def write(self, data: bytes) -> None:
+        self.sent.extend(data)
+        self._changed.set()
+
+    async def drain(self) -> None:
+        return None
+
+    def is_closing(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        self._closed = True
+        self._changed.set()
+
+    async def wait_closed(self) -> None:
+        return None
+
+    async def wait_for_bytes(self, count: int, timeout: float) -> bool:
+        """Wait until at least `count` bytes have been sent in total"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while len(self.sent) < count and not self._closed:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+        return len(self.sent) >= count
+
+
+class CaptureReplay:
+    """Plays one capture into a StreamReader, paced against the driver's writes"""
+
+    def __init__(self, events: List[CaptureEvent], speed: float = 1.0,
+                 tx_timeout: float = TX_WAIT_TIMEOUT):
+        self.events = events
+        self.speed = speed
+        self.tx_timeout = tx_timeout
+        self.reader = asyncio.StreamReader()
+        self.writer = ReplayWriter()
+        self.mismatches = 0
+        self.done = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    async def _run(self) -> None:
+        expected_tx = bytearray()
+        previous = self.events[0].elapsed if self.events else 0.0
+
+        try:
+            for event in self.events:
+                if event.direction == TX:
+                    # Re-anchor on each command so pacing follows the driver
+                    start = len(expected_tx)
+                    expected_tx.extend(event.data)
+                    if not await self.writer.wait_for_bytes(len(expected_tx), self.tx_timeout):
+                        logger.warning(f"Replay: driver did not send {event.data!r}, continuing")
+                    elif self.writer.sent[start:len(expected_tx)] != event.data:
+                        self.mismatches += 1
+                        logger.warning(
+                            f"Replay: driver sent different bytes than captured {event.data!r}"
+                        )
+                    previous = event.elapsed
+
+                elif event.direction == RX:
+                    if self.speed > 0:
+                        delay = (event.elapsed - previous) / self.speed
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                    previous = event.elapsed
+                    self.reader.feed_data(event.data)
+
+                if self.writer.is_closing():
+                    break
+        finally:
+            self.reader.feed_eof()
+            self.done.set()
+
+
+class ReplayMixin:
+    """Replaces a serial driver's port with a capture replay"""
+
+    def __init__(self, capture_file: str, speed: float = 1.0, **kwargs):
+        super().__init__(port=capture_file, **kwargs)
+        self.capture_file = Path(capture_file)
+        self.speed = speed
+        self.replay: Optional[CaptureReplay] = None
+
+    async def _open_connection(self):
+        events = read_capture(self.capture_file)
+        self.replay = CaptureReplay(events, self.speed)
+        self.replay.start()
+        return self.replay.reader, self.replay.writer
+
+    async def disconnect(self) -> None:
+        if self.replay is not None:
+            self.replay.stop()
+        await super().disconnect()
+
+
+class SmartLineReplayTimer(ReplayMixin, SmartLineTimer):
+    """SmartLine protocol driver fed from a capture file"""
+    pass
+
+
+class FastTrackReplayTimer(ReplayMixin, FastTrackTimer):
+    """FastTrack protocol driver fed from a capture file"""
+    pass
@@ -6,9 +6,9 @@ SmartLine timer implementation for Derby Director
 import asyncio
 import logging
 from typing import Dict, List, Optional, Any
-import serial_asyncio
 
 from .base import TimerInterface
+from .capture import open_capture, wrap_streams
 
 logger = logging.getLogger(__name__)
 
@@ -16,29 +16,32 @@ logger = logging.getLogger(__name__)
 class SmartLineTimer(TimerInterface):
     """Implementation for SmartLine timer hardware"""
     
-    def __init__(self, port: str, baudrate: int = 9600, timeout: float = 1.0):
+    def __init__(self, port: str, baudrate: int = 9600, timeout: float = 1.0,
+                 capture_dir: Optional[str] = None):
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
+        self.capture_dir = capture_dir
         self._reader = None
         self._writer = None
         self._connected = False
         self._lock = asyncio.Lock()
     
-    async def connect(self) -> bool:
+    async def connect(self, reset: bool = True) -> bool:
         """Connect to the SmartLine timer via serial port"""
         try:
-            self._reader, self._writer = await serial_asyncio.open_serial_connection(
-                url=self.port,
-                baudrate=self.baudrate
+            reader, writer = await self._open_connection()
+            self._reader, self._writer = wrap_streams(
+                reader, writer, open_capture(self.capture_dir, "smartline")
             )
             self._connected = True
             logger.info(f"Connected to SmartLine timer on {self.port}")
             
             # Send a reset command to ensure timer is ready
-            reset_success = await self.reset()
-            if not reset_success:
-                logger.warning("Failed to reset timer during connection")
+            if reset:
+                reset_success = await self.reset()
+                if not reset_success:
+                    logger.warning("Failed to reset timer during connection")
                 
             return True
         except Exception as e:
@@ -46,6 +49,27 @@ class SmartLineTimer(TimerInterface):
             self._connected = False
             return False
     
+    async def reconnect(self) -> bool:
+        """Re-open the same port without a reset, so results held by the timer survive"""
+        await self.disconnect()
+        return await self.connect(reset=False)
+    
+    async def probe(self) -> bool:
+        """Check the serial link without sending anything that disturbs the timer"""
+        if not self._connected or not self._writer or self._writer.is_closing():
+            return False
+        return not (self._reader and self._reader.at_eof())
+    
+    async def _open_connection(self):
+        """Open the serial port; returns a (reader, writer) pair"""
+        # pyserial is only needed with real hardware, so it loads on first connect
+        import serial_asyncio
+        
+        return await serial_asyncio.open_serial_connection(
+            url=self.port,
+            baudrate=self.baudrate
+        )
+    
     async def disconnect(self) -> None:
         """Disconnect from the SmartLine timer"""
         if self._writer:
@@ -74,13 +98,19 @@ class SmartLineTimer(TimerInterface):
                     response_future = asyncio.create_task(self._reader.readline())
                     try:
                         response = await asyncio.wait_for(response_future, self.timeout)
+                        if not response and self._reader.at_eof():
+                            logger.error("SmartLine timer closed the connection")
+                            self._connected = False
+                            return None
                         return response.decode().strip()
                     except asyncio.TimeoutError:
                         logger.error(f"Timeout waiting for response to command: {command}")
                         return None
                 return None
             except Exception as e:
+                # Serial errors mean the link is gone; let the supervisor reconnect
                 logger.error(f"Error sending command {command} to SmartLine timer: {str(e)}")
+                self._connected = False
                 return None
     
     async def reset(self) -> bool:
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# backend/benchmark_compression.py
+"""
+Response compression benchmark for Derby Director
+
+Seeds a throwaway SQLite database with a typical large event (3,000 racers by
+default, half the preliminary heats run) and requests the big list endpoints
+in-process with each encoding, reporting per endpoint:
+
+- bytes on the wire, and the ratio to the uncompressed body
+- CPU time per request (process time, so it includes the compression itself)
+
+Round charts carry an ETag, so their compressed bodies come from the
+compression cache after the first request; they are measured with the cache
+enabled and disabled.
+
+Usage:
+    poetry run python -m backend.benchmark_compression --racers 3000 --requests 50
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ENDPOINTS = ("/api/results/", "/api/racers/", "/api/reports/standings", "/api/heats/")
+
+
+def measure(client, url: str, encoding: str, requests: int) -> Dict[str, Any]:
+    """Wire bytes and CPU per request for one endpoint and Accept-Encoding"""
+    headers = {"Accept-Encoding": encoding}
+    response = client.get(url, headers=headers)
+    response.raise_for_status()
+
+    cpu = []
+    for _ in range(requests):
+        started = time.process_time()
+        response = client.get(url, headers=headers)
+        cpu.append(time.process_time() - started)
+
+    return {
+        "encoding": response.headers.get("content-encoding", "identity"),
+        "wire_bytes": int(response.headers["content-length"]),
+        "body_bytes": len(response.content),
+        "cpu_ms": round(statistics.median(cpu) * 1000, 3),
+    }
+
+
+def run(args: argparse.Namespace, workdir: Path) -> Dict[str, Any]:
+    database_url = f"sqlite+aiosqlite:///{workdir / 'compression.db'}"
+    # The app reads its configuration on import
+    os.environ.update({
+        "DATABASE_URL": database_url,
+        "JOURNAL_PATH": str(workdir / "results.journal"),
+        "PROFILE_DIR": str(workdir / "profiles"),
+        "COMPRESSION_ENABLED": "true",
+        # The in-process test client blocks the loop by design; its stall warnings are noise here
+        "LOOP_MONITOR_ENABLED": "false",
+    })
+
+    from litestar.testing import TestClient
+
+    from backend.api.middleware.compression import brotli_available, compressed_bodies
+    from backend.main import create_app
+    from backend.migrations.generate_seed import SeedGenerator, load
+    from backend.migrations.init_db import upgrade_to_head
+
+    upgrade_to_head(database_url)
+    generator = SeedGenerator(args.racers, args.divisions, completed=args.completed, seed=args.seed)
+    asyncio.run(load(database_url, generator, 5000, fast_sqlite=True))
+
+    encodings = ["identity", "gzip"] + (["br"] if brotli_available() else [])
+    results: List[Dict[str, Any]] = []
+
+    app = create_app()
+    if not args.verbose:
+        # Per-request access logging would dominate the run
+        for name in ("", "httpx", "backend"):
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+    with TestClient(app=app) as client:
+        rounds = client.get("/api/rounds/").json()
+        urls = list(ENDPOINTS) + ([f"/api/rounds/{rounds[0]['id']}/chart"] if rounds else [])
+
+        for url in urls:
+            for encoding in encodings:
+                results.append(
+                    {"url": url, "cache": True, **measure(client, url, encoding, args.requests)}
+                )
+
+        if rounds:
+            # The same chart, compressed again on every request
+            max_entries, compressed_bodies.max_entries = compressed_bodies.max_entries, 0
+            compressed_bodies.clear()
+            try:
+                for encoding in encodings[1:]:
+                    results.append({"url": urls[-1], "cache": False,
+                                    **measure(client, urls[-1], encoding, args.requests)})
+            finally:
+                compressed_bodies.max_entries = max_entries
+
+    return {
+        "python": sys.version.split()[0],
+        "racers": args.racers,
+        "requests": args.requests,
+        "brotli": brotli_available(),
+        "results": results,
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a human-readable summary"""
+    brotli = "on" if report["brotli"] else "not installed"
+    print(
+        f"\nPython {report['python']}, {report['racers']} racers, "
+        f"median of {report['requests']} requests (brotli {brotli})"
+    )
+    print(f"\n{'Endpoint':<28}{'Encoding':<14}{'Wire bytes':>12}{'Ratio':>8}{'CPU ms':>9}")
+    for row in report["results"]:
+        label = row["encoding"] + (
+            "" if row["cache"] or row["encoding"] == "identity" else " (no cache)"
+        )
+        ratio = row["wire_bytes"] / row["body_bytes"] if row["body_bytes"] else 1.0
+        print(f"{row['url']:<28}{label:<14}{row['wire_bytes']:>12}{ratio:>8.2f}{row['cpu_ms']:>9.2f}")
+
+
+def main() -> Optional[int]:
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Measure response compression on a large event")
+    parser.add_argument("--racers", type=int, default=3000, help="Total number of racers")
+    parser.add_argument("--divisions", type=int, default=30, help="Number of divisions")
+    parser.add_argument("--completed", type=float, default=0.5,
+                        help="Fraction of preliminary heats that already have results (0-1)")
+    parser.add_argument(
+        "--requests", type=int, default=50, help="Measured requests per endpoint and encoding"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Keep application logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory(prefix="derby-compression-") as tmp:
+        report = run(args, Path(tmp))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return None
+
+
+if __name__ == "__main__":
+    sys.exit(main())
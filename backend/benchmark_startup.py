@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# backend/benchmark_startup.py
+"""
+Cold start benchmark for Derby Director
+
+Measures what a restart after a crash costs on the track laptop or Pi:
+
+- import time of `backend.main`, in a fresh interpreter per run
+- time to first response: from launching uvicorn until GET /api/heats/
+  answers, against a throwaway migrated SQLite database
+- the packages imported by `backend.main` that take longest to load
+  (from `python -X importtime`)
+
+Usage:
+    poetry run python -m backend.benchmark_startup --runs 5
+
+With --json the report is printed as JSON so it can be stored and compared
+between releases; --max-import fails the run when the median import time is
+over budget.
+"""
+
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from backend.migrations.init_db import upgrade_to_head
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must stay out of the startup path; they load on first use
+LAZY_MODULES = ("serial", "serial_asyncio", "reportlab", "PIL")
+
+_IMPORT_SNIPPET = (
+    "import json, sys, time\n"
+    "started = time.perf_counter()\n"
+    "import backend.main\n"
+    "elapsed = time.perf_counter() - started\n"
+    f"loaded = [m for m in {LAZY_MODULES!r} if m in sys.modules]\n"
+    "print(json.dumps({'import_s': elapsed, 'loaded': loaded}))\n"
+)
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def bench_env(workdir: Path, database_url: str) -> Dict[str, str]:
+    """Environment for child processes: quiet, and writing only into workdir"""
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": str(PROJECT_ROOT),
+        "DATABASE_URL": database_url,
+        "JOURNAL_PATH": str(workdir / "results.journal"),
+        "PROFILE_DIR": str(workdir / "profiles"),
+    })
+    return env
+
+
+def measure_import(env: Dict[str, str]) -> Dict[str, Any]:
+    """Import backend.main in a fresh interpreter"""
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SNIPPET],
+        env=env, cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    result = json.loads(output.stdout.strip().splitlines()[-1])
+    result["process_s"] = time.perf_counter() - started
+    return result
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_response(env: Dict[str, str], timeout: float = 60.0) -> float:
+    """Seconds from launching the server until it answers an API request"""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/api/heats/"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app",
+         "--port", str(port), "--log-level", "warning"],
+        env=env, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with code {server.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise RuntimeError(f"No response from {url} within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def import_breakdown(env: Dict[str, str], top: int) -> List[Dict[str, Any]]:
+    """Cumulative import time of backend.main's direct imports, grouped by top-level package"""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.main"],
+        env=env, cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    totals: Dict[str, int] = defaultdict(int)
+    for line in output.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        # One space is backend.main itself, three are the modules it pulled in directly
+        if match and len(match.group(3)) == 3:
+            totals[match.group(4).split(".")[0]] += int(match.group(2))
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [{"package": name, "ms": round(us / 1000, 1)} for name, us in ranked]
+
+
+def run(args: argparse.Namespace, workdir: Path) -> Dict[str, Any]:
+    database_url = f"sqlite+aiosqlite:///{workdir / 'startup.db'}"
+    upgrade_to_head(database_url)
+    env = bench_env(workdir, database_url)
+
+    # The first run warms the OS file cache and .pyc files; it is not counted
+    measure_import(env)
+    imports = [measure_import(env) for _ in range(args.runs)]
+    first_responses = [measure_first_response(env) for _ in range(args.runs)]
+
+    import_times = [run["import_s"] for run in imports]
+    process_times = [run["process_s"] for run in imports]
+    return {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "import_s": {
+            "median": round(statistics.median(import_times), 3),
+            "min": round(min(import_times), 3),
+        },
+        "process_s": {
+            "median": round(statistics.median(process_times), 3),
+            "min": round(min(process_times), 3),
+        },
+        "first_response_s": {
+            "median": round(statistics.median(first_responses), 3),
+            "min": round(min(first_responses), 3),
+        },
+        "eager_optional_modules": imports[-1]["loaded"],
+        "slowest_imports": import_breakdown(env, args.top),
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a human-readable summary"""
+    print(f"\nPython {report['python']}, {report['runs']} runs (median / min)")
+    for key, label in (("import_s", "import backend.main"), ("process_s", "interpreter + import"),
+                       ("first_response_s", "time to first response")):
+        print(f"  {label:<24}{report[key]['median']:>8.3f}s {report[key]['min']:>8.3f}s")
+
+    if report["eager_optional_modules"]:
+        print(
+            f"\nLoaded at startup but should be lazy: {', '.join(report['eager_optional_modules'])}"
+        )
+
+    print(f"\n{'Package':<28}{'import ms':>10}")
+    for entry in report["slowest_imports"]:
+        print(f"{entry['package']:<28}{entry['ms']:>10}")
+
+
+def main() -> Optional[int]:
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Measure Derby Director import and startup time")
+    parser.add_argument("--runs", type=int, default=5, help="Measured runs of each kind")
+    parser.add_argument(
+        "--top", type=int, default=10, help="Packages to list in the import breakdown"
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--max-import", type=float,
+                        help="Exit non-zero if the median import time exceeds this many seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="derby-startup-") as tmp:
+        report = run(args, Path(tmp))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if args.max_import is not None and report["import_s"]["median"] > args.max_import:
+        print(
+            f"Median import time {report['import_s']['median']}s "
+            f"is over the {args.max_import}s budget",
+            file=sys.stderr,
+        )
+        return 1
+    return None
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -32,6 +32,70 @@ CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*").split(",")
 UPLOAD_DIR = BASE_DIR / "uploads"
 UPLOAD_DIR.mkdir(exist_ok=True)
 
+# Racer photos (content-addressed originals and resized variants)
+PHOTO_DIR = Path(os.getenv("PHOTO_DIR", str(UPLOAD_DIR / "photos")))
+PHOTO_MAX_BYTES = int(os.getenv("PHOTO_MAX_BYTES", str(25 * 1024 * 1024)))
+PHOTO_WORKERS = int(os.getenv("PHOTO_WORKERS", "2"))  # processes resizing photos
+
+# Result journal (audit trail and rebuild log)
+JOURNAL_ENABLED = os.getenv("JOURNAL_ENABLED", "true").lower() in ("1", "true", "yes")
+JOURNAL_PATH = Path(os.getenv("JOURNAL_PATH", str(BASE_DIR / "journal" / "results.journal")))
+JOURNAL_FSYNC_INTERVAL = float(os.getenv("JOURNAL_FSYNC_INTERVAL", "0.05"))  # seconds
+
+# Per-request SQL instrumentation (Server-Timing header, /api/debug/queries)
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "true").lower() in ("1", "true", "yes")
+QUERY_DETECT_REPEATS = os.getenv("QUERY_DETECT_REPEATS", "false").lower() in ("1", "true", "yes")
+# Times the same statement shape may run in one request before it is flagged
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "5"))
+
+# On-demand request profiling (X-Profile header, /api/profiling)
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "true").lower() in ("1", "true", "yes")
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", str(BASE_DIR / "profiles")))
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.001"))  # seconds
+
+# PDF reports and award certificates
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "2"))  # processes rendering PDFs
+CERTIFICATE_FONT = os.getenv("CERTIFICATE_FONT", "")  # TrueType font for names; empty uses Times
+CERTIFICATE_LOGO = os.getenv("CERTIFICATE_LOGO", "")  # Image printed on every certificate
+
+# Event loop lag monitor (derby_event_loop_lag_seconds, /api/debug/loop)
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() in ("1", "true", "yes")
+# Seconds between lag probes, and seconds of lag that count as a stall
+LOOP_MONITOR_INTERVAL = float(os.getenv("LOOP_MONITOR_INTERVAL", "0.1"))
+LOOP_LAG_THRESHOLD = float(os.getenv("LOOP_LAG_THRESHOLD", "0.1"))
+
+# Now-racing board (/api/board)
+BOARD_ON_DECK = int(os.getenv("BOARD_ON_DECK", "4"))  # heats listed after the current one
+
+# Published results snapshot: static JSON (+ .gz) and an HTML index, for any static server;
+# unset disables publishing
+PUBLISH_DIR = Path(os.environ["PUBLISH_DIR"]) if os.getenv("PUBLISH_DIR") else None
+
+# Built frontend (frontend/dist) served at the site root; unset leaves it to another server
+FRONTEND_DIR = Path(os.environ["FRONTEND_DIR"]) if os.getenv("FRONTEND_DIR") else None
+
+# Racer itineraries (/api/racers/{id}/itinerary)
+# ETAs average the last few heat cycles (seconds); until a heat has run the default is
+# used, and gaps longer than the maximum are breaks rather than cycles
+ITINERARY_CYCLE_SAMPLES = int(os.getenv("ITINERARY_CYCLE_SAMPLES", "10"))
+ITINERARY_DEFAULT_CYCLE = float(os.getenv("ITINERARY_DEFAULT_CYCLE", "120"))
+ITINERARY_MAX_CYCLE = float(os.getenv("ITINERARY_MAX_CYCLE", "600"))
+
+# Response compression (brotli needs the optional brotli package; gzip always works)
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+# Encodings offered, in order of preference
+COMPRESSION_ENCODINGS = [
+    encoding.strip()
+    for encoding in os.getenv("COMPRESSION_ENCODINGS", "br,gzip").split(",")
+    if encoding.strip()
+]
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # bytes; smaller go as is
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+# Compressed ETagged bodies kept for reuse (0 disables); larger bodies compress in a thread
+COMPRESSION_CACHE_ENTRIES = int(os.getenv("COMPRESSION_CACHE_ENTRIES", "256"))
+COMPRESSION_EXECUTOR_MIN_SIZE = int(os.getenv("COMPRESSION_EXECUTOR_MIN_SIZE", str(64 * 1024)))
+
 # Application settings
 APP_SETTINGS: Dict[str, Any] = {
     "title": "Derby Director API",
@@ -46,4 +110,5 @@ DEFAULT_TIMER_CONFIG: Dict[str, Any] = {
     "port": "",
     "baudrate": 9600,
     "lanes": 4,
+    "capture_dir": os.getenv("TIMER_CAPTURE_DIR", ""),  # Empty disables wire capture
 }
\ No newline at end of file
@@ -6,7 +6,7 @@ Main entry point for Derby Director API
 import os
 from typing import List
 
-from litestar import Litestar, get, Response
+from litestar import Litestar, Router, get, Response
 from litestar.config.cors import CORSConfig
 from litestar.openapi import OpenAPIConfig
 from litestar.openapi.plugins import ScalarRenderPlugin
@@ -14,26 +14,67 @@ from litestar.stores.memory import MemoryStore
 from advanced_alchemy.extensions.litestar import SQLAlchemyPlugin, SQLAlchemyAsyncConfig
 
 from backend.config import (
-    DATABASE_URL, APP_SETTINGS, DEBUG, CORS_ORIGINS
+    DATABASE_URL, APP_SETTINGS, DEBUG, CORS_ORIGINS, QUERY_STATS_ENABLED,
+    PROFILING_ENABLED, FRONTEND_DIR, COMPRESSION_ENABLED
 )
 from backend.api.models import Base
 from backend.api.controllers import (
     AuthController, RacerController, DivisionController,
-    HeatController, ResultController, RoundController
+    HeatController, ResultController, RoundController, DebugController,
+    MetricsController, ProfilingController, PhotoController, ReportsController,
+    BoardController, FrontendController
 )
 from backend.api.middleware.auth import JWTAuthMiddleware
+from backend.api.middleware.query_stats import QueryStatsMiddleware
+from backend.api.middleware.metrics import MetricsMiddleware
+from backend.api.middleware.profiling import ProfilingMiddleware
+from backend.api.middleware.compression import CompressionMiddleware
+from backend.api.services import (
+    load_checkin_index, load_race_analytics, load_race_queue, publish_results,
+    start_loop_monitor, stop_loop_monitor, photo_store, render_pool, result_journal,
+    results_publisher
+)
 
 
 def get_controllers() -> List:
     """Get all controllers for the application"""
-    return [
+    controllers = [
         AuthController,
         RacerController,
         DivisionController,
         HeatController,
         ResultController,
-        RoundController
+        RoundController,
+        MetricsController,
+        PhotoController,
+        ReportsController,
+        BoardController
     ]
+    if PROFILING_ENABLED:
+        controllers.append(ProfilingController)
+    if DEBUG:
+        controllers.append(DebugController)
+    return controllers
+
+
+def get_route_handlers() -> List:
+    """The API under /api, and the built frontend at the root when configured"""
+    route_handlers = [Router(path="/api", route_handlers=get_controllers())]
+    if FRONTEND_DIR is not None:
+        route_handlers.append(FrontendController)
+    return route_handlers
+
+
+def get_middleware() -> List:
+    """Get the middleware stack, outermost first"""
+    middleware = [MetricsMiddleware]
+    if COMPRESSION_ENABLED:
+        middleware.append(CompressionMiddleware)
+    if QUERY_STATS_ENABLED:
+        middleware.append(QueryStatsMiddleware)
+    if PROFILING_ENABLED:
+        middleware.append(ProfilingMiddleware)
+    return middleware
 
 
 def create_app() -> Litestar:
@@ -52,8 +93,8 @@ def create_app() -> Litestar:
     # CORS configuration
     cors_config = CORSConfig(
         allow_origins=CORS_ORIGINS,
-        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        allow_headers=["Authorization", "Content-Type"],
+        allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+        allow_headers=["Authorization", "Content-Type", "X-Profile"],
         allow_credentials=True
     )
     
@@ -67,19 +108,28 @@ def create_app() -> Litestar:
             "including racers, heats, results, and timer interfaces."
         ),
         use_handler_docstrings=True,
+        path="/api/schema",
         render_plugins=[ScalarRenderPlugin()]
     )
     
     # Create the application
     app = Litestar(
-        route_handlers=get_controllers(),
-        path="api",
+        route_handlers=get_route_handlers(),
         plugins=[sqlalchemy_plugin],
         cors_config=cors_config,
         openapi_config=openapi_config,
         #middleware=[JWTAuthMiddleware],
+        middleware=get_middleware(),
         debug=DEBUG,
-        state={"store": MemoryStore()}
+        state={"store": MemoryStore()},
+        on_startup=[
+            load_checkin_index, load_race_analytics, load_race_queue, publish_results,
+            start_loop_monitor,
+        ],
+        on_shutdown=[
+            stop_loop_monitor, results_publisher.flush, photo_store.close, render_pool.close,
+            result_journal.close,
+        ]
     )
     
     return app
@@ -0,0 +1,300 @@
+# backend/migrations/generate_seed.py
+"""
+Generate large, reproducible synthetic events for benchmarking
+
+Usage:
+    poetry run python -m backend.migrations.generate_seed --racers 50000 --divisions 200 \\
+        --completed 0.5 --sqlite /tmp/bench.db
+
+The same --seed always produces the same event. Rows are built in memory with
+pre-assigned IDs and written with executemany batches, so a 50k racer event
+with its preliminary schedule and results loads in seconds. With --sqlite a
+fresh database file is created, migrated and loaded with SQLite journaling
+and syncing turned off; they are restored once the load is complete.
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from backend.api.models import Division, Heat, Racer, RaceResult, RacerHeat, Rank, Round
+from backend.config import DATABASE_URL
+from backend.migrations.init_db import upgrade_to_head
+from backend.migrations.seed_data import DIVISIONS, FIRST_NAMES, LAST_NAMES, RANKS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Rows per executemany batch
+DEFAULT_BATCH_SIZE = 5000
+
+CHECKIN_WEIGHTS = {"registered": 0.1, "checked_in": 0.2, "passed_inspection": 0.7}
+
+
+class SeedGenerator:
+    """Builds the rows of a synthetic event"""
+
+    def __init__(
+        self,
+        racers: int,
+        divisions: int,
+        lanes: int = 4,
+        completed: float = 0.0,
+        seed: int = 42,
+        event_date: Optional[datetime] = None,
+    ):
+        if racers < 1 or divisions < 1:
+            raise ValueError("Need at least one racer and one division")
+        if not 0.0 <= completed <= 1.0:
+            raise ValueError("Completed fraction must be between 0 and 1")
+
+        self.racer_count = racers
+        self.division_count = divisions
+        self.lanes = lanes
+        self.completed = completed
+        self.random = random.Random(seed)
+        self.event_date = event_date or datetime(2024, 1, 20, 9, 0)
+
+    def rows(self, first_ids: Dict[str, int], taken_names: Iterable[str] = (),
+             rank_ids: Optional[List[int]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Build every row, keyed by table name.
+
+        Args:
+            first_ids: Next free primary key per table, so rows can reference each other
+            taken_names: Division names already in the database
+            rank_ids: Existing ranks to use instead of creating the standard ones
+        """
+        rng = self.random
+        ids = dict(first_ids)
+
+        def next_id(table: str) -> int:
+            ids[table] += 1
+            return ids[table] - 1
+
+        tables: Dict[str, List[Dict[str, Any]]] = {
+            "ranks": [], "divisions": [], "racers": [], "rounds": [],
+            "heats": [], "racer_heats": [], "race_results": [],
+        }
+
+        if not rank_ids:
+            rank_ids = []
+            for rank in RANKS:
+                rank_ids.append(next_id("ranks"))
+                tables["ranks"].append({"id": rank_ids[-1], **rank})
+
+        # Spread racers evenly across divisions
+        base, extra = divmod(self.racer_count, self.division_count)
+        carno = first_ids["racers"]
+        lane_bias = [rng.gauss(0, 0.02) for _ in range(self.lanes)]
+
+        names = self._division_names(set(taken_names))
+
+        for d in range(self.division_count):
+            name = next(names)
+            division_id = next_id("divisions")
+            tables["divisions"].append({"id": division_id, "name": name, "sort_order": d + 1})
+            rank_id = rank_ids[d % len(rank_ids)]
+
+            racers = []
+            for _ in range(base + (1 if d < extra else 0)):
+                racer_id = next_id("racers")
+                created = self.event_date - timedelta(days=rng.randint(1, 60))
+                racers.append((racer_id, rng.gauss(3.2, 0.15)))
+                tables["racers"].append({
+                    "id": racer_id,
+                    "firstname": rng.choice(FIRST_NAMES),
+                    "lastname": rng.choice(LAST_NAMES),
+                    "divisionid": division_id,
+                    "rankid": rank_id,
+                    "carno": str(carno),
+                    "carname": f"Car {carno}" if rng.random() < 0.6 else None,
+                    "barcode": f"DD{racer_id:07d}",
+                    "exclude": rng.random() < 0.01,
+                    "checkin_status": rng.choices(
+                        list(CHECKIN_WEIGHTS), weights=list(CHECKIN_WEIGHTS.values())
+                    )[0],
+                    "created_at": created,
+                    "updated_at": created,
+                })
+                carno += 1
+
+            if racers:
+                self._add_preliminary(tables, next_id, division_id, name, racers, lane_bias)
+
+        return tables
+
+    @staticmethod
+    def _division_names(taken: Set[str]) -> Iterator[str]:
+        """Lions, Tigers, ..., Lions 2, Tigers 2, ... skipping names already in use"""
+        cycle = 0
+        while True:
+            for template in DIVISIONS:
+                name = template["name"] if cycle == 0 else f"{template['name']} {cycle + 1}"
+                if name not in taken:
+                    yield name
+            cycle += 1
+
+    def _add_preliminary(self, tables, next_id, division_id, name, racers, lane_bias) -> None:
+        """Schedule a preliminary round where every racer runs once in each lane"""
+        rng = self.random
+        round_id = next_id("rounds")
+        tables["rounds"].append({
+            "id": round_id, "name": f"{name} Preliminary", "divisionid": division_id,
+            "roundno": 1, "phase": "preliminary", "charttype": "roster",
+        })
+
+        count = len(racers)
+        lanes = min(self.lanes, count)
+        heat_count = count if count > self.lanes else 1
+        spacing = max(1, count // lanes)
+        completed_heats = round(heat_count * self.completed)
+
+        for h in range(heat_count):
+            heat_id = next_id("heats")
+            done = h < completed_heats
+            completed_time = (
+                self.event_date + timedelta(seconds=45 * len(tables["heats"])) if done else None
+            )
+            tables["heats"].append({
+                "id": heat_id, "roundid": round_id, "heat": h + 1,
+                "status": "completed" if done else "scheduled",
+                "completed_time": completed_time, "version": 1 if done else 0,
+            })
+
+            lane_times = []
+            for lane in range(lanes):
+                racer_id, base_time = racers[(h + lane * spacing) % count]
+                tables["racer_heats"].append({
+                    "id": next_id("racer_heats"), "heat_id": heat_id, "lane": lane + 1,
+                    "racer_id": racer_id,
+                })
+                if done:
+                    lane_times.append(
+                        (base_time + lane_bias[lane] + rng.gauss(0, 0.015), lane + 1, racer_id)
+                    )
+
+            for place, (finish, lane, racer_id) in enumerate(sorted(lane_times), 1):
+                tables["race_results"].append({
+                    "id": next_id("race_results"), "heat_id": heat_id, "racer_id": racer_id,
+                    "lane": lane, "time": round(finish, 4), "place": place, "completed": True,
+                })
+
+
+TABLES = {
+    "ranks": Rank, "divisions": Division, "racers": Racer, "rounds": Round,
+    "heats": Heat, "racer_heats": RacerHeat, "race_results": RaceResult,
+}
+
+
+def batched(rows: List[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+async def next_ids(conn: AsyncConnection) -> Dict[str, int]:
+    """Next free primary key for every table, so generated rows never collide"""
+    ids = {}
+    for table, model in TABLES.items():
+        ids[table] = ((await conn.execute(select(func.max(model.id)))).scalar() or 0) + 1
+    return ids
+
+
+async def load(database_url: str, generator: SeedGenerator, batch_size: int,
+               fast_sqlite: bool = False) -> Dict[str, int]:
+    """Generate the event and bulk insert it in one transaction"""
+    engine = create_async_engine(database_url)
+    counts = {}
+
+    try:
+        async with engine.connect() as conn:
+            if fast_sqlite:
+                # Safe only for a throwaway file: a crash mid-load leaves it unusable
+                await conn.execute(text("PRAGMA journal_mode = OFF"))
+                await conn.execute(text("PRAGMA synchronous = OFF"))
+                await conn.execute(text("PRAGMA cache_size = -200000"))
+                await conn.commit()
+
+            ids = await next_ids(conn)
+            taken = set((await conn.execute(select(Division.name))).scalars())
+            rank_ids = list(
+                (await conn.execute(select(Rank.id).order_by(Rank.sort_order))).scalars()
+            )
+
+            started = time.perf_counter()
+            tables = generator.rows(ids, taken, rank_ids)
+            logger.info(f"Generated rows in {time.perf_counter() - started:.2f}s")
+
+            started = time.perf_counter()
+            # Everything goes in the transaction opened by the ID lookups above
+            for table, model in TABLES.items():
+                for batch in batched(tables[table], batch_size):
+                    await conn.execute(insert(model.__table__), batch)
+                counts[table] = len(tables[table])
+            await conn.commit()
+            logger.info(
+                f"Inserted {sum(counts.values())} rows in {time.perf_counter() - started:.2f}s"
+            )
+
+            if fast_sqlite:
+                await conn.execute(text("PRAGMA journal_mode = DELETE"))
+                await conn.execute(text("PRAGMA synchronous = FULL"))
+                await conn.execute(text("ANALYZE"))
+                await conn.commit()
+    finally:
+        await engine.dispose()
+
+    return counts
+
+
+def main() -> None:
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Generate a synthetic event for benchmarking")
+    parser.add_argument("--racers", type=int, default=1000, help="Total number of racers")
+    parser.add_argument("--divisions", type=int, default=10, help="Number of divisions")
+    parser.add_argument("--lanes", type=int, default=4, help="Lanes on the track")
+    parser.add_argument("--completed", type=float, default=0.0,
+                        help="Fraction of preliminary heats that already have results (0-1)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument(
+        "--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per insert batch"
+    )
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--sqlite", type=Path, help="Create a fresh SQLite database file")
+    target.add_argument("--database", help="Load into an existing, migrated database")
+    parser.add_argument(
+        "--force", action="store_true", help="Overwrite the --sqlite file if it exists"
+    )
+    args = parser.parse_args()
+
+    generator = SeedGenerator(args.racers, args.divisions, args.lanes, args.completed, args.seed)
+    started = time.perf_counter()
+
+    if args.sqlite:
+        if args.sqlite.exists():
+            if not args.force:
+                parser.error(f"{args.sqlite} already exists (use --force to overwrite)")
+            args.sqlite.unlink()
+        database_url = f"sqlite+aiosqlite:///{args.sqlite.resolve()}"
+        upgrade_to_head(database_url)
+    else:
+        database_url = args.database or DATABASE_URL
+
+    counts = asyncio.run(
+        load(database_url, generator, args.batch_size, fast_sqlite=bool(args.sqlite))
+    )
+
+    summary = ", ".join(f"{count} {table}" for table, count in counts.items())
+    logger.info(f"Seeded {summary} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
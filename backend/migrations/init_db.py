@@ -12,6 +12,18 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def upgrade_to_head(database_url: str) -> None:
+    """Apply all migrations to a specific database (used by tooling outside the app)"""
+    from alembic.config import Config
+    from alembic import command
+    import backend.config
+    
+    backend.config.DATABASE_URL = database_url
+    alembic_cfg = Config()
+    alembic_cfg.set_main_option("script_location", os.path.dirname(os.path.abspath(__file__)))
+    command.upgrade(alembic_cfg, "head")
+
+
 async def run_alembic_migrations():
     """Run Alembic migrations to create the schema"""
     try:
@@ -0,0 +1,286 @@
+# backend/migrations/replay_journal.py
+"""
+Rebuild race results and heat status from the result journal
+
+Usage:
+    poetry run python -m backend.migrations.replay_journal [--journal PATH] [--dry-run]
+
+The journal is folded into its final state in memory first, then applied to
+the database in a single transaction: race_results for every journaled heat
+are replaced, heat status/completed_time/version are restored, heats or
+lane assignments from schedule records are recreated if they are missing, and
+heats that were deleted are removed again. Standings are recomputed from the
+rebuilt results at the end.
+
+Journal records are written after each database commit, so a change committed
+just before a crash may be missing from the journal; the journal rebuilds what
+it recorded, it does not replace a database backup.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.api.models import Heat, RaceResult, RacerHeat, Round
+from backend.api.services.journal import iter_journal
+from backend.config import DATABASE_URL, JOURNAL_PATH
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class JournalState:
+    """Final state of every heat mentioned in a journal"""
+
+    def __init__(self):
+        # heat_id -> lane -> {racer_id, time, place, completed}
+        self.results: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        # heat_id -> {status, completed_time, version}
+        self.heats: Dict[int, Dict[str, Any]] = {}
+        # heat_id -> {round_id, heat, lanes}
+        self.schedule: Dict[int, Dict[str, Any]] = {}
+        # Heats deleted and not scheduled again since
+        self.deleted: Set[int] = set()
+        self.record_count = 0
+
+    def _heat(self, heat_id: int) -> Dict[str, Any]:
+        return self.heats.setdefault(
+            heat_id, {"status": None, "completed_time": None, "version": 0}
+        )
+
+    def _schedule(self, heat_id: int, round_id: int, heat: int, lanes: List[List[int]]) -> None:
+        self.schedule[heat_id] = {"round_id": round_id, "heat": heat, "lanes": lanes}
+        self.deleted.discard(heat_id)
+
+    def apply(self, record: Dict[str, Any]) -> None:
+        """Fold one journal record into the state"""
+        self.record_count += 1
+        record_type = record.get("type")
+        ts = datetime.utcfromtimestamp(record["ts"]) if "ts" in record else None
+
+        if record_type == "results":
+            for entry in record["heats"]:
+                heat_id = entry["heat_id"]
+                self.results[heat_id] = {
+                    lane: {"racer_id": racer_id, "time": time_, "place": place, "completed": True}
+                    for lane, racer_id, time_, place in entry["results"]
+                }
+                heat = self._heat(heat_id)
+                heat.update(status="completed", completed_time=ts)
+                heat["version"] += 1
+
+        elif record_type == "lane":
+            lanes = self.results.get(record["heat_id"], {})
+            if record["lane"] in lanes:
+                lanes[record["lane"]].update(record["changes"])
+            heat = self._heat(record["heat_id"])
+            heat["version"] += 1
+
+        elif record_type == "clear":
+            self.results[record["heat_id"]] = {}
+            heat = self._heat(record["heat_id"])
+            heat.update(status="scheduled", completed_time=None)
+            heat["version"] += 1
+
+        elif record_type == "heat_update":
+            # Status and lanes changed in one request bump the version once, as update_heat does
+            heat_id = record["heat_id"]
+            heat = self._heat(heat_id)
+            if record["status"] is not None:
+                heat["status"] = record["status"]
+                if record["status"] == "completed" and heat["completed_time"] is None:
+                    heat["completed_time"] = ts
+            if record["lanes"] is not None:
+                self._schedule(heat_id, record["round_id"], record["heat"], record["lanes"])
+            heat["version"] += 1
+
+        elif record_type == "schedule":
+            # Newly created heats; they start at version 0
+            for entry in record["heats"]:
+                self._schedule(entry["heat_id"], record["round_id"], entry["heat"], entry["lanes"])
+
+        elif record_type == "delete_heat":
+            heat_id = record["heat_id"]
+            self.schedule.pop(heat_id, None)
+            self.results.pop(heat_id, None)
+            self.heats.pop(heat_id, None)
+            self.deleted.add(heat_id)
+
+        else:
+            logger.warning(f"Skipping unknown journal record type {record_type!r}")
+
+
+def load_journal(path: Path) -> JournalState:
+    """Fold an entire journal file into its final state"""
+    state = JournalState()
+    for record in iter_journal(path):
+        state.apply(record)
+    return state
+
+
+async def apply_state(session: AsyncSession, state: JournalState) -> Dict[str, int]:
+    """Write the folded journal state to the database in one transaction"""
+    stats = {"heats_created": 0, "lanes_assigned": 0, "heats_updated": 0, "heats_deleted": 0,
+             "results": 0}
+
+    # Remove heats that were deleted after they were scheduled
+    if state.deleted:
+        deleted_ids = list(state.deleted)
+        await session.execute(delete(RaceResult).where(RaceResult.heat_id.in_(deleted_ids)))
+        await session.execute(delete(RacerHeat).where(RacerHeat.heat_id.in_(deleted_ids)))
+        removed = await session.execute(delete(Heat).where(Heat.id.in_(deleted_ids)))
+        stats["heats_deleted"] = removed.rowcount
+
+    # Recreate scheduled heats and lane assignments that are missing
+    if state.schedule:
+        existing_heats = set((await session.execute(
+            select(Heat.id).where(Heat.id.in_(list(state.schedule)))
+        )).scalars())
+        existing_rounds = set((await session.execute(select(Round.id))).scalars())
+
+        new_heats = []
+        for heat_id, entry in state.schedule.items():
+            if heat_id in existing_heats:
+                continue
+            if entry["round_id"] not in existing_rounds:
+                logger.warning(
+                    f"Cannot recreate heat {heat_id}: round {entry['round_id']} is missing"
+                )
+                continue
+            new_heats.append({
+                "id": heat_id, "roundid": entry["round_id"], "heat": entry["heat"],
+                "status": "scheduled", "version": 0,
+            })
+        if new_heats:
+            await session.execute(insert(Heat), new_heats)
+            stats["heats_created"] = len(new_heats)
+
+        scheduled_ids = [h for h in state.schedule if h in existing_heats] + [
+            h["id"] for h in new_heats
+        ]
+        if scheduled_ids:
+            await session.execute(delete(RacerHeat).where(RacerHeat.heat_id.in_(scheduled_ids)))
+            lanes = [
+                {"heat_id": heat_id, "lane": lane, "racer_id": racer_id}
+                for heat_id in scheduled_ids
+                for lane, racer_id in state.schedule[heat_id]["lanes"]
+            ]
+            if lanes:
+                await session.execute(insert(RacerHeat), lanes)
+            stats["lanes_assigned"] = len(lanes)
+
+    # Replace results for every heat whose results were journaled
+    result_heat_ids = list(state.results)
+    if result_heat_ids:
+        await session.execute(delete(RaceResult).where(RaceResult.heat_id.in_(result_heat_ids)))
+        rows = [
+            {"heat_id": heat_id, "lane": lane, **values}
+            for heat_id, lanes in state.results.items()
+            for lane, values in lanes.items()
+        ]
+        if rows:
+            await session.execute(insert(RaceResult), rows)
+        stats["results"] = len(rows)
+
+    # Restore heat status, completion time and version
+    heat_rows = [
+        {
+            "b_id": heat_id,
+            "b_status": heat["status"],
+            "b_completed_time": heat["completed_time"],
+            "b_version": heat["version"],
+        }
+        for heat_id, heat in state.heats.items()
+        if heat["status"] is not None
+    ]
+    if heat_rows:
+        await session.execute(
+            update(Heat.__table__)
+            .where(Heat.__table__.c.id == bindparam("b_id"))
+            .values(
+                status=bindparam("b_status"),
+                completed_time=bindparam("b_completed_time"),
+                version=bindparam("b_version"),
+            ),
+            heat_rows,
+        )
+
+    # Heats whose lanes changed but whose status was never journaled keep their status
+    version_rows = [
+        {"b_id": heat_id, "b_version": heat["version"]}
+        for heat_id, heat in state.heats.items()
+        if heat["status"] is None and heat["version"]
+    ]
+    if version_rows:
+        await session.execute(
+            update(Heat.__table__)
+            .where(Heat.__table__.c.id == bindparam("b_id"))
+            .values(version=bindparam("b_version")),
+            version_rows,
+        )
+    stats["heats_updated"] = len(heat_rows) + len(version_rows)
+
+    return stats
+
+
+async def replay(
+    journal_path: Path, database_url: str, dry_run: bool = False
+) -> Optional[Dict[str, int]]:
+    """Replay a journal file into a database"""
+    started = time.perf_counter()
+
+    if not journal_path.exists():
+        logger.error(f"Journal {journal_path} does not exist")
+        return None
+
+    state = load_journal(journal_path)
+    logger.info(
+        f"Read {state.record_count} journal records covering {len(state.heats)} heats "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+
+    engine = create_async_engine(database_url)
+    async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+    try:
+        async with async_session() as session:
+            stats = await apply_state(session, state)
+
+            if dry_run:
+                await session.rollback()
+                logger.info(f"Dry run, no changes saved: {stats}")
+                return stats
+
+            await session.commit()
+
+            # Derived standings are computed from the rebuilt results
+            from backend.api.services.race_scheduler import RaceScheduler
+            standings = await RaceScheduler(session).get_race_standings()
+            logger.info(f"Standings recomputed for {len(standings)} racers")
+    finally:
+        await engine.dispose()
+
+    logger.info(f"Replay complete in {time.perf_counter() - started:.2f}s: {stats}")
+    return stats
+
+
+def main() -> None:
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Rebuild results from the result journal")
+    parser.add_argument("--journal", type=Path, default=JOURNAL_PATH, help="Journal file to replay")
+    parser.add_argument("--database", default=DATABASE_URL, help="Database URL to rebuild")
+    parser.add_argument("--dry-run", action="store_true", help="Apply and roll back")
+    args = parser.parse_args()
+
+    asyncio.run(replay(args.journal, args.database, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# backend/migrations/versions/002_racer_search_fts.py
+"""Racer full-text search index
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Columns indexed by the racers_fts table, in index order
+FTS_COLUMNS = "firstname, lastname, carno, carname"
+
+
+def upgrade() -> None:
+    # FTS5 is SQLite-only; other backends use the LIKE fallback in racer_search
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    # External-content table: the index stores tokens only, rows live in racers.
+    # Prefix indexes keep "type-ahead" queries of 1-3 characters cheap.
+    op.execute(f"""
+        CREATE VIRTUAL TABLE racers_fts USING fts5(
+            {FTS_COLUMNS},
+            content='racers',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='1 2 3'
+        )
+    """)
+
+    # Triggers keep the index in sync with the racers table
+    op.execute(f"""
+        CREATE TRIGGER racers_fts_ai AFTER INSERT ON racers BEGIN
+            INSERT INTO racers_fts(rowid, {FTS_COLUMNS})
+            VALUES (new.id, new.firstname, new.lastname, new.carno, new.carname);
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER racers_fts_ad AFTER DELETE ON racers BEGIN
+            INSERT INTO racers_fts(racers_fts, rowid, {FTS_COLUMNS})
+            VALUES ('delete', old.id, old.firstname, old.lastname, old.carno, old.carname);
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER racers_fts_au AFTER UPDATE OF {FTS_COLUMNS} ON racers BEGIN
+            INSERT INTO racers_fts(racers_fts, rowid, {FTS_COLUMNS})
+            VALUES ('delete', old.id, old.firstname, old.lastname, old.carno, old.carname);
+            INSERT INTO racers_fts(rowid, {FTS_COLUMNS})
+            VALUES (new.id, new.firstname, new.lastname, new.carno, new.carname);
+        END
+    """)
+
+    # Index racers that already exist
+    op.execute("INSERT INTO racers_fts(racers_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS racers_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS racers_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS racers_fts_ai")
+    op.execute("DROP TABLE IF EXISTS racers_fts")
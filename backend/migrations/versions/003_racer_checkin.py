@@ -0,0 +1,35 @@
+# backend/migrations/versions/003_racer_checkin.py
+"""Racer barcode and check-in status
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('racers', sa.Column('barcode', sa.String(length=50), nullable=True))
+    op.add_column('racers', sa.Column(
+        'checkin_status', sa.String(length=20), nullable=False, server_default='registered'
+    ))
+    op.create_index('ix_racers_carno', 'racers', ['carno'])
+    op.create_index('ix_racers_barcode', 'racers', ['barcode'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_racers_barcode', table_name='racers')
+    op.drop_index('ix_racers_carno', table_name='racers')
+    with op.batch_alter_table('racers') as batch_op:
+        batch_op.drop_column('checkin_status')
+        batch_op.drop_column('barcode')
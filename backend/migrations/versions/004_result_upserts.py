@@ -0,0 +1,43 @@
+# backend/migrations/versions/004_result_upserts.py
+"""Unique heat/lane results and heat versions
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('heats', sa.Column(
+        'version', sa.Integer(), nullable=False, server_default='0'
+    ))
+
+    # Keep only the newest result per heat lane before adding the constraint
+    op.execute("""
+        DELETE FROM race_results
+        WHERE id NOT IN (
+            SELECT keep_id FROM (
+                SELECT MAX(id) AS keep_id FROM race_results GROUP BY heat_id, lane
+            ) AS newest
+        )
+    """)
+    op.create_index(
+        'uq_race_results_heat_lane', 'race_results', ['heat_id', 'lane'], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_race_results_heat_lane', table_name='race_results')
+    with op.batch_alter_table('heats') as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,437 @@
+#!/usr/bin/env python
+# backend/simulate_event.py
+"""
+Full-event simulator and throughput benchmark for Derby Director
+
+Runs a whole race day in-process against the real application: seeds N
+divisions of M racers, generates preliminary heats, runs every heat on a
+virtual timer, records the results through the API, advances to finals and
+the championship, while K display clients poll the board endpoints.
+
+Usage:
+    poetry run python -m backend.simulate_event --divisions 6 --racers 40 --displays 4
+
+Reports heats/hour, p50/p99 API latency per endpoint, database time per
+phase and peak memory. Runs against a throwaway SQLite database unless
+--database is given.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import event, insert
+from sqlalchemy.engine import Engine
+
+from backend.migrations.init_db import upgrade_to_head
+
+logger = logging.getLogger("simulate_event")
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Riley", "Casey", "Morgan", "Jamie", "Avery",
+               "Quinn"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Patel", "Nguyen", "Johnson", "Okafor", "Kowalski",
+              "Silva", "Brown"]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class QueryTimer:
+    """Accumulates SQL statement count and time into the current phase"""
+
+    def __init__(self):
+        self.phase = "setup"
+        self.time: Dict[str, float] = {}
+        self.statements: Dict[str, int] = {}
+
+    def install(self) -> None:
+        event.listen(Engine, "before_cursor_execute", self._before)
+        event.listen(Engine, "after_cursor_execute", self._after)
+
+    def uninstall(self) -> None:
+        event.remove(Engine, "before_cursor_execute", self._before)
+        event.remove(Engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        self.time[self.phase] = self.time.get(self.phase, 0.0) + elapsed
+        self.statements[self.phase] = self.statements.get(self.phase, 0) + 1
+
+
+class EventSimulator:
+    """Drives a complete event through the API with a virtual timer"""
+
+    def __init__(
+        self,
+        client,
+        divisions: int = 4,
+        racers: int = 30,
+        displays: int = 3,
+        lanes: int = 4,
+        poll_interval: float = 0.5,
+        finalists: int = 4,
+        seed: int = 1,
+    ):
+        self.client = client
+        self.division_count = divisions
+        self.racers_per_division = racers
+        self.display_count = displays
+        self.lanes = lanes
+        self.poll_interval = poll_interval
+        self.finalists = finalists
+        self.seed = seed
+
+        self.queries = QueryTimer()
+        self.latency: Dict[str, List[float]] = {}
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.heats_run = 0
+        self.current_heat: Optional[int] = None
+        self.last_completed: Optional[int] = None
+        self.timer_service = None
+
+    # -- Instrumentation ---------------------------------------------------
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Attribute wall time, DB time and heats to a phase"""
+        self.queries.phase = name
+        heats_before = self.heats_run
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = {
+                "wall_s": time.perf_counter() - started,
+                "heats": self.heats_run - heats_before,
+            }
+            self.queries.phase = "idle"
+
+    async def request(self, name: str, method: str, url: str, **kwargs) -> Any:
+        """Make an API call and record its latency under `name`"""
+        started = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        self.latency.setdefault(name, []).append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            raise RuntimeError(
+                f"{method} {url} failed with {response.status_code}: {response.text}"
+            )
+        return response.json() if response.content else None
+
+    # -- Event phases ------------------------------------------------------
+
+    async def seed_racers(self, session) -> List[int]:
+        """Create the divisions and racers"""
+        from backend.api.models import Division, Racer
+
+        rng = random.Random(self.seed)
+        now = datetime.utcnow()
+
+        division_ids = []
+        for n in range(self.division_count):
+            dvsn = Division(name=f"Division {n + 1}", sort_order=n + 1)
+            session.add(dvsn)
+            await session.flush()
+            division_ids.append(dvsn.id)
+
+        rows = [
+            {
+                "firstname": rng.choice(FIRST_NAMES),
+                "lastname": rng.choice(LAST_NAMES),
+                "divisionid": division_id,
+                "carno": str(100 * (d + 1) + i),
+                "exclude": False,
+                "checkin_status": "passed_inspection",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for d, division_id in enumerate(division_ids)
+            for i in range(self.racers_per_division)
+        ]
+        await session.execute(insert(Racer), rows)
+        await session.commit()
+
+        return division_ids
+
+    async def run_round(self, round_id: int) -> None:
+        """Run every scheduled heat of a round, in order"""
+        heats = await self.request(
+            "list heats", "GET", "/api/heats/", params={"round_id": round_id, "status": "scheduled"}
+        )
+        for heat in heats:
+            await self.run_heat(heat["id"])
+
+    async def run_heat(self, heat_id: int) -> None:
+        """Stage a heat, race it on the timer and record the results"""
+        detail = await self.request("get heat", "GET", f"/api/heats/{heat_id}")
+        lanes = [{"lane": lane["lane"], "racer_id": lane["racer_id"]} for lane in detail["lanes"]]
+        self.current_heat = heat_id
+
+        results = await self.timer_service.run_heat({"lanes": lanes})
+        racer_by_lane = {lane["lane"]: lane["racer_id"] for lane in lanes}
+
+        await self.request("record results", "POST", "/api/results/heat", json={
+            "heat_id": heat_id,
+            "results": [
+                {
+                    "heat_id": heat_id,
+                    "racer_id": racer_by_lane[result["lane"]],
+                    "lane": result["lane"],
+                    "time": result["time"],
+                    "place": result["place"],
+                }
+                for result in results or []
+            ],
+        })
+
+        self.last_completed = heat_id
+        self.heats_run += 1
+
+    async def display_client(self, stop: asyncio.Event) -> None:
+        """Poll the endpoints a now-racing display uses until stopped"""
+        while not stop.is_set():
+            await self.request("display upcoming", "GET", "/api/heats/", params={"upcoming": True})
+            if self.current_heat is not None:
+                await self.request("display heat", "GET", f"/api/heats/{self.current_heat}")
+            if self.last_completed is not None:
+                await self.request(
+                    "display results", "GET", f"/api/results/heat/{self.last_completed}"
+                )
+            try:
+                await asyncio.wait_for(stop.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self, session_factory) -> Dict[str, Any]:
+        """Run the whole event and return the report"""
+        from backend.api.services import RaceScheduler, TimerService
+
+        self.timer_service = TimerService(results_delay=0)
+        await self.timer_service.initialize_timer({
+            "timer_type": "virtual",
+            "connection_type": "virtual",
+            "lanes": self.lanes,
+            "seed": self.seed,
+        })
+
+        self.queries.install()
+        stop = asyncio.Event()
+        displays = []
+        started = time.perf_counter()
+
+        try:
+            with self.phase("seed"):
+                async with session_factory() as session:
+                    division_ids = await self.seed_racers(session)
+
+            displays = [
+                asyncio.create_task(self.display_client(stop)) for _ in range(self.display_count)
+            ]
+
+            with self.phase("schedule prelims"):
+                prelim_ids = []
+                async with session_factory() as session:
+                    scheduler = RaceScheduler(session)
+                    for division_id in division_ids:
+                        round_obj = await scheduler.create_preliminary_round(division_id)
+                        await scheduler.generate_heats_for_round(round_obj.id, self.lanes)
+                        prelim_ids.append(round_obj.id)
+
+            with self.phase("run prelims"):
+                for round_id in prelim_ids:
+                    await self.run_round(round_id)
+
+            with self.phase("schedule finals"):
+                final_ids = []
+                async with session_factory() as session:
+                    scheduler = RaceScheduler(session)
+                    for division_id, prelim_id in zip(division_ids, prelim_ids):
+                        round_obj = await scheduler.create_final_round(division_id)
+                        await scheduler.advance_racers_to_finals(
+                            prelim_id, round_obj.id, self.finalists
+                        )
+                        final_ids.append(round_obj.id)
+
+            with self.phase("run finals"):
+                for round_id in final_ids:
+                    await self.run_round(round_id)
+
+            with self.phase("championship"):
+                async with session_factory() as session:
+                    scheduler = RaceScheduler(session)
+                    round_obj = await scheduler.create_championship_round()
+                    await scheduler.create_championship_heats(round_obj.id, self.lanes)
+                await self.run_round(round_obj.id)
+
+            with self.phase("standings"):
+                async with session_factory() as session:
+                    standings = await RaceScheduler(session).get_race_standings()
+        finally:
+            stop.set()
+            await asyncio.gather(*displays, return_exceptions=True)
+            self.queries.uninstall()
+            await self.timer_service.close_timer()
+
+        return self.report(time.perf_counter() - started, len(standings))
+
+    def report(self, elapsed: float, standings: int) -> Dict[str, Any]:
+        """Summarize the run"""
+        racing_time = sum(
+            phase["wall_s"] for phase in self.phases.values() if phase["heats"]
+        )
+        _, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+
+        return {
+            "racers": self.division_count * self.racers_per_division,
+            "heats": self.heats_run,
+            "standings": standings,
+            "elapsed_s": round(elapsed, 3),
+            "heats_per_hour": round(self.heats_run / racing_time * 3600) if racing_time else 0,
+            "latency_ms": {
+                name: {
+                    "count": len(samples),
+                    "p50": round(percentile(samples, 50) * 1000, 2),
+                    "p99": round(percentile(samples, 99) * 1000, 2),
+                }
+                for name, samples in sorted(self.latency.items())
+            },
+            "phases": {
+                name: {
+                    "wall_s": round(phase["wall_s"], 3),
+                    "db_s": round(self.queries.time.get(name, 0.0), 3),
+                    "statements": self.queries.statements.get(name, 0),
+                    "heats": phase["heats"],
+                }
+                for name, phase in self.phases.items()
+            },
+            "peak_memory_mb": round(peak / 1024 / 1024, 1),
+            "max_rss_mb": max_rss_mb(),
+        }
+
+
+def max_rss_mb() -> Optional[float]:
+    """Peak resident set size of the process, where the platform reports it"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    import sys
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def simulate(args: argparse.Namespace, workdir: Path) -> Dict[str, Any]:
+    """Build the app and an API client, then run the event"""
+    import httpx
+    from litestar.datastructures import State
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from backend.api.services import result_journal
+    from backend.main import create_app
+
+    result_journal.configure(workdir / "results.journal")
+
+    app = create_app()
+    if not args.verbose:
+        # Per-request access logging would dominate the run
+        for name in ("", "httpx", "backend"):
+            logging.getLogger(name).setLevel(logging.WARNING)
+    # Operator identity for write endpoints when running without the auth middleware
+    operator = {"sub": "simulator", "username": "simulator", "is_admin": True}
+    app.state = State({**dict(app.state), "jwt_payload": operator})
+
+    engine = create_async_engine(args.database)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://simulator") as client:
+            simulator = EventSimulator(
+                client,
+                divisions=args.divisions,
+                racers=args.racers,
+                displays=args.displays,
+                lanes=args.lanes,
+                poll_interval=args.poll_interval,
+                finalists=args.finalists,
+                seed=args.seed,
+            )
+            return await simulator.run(session_factory)
+    finally:
+        result_journal.close()
+        await engine.dispose()
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a human-readable summary"""
+    print(f"\n{report['racers']} racers, {report['heats']} heats in {report['elapsed_s']}s "
+          f"({report['heats_per_hour']} heats/hour)")
+    print(f"Peak Python memory {report['peak_memory_mb']} MB, max RSS {report['max_rss_mb']} MB\n")
+
+    print(f"{'Phase':<20}{'wall s':>10}{'db s':>10}{'stmts':>10}{'heats':>8}")
+    for name, phase in report["phases"].items():
+        print(f"{name:<20}{phase['wall_s']:>10}{phase['db_s']:>10}{phase['statements']:>10}{phase['heats']:>8}")
+
+    print(f"\n{'Endpoint':<20}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, stats in report["latency_ms"].items():
+        print(f"{name:<20}{stats['count']:>8}{stats['p50']:>10}{stats['p99']:>10}")
+
+
+def main() -> None:
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Simulate a full race day and report throughput")
+    parser.add_argument("--divisions", type=int, default=4, help="Number of divisions")
+    parser.add_argument("--racers", type=int, default=30, help="Racers per division")
+    parser.add_argument("--displays", type=int, default=3, help="Simulated display clients")
+    parser.add_argument("--lanes", type=int, default=4, help="Lanes on the track")
+    parser.add_argument("--finalists", type=int, default=4, help="Racers advanced to each final")
+    parser.add_argument(
+        "--poll-interval", type=float, default=0.5, help="Display poll interval (s)"
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    parser.add_argument("--database", help="Database URL (default: a temporary SQLite file)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Keep application logging")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Track peak Python allocations (slower)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory(prefix="derby-sim-") as tmp:
+        workdir = Path(tmp)
+        if not args.database:
+            args.database = f"sqlite+aiosqlite:///{workdir / 'simulation.db'}"
+        upgrade_to_head(args.database)
+
+        if args.trace_memory:
+            tracemalloc.start()
+        report = asyncio.run(simulate(args, workdir))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# backend/tests/conftest.py
+"""
+Shared fixtures for the Derby Director test suite
+"""
+
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+
+import backend.config
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+
+@pytest.fixture
+def migrated_db(tmp_path, monkeypatch):
+    """A fresh SQLite database upgraded to the latest schema"""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'derby.db'}"
+    monkeypatch.setattr(backend.config, "DATABASE_URL", url)
+
+    alembic_cfg = Config()
+    alembic_cfg.set_main_option("script_location", str(MIGRATIONS_DIR))
+    command.upgrade(alembic_cfg, "head")
+
+    return url
+
+
+@pytest.fixture(autouse=True)
+def isolated_journal(tmp_path):
+    """Keep result journal writes out of backend/journal during tests"""
+    from backend.api.services.journal import result_journal
+
+    result_journal.configure(tmp_path / "results.journal", fsync_interval=0)
+    yield result_journal
+    result_journal.close()
@@ -0,0 +1,109 @@
+# backend/tests/test_certificates.py
+"""
+Tests for award certificate generation
+"""
+
+import asyncio
+import io
+import re
+import zipfile
+
+import pytest
+from litestar.datastructures import State
+from litestar.testing import TestClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.api.models import Award, AwardWinner, Division, Racer, Settings
+from backend.api.services.certificates import (
+    Certificate,
+    CertificateTemplate,
+    ordinal,
+    render_certificates,
+)
+
+
+def page_count(pdf: bytes) -> int:
+    return len(re.findall(rb"/Type /Page[^s]", pdf))
+
+
+@pytest.fixture
+def client(migrated_db):
+    from backend.main import create_app
+
+    async def seed():
+        engine = create_async_engine(migrated_db)
+        async with engine.begin() as conn:
+            await conn.execute(insert(Settings), [{"key": "event_name", "value": "Test Derby"}])
+            await conn.execute(insert(Division), [{"id": 1, "name": "Lions", "sort_order": 1}])
+            await conn.execute(insert(Racer), [
+                {"id": i, "firstname": f"Racer{i}", "lastname": "Test", "divisionid": 1,
+                 "carno": str(100 + i), "exclude": False}
+                for i in range(1, 121)
+            ])
+            await conn.execute(insert(Award), [
+                {"id": 1, "title": "Fastest Lion", "divisionid": 1, "awardtype": "speed",
+                 "sort_order": 1},
+                {"id": 2, "title": "Best Design", "divisionid": None, "awardtype": "design",
+                 "sort_order": 2},
+            ])
+            await conn.execute(insert(AwardWinner), [
+                {"award_id": 1, "racer_id": 1, "place": 1},
+                {"award_id": 1, "racer_id": 2, "place": 2},
+                {"award_id": 2, "racer_id": 3, "place": 1},
+            ])
+        await engine.dispose()
+
+    asyncio.run(seed())
+    app = create_app()
+    # Operator identity for the certificate endpoint
+    app.state = State({**dict(app.state), "jwt_payload": {"sub": "tester", "is_admin": True}})
+    with TestClient(app=app) as test_client:
+        yield test_client
+
+
+def test_ordinal():
+    assert [ordinal(n) for n in (1, 2, 3, 4, 11, 12, 13, 21, 22, 111)] == [
+        "1st", "2nd", "3rd", "4th", "11th", "12th", "13th", "21st", "22nd", "111th"
+    ]
+
+
+def test_template_drawn_once_per_document():
+    template = CertificateTemplate("Test Derby", "Pack 1", None, None)
+    certificates = [
+        Certificate(f"Racer {i}", str(i), "Lions", "Fastest", 1, "for speed", None)
+        for i in range(5)
+    ]
+
+    pdf = render_certificates(template, certificates)
+
+    assert pdf.startswith(b"%PDF")
+    assert page_count(pdf) == 5
+    assert pdf.count(b"/Subtype /Form") == 1
+
+
+def test_award_winner_certificates(client):
+    response = client.post("/api/reports/certificates", json={})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert page_count(response.content) == 3
+
+    speed = client.post("/api/reports/certificates", json={"award_type": "speed"})
+    assert page_count(speed.content) == 2
+
+    assert client.post("/api/reports/certificates", json={"award_id": 99}).status_code == 404
+    assert (
+        client.post("/api/reports/certificates", json={"award_type": "custom"}).status_code == 400
+    )
+
+
+def test_participant_certificates_as_zip(client):
+    response = client.post(
+        "/api/reports/certificates", json={"award_type": "participant", "format": "zip"}
+    )
+    assert response.status_code == 200
+
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    names = archive.namelist()
+    assert names == ["certificates-001.pdf", "certificates-002.pdf", "certificates-003.pdf"]
+    assert [page_count(archive.read(name)) for name in names] == [50, 50, 20]
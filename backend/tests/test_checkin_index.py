@@ -0,0 +1,63 @@
+# backend/tests/test_checkin_index.py
+"""
+Tests for the in-memory check-in lookup index
+"""
+
+from backend.api.models import Racer
+from backend.api.services import CheckinIndex
+
+
+def make_racer(racer_id, carno, barcode=None, divisionid=1, exclude=False):
+    """Build a detached racer for indexing"""
+    return Racer(
+        id=racer_id, firstname="Test", lastname="Racer", divisionid=divisionid,
+        carno=carno, barcode=barcode, exclude=exclude
+    )
+
+
+def test_lookup_by_carno_and_barcode():
+    """Scans resolve by barcode first, then car number, ignoring case and padding"""
+    index = CheckinIndex()
+    index.upsert(make_racer(1, "101", barcode="dd-0001"))
+    index.upsert(make_racer(2, "DD-0001", divisionid=2, exclude=True))
+
+    assert index.lookup(" dd-0001 ").racer_id == 1
+    assert index.lookup("101").racer_id == 1
+
+    index.remove(1)
+    entry = index.lookup("DD-0001")
+    assert entry.racer_id == 2
+    assert entry.divisionid == 2
+    assert entry.exclude is True
+    assert index.lookup("101") is None
+    assert index.lookup("   ") is None
+
+
+def test_upsert_replaces_old_keys():
+    """Changing a car number drops the old key from the index"""
+    index = CheckinIndex()
+    index.upsert(make_racer(1, "101"))
+    index.upsert(make_racer(1, "202"))
+
+    assert len(index) == 1
+    assert index.lookup("101") is None
+    assert [e.racer_id if e else None for e in index.lookup_many(["202", "999"])] == [1, None]
+
+
+def test_shared_car_number_is_ambiguous():
+    """A car number held by two racers resolves to neither until only one holds it"""
+    index = CheckinIndex()
+    index.upsert(make_racer(1, "101", barcode="DD-0001"))
+    index.upsert(make_racer(2, "101", divisionid=2))
+
+    assert index.lookup("101") is None
+    assert [entry.racer_id for entry in index.matches("101")] == [1, 2]
+    assert index.lookup("dd-0001").racer_id == 1
+
+    index.remove(2)
+    assert index.lookup("101").racer_id == 1
+
+    index.upsert(make_racer(3, "101"))
+    index.upsert(make_racer(1, "111"))
+    assert index.lookup("101").racer_id == 3
+    assert index.lookup("111").racer_id == 1
@@ -0,0 +1,137 @@
+# backend/tests/test_compression.py
+"""
+Tests for the response compression middleware
+"""
+
+import threading
+from typing import AsyncIterator
+
+import pytest
+from litestar import Litestar, Request, Response, get
+from litestar.enums import MediaType
+from litestar.response import Stream
+from litestar.testing import TestClient
+
+from backend.api.middleware import compression
+from backend.api.middleware.compression import (
+    CompressionMiddleware,
+    choose_encoding,
+    compressed_bodies,
+    is_compressible,
+)
+from backend.api.responses import etag_matches
+
+ROWS = [
+    {"racer_id": i, "first_name": "Racer", "last_name": "Test", "car_number": str(100 + i)}
+    for i in range(200)
+]
+CHART = b'{"version": 3, "lanes": [' + b", ".join(b"1" for _ in range(2000)) + b"]}"
+
+
+@get("/racers")
+async def racers() -> list:
+    return ROWS
+
+
+@get("/thread")
+async def thread() -> dict:
+    return {"thread": threading.get_ident()}
+
+
+@get("/tiny")
+async def tiny() -> dict:
+    return {"ok": True}
+
+
+@get("/chart")
+async def chart(request: Request) -> Response:
+    if etag_matches(request.headers.get("If-None-Match"), '"chart-3"'):
+        return Response(content=b"", status_code=304, headers={"ETag": '"chart-3"'})
+    return Response(content=CHART, media_type=MediaType.JSON, headers={"ETag": '"chart-3"'})
+
+
+@get("/photo")
+async def photo() -> Response:
+    return Response(content=b"\xff\xd8" * 2000, media_type="image/jpeg")
+
+
+@get("/export")
+async def export() -> Stream:
+    async def chunks() -> AsyncIterator[bytes]:
+        for _ in range(3):
+            yield b"x" * 2000
+    return Stream(chunks(), media_type=MediaType.TEXT)
+
+
+@pytest.fixture
+def client():
+    compressed_bodies.clear()
+    app = Litestar(
+        route_handlers=[racers, thread, tiny, chart, photo, export],
+        middleware=[CompressionMiddleware],
+    )
+    with TestClient(app=app) as test_client:
+        yield test_client
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate", ["br", "gzip"]) == "gzip"
+    assert choose_encoding("gzip;q=0, deflate", ["gzip"]) is None
+    assert choose_encoding(None, ["gzip"]) is None
+    assert is_compressible("application/json; charset=utf-8")
+    assert is_compressible("text/html")
+    assert not is_compressible("image/jpeg")
+
+
+def test_large_json_is_compressed(client):
+    response = client.get("/racers", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content) / 5
+    assert response.json() == ROWS
+
+    plain = client.get("/racers", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+    assert plain.json() == ROWS
+
+
+def test_passthrough(client):
+    headers = {"Accept-Encoding": "gzip"}
+    assert "content-encoding" not in client.get("/tiny", headers=headers).headers
+    assert "content-encoding" not in client.get("/photo", headers=headers).headers
+
+    streamed = client.get("/export", headers=headers)
+    assert "content-encoding" not in streamed.headers
+    assert streamed.content == b"x" * 6000
+
+
+def test_versioned_bodies_compressed_once(client):
+    headers = {"Accept-Encoding": "gzip"}
+    first = client.get("/chart", headers=headers)
+    second = client.get("/chart", headers=headers)
+    assert first.content == second.content == CHART
+    assert first.headers["etag"] == 'W/"chart-3"'
+    assert (compressed_bodies.misses, compressed_bodies.hits) == (1, 1)
+
+    revalidated = client.get("/chart", headers={**headers, "If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304
+
+
+def test_large_bodies_compress_off_the_loop(client, monkeypatch):
+    loop_thread = client.get("/thread").json()["thread"]
+    threads = []
+
+    def compress(body, encoding):
+        threads.append(threading.get_ident())
+        return real_compress(body, encoding)
+
+    real_compress = compression.compress
+    monkeypatch.setattr(compression, "compress", compress)
+    monkeypatch.setattr(compression, "COMPRESSION_EXECUTOR_MIN_SIZE", 8 * 1024)
+
+    headers = {"Accept-Encoding": "gzip"}
+    assert client.get("/racers", headers=headers).json() == ROWS
+    assert client.get("/chart", headers=headers).content == CHART
+    assert threads[0] != loop_thread
+    assert threads[1] == loop_thread
@@ -0,0 +1,78 @@
+# backend/tests/test_frontend.py
+"""
+Tests for serving the built frontend
+"""
+
+import gzip
+
+import pytest
+from litestar.testing import TestClient
+
+from backend.api.responses import IMMUTABLE_CACHE_CONTROL, precompressed_file
+
+INDEX = b"<!DOCTYPE html><div id=app></div>"
+SCRIPT = b"console.log('derby');" * 50
+
+
+@pytest.fixture
+def dist(tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "index.html").write_bytes(INDEX)
+    (tmp_path / "favicon.ico").write_bytes(b"icon")
+    (tmp_path / "assets" / "index-4f9a1c2e.js").write_bytes(SCRIPT)
+    (tmp_path / "assets" / "index-4f9a1c2e.js.gz").write_bytes(gzip.compress(SCRIPT))
+    (tmp_path / "assets" / "index-4f9a1c2e.js.br").write_bytes(b"brotli")
+    return tmp_path
+
+
+@pytest.fixture
+def client(migrated_db, dist, monkeypatch):
+    monkeypatch.setattr("backend.main.FRONTEND_DIR", dist)
+    monkeypatch.setattr("backend.api.controllers.frontend.FRONTEND_DIR", dist)
+    from backend.main import create_app
+
+    with TestClient(app=create_app()) as test_client:
+        yield test_client
+
+
+def test_precompressed_file(dist):
+    script = dist / "assets" / "index-4f9a1c2e.js"
+    brotli = script.with_name(script.name + ".br")
+    gzipped = script.with_name(script.name + ".gz")
+    assert precompressed_file(script, "gzip, deflate, br")[:2] == (brotli, "br")
+    assert precompressed_file(script, "br;q=0, gzip")[:2] == (gzipped, "gzip")
+    assert precompressed_file(script, "identity")[:2] == (script, None)
+    assert precompressed_file(dist / "index.html", "gzip, br")[:2] == (dist / "index.html", None)
+
+
+def test_hashed_assets_are_immutable(client):
+    response = client.get("/assets/index-4f9a1c2e.js", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/javascript")
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == SCRIPT
+
+    plain = client.get("/assets/index-4f9a1c2e.js", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] != response.headers["etag"]
+
+    assert client.get("/assets/missing-00000000.js").status_code == 404
+
+
+def test_index_revalidates(client):
+    response = client.get("/")
+    assert response.content == INDEX
+    assert response.headers["cache-control"] == "no-cache"
+
+    cached = client.get("/", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+
+    # Client-side routes get the app shell; missing files and API routes do not
+    assert client.get("/heats/12").content == INDEX
+    assert client.get("/favicon.ico").content == b"icon"
+    assert client.get("/logo.png").status_code == 404
+    assert client.get("/api/nowhere").status_code == 404
+    assert client.get("/../pyproject.toml").status_code == 404
+    assert client.get("/api/board").status_code in (200, 503)
@@ -0,0 +1,62 @@
+# backend/tests/test_generate_seed.py
+"""
+Tests for the synthetic seed generator
+"""
+
+import asyncio
+from collections import Counter
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.api.models import Heat, Racer, RaceResult
+from backend.migrations.generate_seed import TABLES, SeedGenerator, load
+
+FIRST_IDS = {table: 1 for table in TABLES}
+
+
+def test_generation_is_reproducible():
+    first = SeedGenerator(racers=50, divisions=3, completed=0.5, seed=7).rows(FIRST_IDS)
+    second = SeedGenerator(racers=50, divisions=3, completed=0.5, seed=7).rows(FIRST_IDS)
+    other = SeedGenerator(racers=50, divisions=3, completed=0.5, seed=8).rows(FIRST_IDS)
+
+    assert first == second
+    assert first["racers"] != other["racers"]
+
+
+def test_every_racer_runs_each_lane_once():
+    tables = SeedGenerator(racers=23, divisions=2, lanes=4).rows(FIRST_IDS)
+
+    runs = Counter((row["racer_id"], row["lane"]) for row in tables["racer_heats"])
+    assert len(runs) == 23 * 4
+    assert set(runs.values()) == {1}
+
+    per_heat = Counter(row["heat_id"] for row in tables["racer_heats"])
+    assert set(per_heat.values()) == {4}
+
+
+def test_load_appends_to_existing_database(migrated_db):
+    """Loading twice keeps IDs unique and reuses existing ranks"""
+
+    async def run():
+        await load(migrated_db, SeedGenerator(racers=40, divisions=2, completed=1.0), batch_size=7)
+        counts = await load(
+            migrated_db, SeedGenerator(racers=40, divisions=9, completed=0.0), batch_size=7
+        )
+
+        engine = create_async_engine(migrated_db)
+        async with engine.connect() as conn:
+            racers = (await conn.execute(select(func.count()).select_from(Racer))).scalar()
+            completed = (await conn.execute(
+                select(func.count()).select_from(Heat).where(Heat.status == "completed")
+            )).scalar()
+            results = (await conn.execute(select(func.count()).select_from(RaceResult))).scalar()
+        await engine.dispose()
+        return counts, racers, completed, results
+
+    counts, racers, completed, results = asyncio.run(run())
+
+    assert counts["ranks"] == 0
+    assert racers == 80
+    assert completed == 40
+    assert results == 160
@@ -0,0 +1,114 @@
+# backend/tests/test_heat_charts.py
+"""
+Tests for heat chart and pit card PDF export
+"""
+
+import asyncio
+import re
+import zlib
+
+import pytest
+from litestar.testing import TestClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.api.models import Division, Heat, Racer, RaceResult, RacerHeat, Round
+from backend.api.services.pdf_stream import PageCanvas, PdfStreamWriter
+
+HEATS = 60
+LANES = 4
+
+
+def check_structure(pdf: bytes) -> int:
+    """Validate the cross reference table and return the page count"""
+    assert pdf.startswith(b"%PDF-1.4") and pdf.endswith(b"%%EOF\n")
+    xref_offset = int(re.search(rb"startxref\n(\d+)\n", pdf).group(1))
+    assert pdf[xref_offset:].startswith(b"xref\n")
+
+    count = int(re.match(rb"xref\n0 (\d+)\n", pdf[xref_offset:]).group(1))
+    entries = pdf[xref_offset:].split(b"\n")[3:3 + count - 1]
+    for number, entry in enumerate(entries, 1):
+        offset = int(entry[:10])
+        assert pdf[offset:].startswith(b"%d 0 obj" % number)
+
+    pages = int(re.search(rb"/Type /Pages /Kids \[[^\]]*\] /Count (\d+)", pdf).group(1))
+    assert len(re.findall(rb"/Type /Page ", pdf)) == pages
+    return pages
+
+
+def test_stream_writer_pages():
+    writer = PdfStreamWriter((612, 792), "Test (1)")
+    canvas = PageCanvas()
+    canvas.text(72, 700, "Heat (1) \\ done", bold=True)
+    canvas.line(72, 690, 300, 690)
+
+    pdf = writer.start() + writer.page(canvas.content())
+    pdf += writer.page(PageCanvas().content()) + writer.finish()
+
+    assert check_structure(pdf) == 2
+    stream = re.search(rb"stream\n(.*?)\nendstream", pdf, re.S).group(1)
+    assert b"(Heat \\(1\\) \\\\ done) Tj" in zlib.decompress(stream)
+
+
+@pytest.fixture
+def client(migrated_db):
+    from backend.main import create_app
+
+    async def seed():
+        engine = create_async_engine(migrated_db)
+        async with engine.begin() as conn:
+            await conn.execute(insert(Division), [{"id": 1, "name": "Lions", "sort_order": 1}])
+            await conn.execute(insert(Racer), [
+                {"id": i, "firstname": f"Racer{i}", "lastname": "Test", "divisionid": 1,
+                 "carno": str(100 + i)}
+                for i in range(1, HEATS + 1)
+            ])
+            await conn.execute(insert(Round), [
+                {"id": 1, "name": "Lions Preliminary", "divisionid": 1, "roundno": 1,
+                 "phase": "preliminary", "charttype": "roster"},
+            ])
+            await conn.execute(insert(Heat), [
+                {"id": h, "roundid": 1, "heat": h, "status": "completed" if h == 1 else "scheduled"}
+                for h in range(1, HEATS + 1)
+            ])
+            await conn.execute(insert(RacerHeat), [
+                {"heat_id": h, "lane": lane, "racer_id": (h + lane - 2) % HEATS + 1}
+                for h in range(1, HEATS + 1) for lane in range(1, LANES + 1)
+            ])
+            await conn.execute(insert(RaceResult), [
+                {"heat_id": 1, "racer_id": lane, "lane": lane, "time": 3.1 + lane / 100,
+                 "place": lane, "completed": True}
+                for lane in range(1, LANES + 1)
+            ])
+        await engine.dispose()
+
+    asyncio.run(seed())
+    with TestClient(app=create_app()) as test_client:
+        yield test_client
+
+
+def test_heat_chart_export(client):
+    response = client.get("/api/reports/heat-chart", params={"round_id": 1})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    # 60 heats plus the round heading, 18 rows a page
+    assert check_structure(response.content) == 4
+
+    by_division = client.get("/api/reports/heat-chart", params={"division_id": 1})
+    assert check_structure(by_division.content) == 4
+
+
+def test_pit_cards_export(client):
+    response = client.get("/api/reports/pit-cards", params={"round_id": 1})
+    assert response.status_code == 200
+    # 60 racers, six cards a page
+    assert check_structure(response.content) == 10
+
+
+def test_chart_errors(client):
+    assert client.get("/api/reports/heat-chart").status_code == 400
+    assert (
+        client.get("/api/reports/heat-chart", params={"round_id": 1, "division_id": 1}).status_code
+        == 400
+    )
+    assert client.get("/api/reports/heat-chart", params={"round_id": 99}).status_code == 404
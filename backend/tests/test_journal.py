@@ -0,0 +1,173 @@
+# backend/tests/test_journal.py
+"""
+Tests for the result journal and journal replay
+"""
+
+import asyncio
+
+import pytest
+from litestar.datastructures import State
+from litestar.testing import TestClient
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.api.models import Heat, RaceResult, RacerHeat
+from backend.api.services import ResultRecorder, iter_journal
+from backend.api.services.journal import ResultJournal, scan_journal
+from backend.migrations.replay_journal import replay
+from backend.tests.test_result_recorder import seed_heats, submission
+
+
+def test_torn_tail_is_discarded(tmp_path):
+    """A partial record at the end of the file is ignored and truncated on reopen"""
+    path = tmp_path / "results.journal"
+
+    async def write(journal, count):
+        await asyncio.gather(*(journal.append("clear", heat_id=n) for n in range(count)))
+        journal.close()
+
+    asyncio.run(write(ResultJournal(path, fsync_interval=0), 3))
+    intact_size = path.stat().st_size
+
+    with open(path, "ab") as handle:
+        handle.write(b"\x00\x00\x01\x00garbage")
+
+    records, valid_end = scan_journal(path)
+    assert [r["heat_id"] for r in records] == [0, 1, 2]
+    assert valid_end == intact_size
+
+    asyncio.run(write(ResultJournal(path, fsync_interval=0), 1))
+    records = list(iter_journal(path))
+    assert [r["seq"] for r in records] == [1, 2, 3, 4]
+
+
+def test_replay_rebuilds_results(migrated_db, isolated_journal):
+    """Results deleted from the database are restored from the journal"""
+
+    async def run():
+        engine = create_async_engine(migrated_db)
+        async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+        racer_ids, heat_ids = await seed_heats(async_session, heat_count=2)
+
+        async with async_session() as session:
+            recorder = ResultRecorder(session)
+            await recorder.record_heats([submission(heat_id, racer_ids) for heat_id in heat_ids])
+            await recorder.update_lane(heat_ids[0], 1, {"time": 2.5})
+
+        async with async_session() as session:
+            await session.execute(delete(RaceResult))
+            await session.commit()
+
+        isolated_journal.close()
+        stats = await replay(isolated_journal.path, migrated_db)
+
+        async with async_session() as session:
+            results = (await session.execute(select(RaceResult))).scalars().all()
+            heat = await session.get(Heat, heat_ids[0])
+
+        await engine.dispose()
+        return stats, results, heat
+
+    stats, results, heat = asyncio.run(run())
+
+    assert stats["results"] == 8
+    assert len(results) == 8
+    assert heat.status == "completed"
+    assert heat.version == 2
+    lane_one = next(r for r in results if r.heat_id == heat.id and r.lane == 1)
+    assert lane_one.time == 2.5
+
+
+@pytest.fixture
+def client(migrated_db):
+    from backend.main import create_app
+
+    app = create_app()
+    # Operator identity for the write endpoints
+    app.state = State({**dict(app.state), "jwt_payload": {"sub": "tester", "is_admin": True}})
+    with TestClient(app=app) as test_client:
+        yield test_client
+
+
+def query(database_url, statement):
+    async def run():
+        engine = create_async_engine(database_url)
+        async with async_sessionmaker(engine)() as session:
+            rows = (await session.execute(statement)).scalars().all()
+        await engine.dispose()
+        return rows
+
+    return asyncio.run(run())
+
+
+def test_replay_keeps_deleted_heats_deleted(migrated_db, isolated_journal, client):
+    """A heat scheduled and then deleted is not recreated by replay"""
+    engine = create_async_engine(migrated_db)
+    racer_ids, heat_ids = asyncio.run(
+        seed_heats(async_sessionmaker(engine, expire_on_commit=False), heat_count=1)
+    )
+    asyncio.run(engine.dispose())
+    round_id = query(migrated_db, select(Heat.roundid))[0]
+
+    lanes = [{"lane": lane + 1, "racer_id": racer_id} for lane, racer_id in enumerate(racer_ids)]
+    created = client.post("/api/heats/", json={"roundid": round_id, "heat": 2, "lanes": lanes})
+    assert created.status_code == 201
+    heat_id = created.json()["id"]
+    assert client.delete(f"/api/heats/{heat_id}").status_code == 204
+
+    isolated_journal.close()
+    assert [r["type"] for r in iter_journal(isolated_journal.path)] == ["schedule", "delete_heat"]
+    stats = asyncio.run(replay(isolated_journal.path, migrated_db))
+
+    assert stats["heats_created"] == 0
+    assert query(migrated_db, select(Heat.id)) == heat_ids
+    assert query(migrated_db, select(RacerHeat.id).where(RacerHeat.heat_id == heat_id)) == []
+
+
+def test_replay_matches_live_heat_versions(migrated_db, isolated_journal, client):
+    """A heat update changing status and lanes is one version bump live and on replay"""
+    engine = create_async_engine(migrated_db)
+    racer_ids, heat_ids = asyncio.run(
+        seed_heats(async_sessionmaker(engine, expire_on_commit=False), heat_count=1)
+    )
+    asyncio.run(engine.dispose())
+
+    lanes = [{"lane": lane + 1, "racer_id": racer_id} for lane, racer_id in enumerate(racer_ids)]
+    swapped = [{"lane": lane["lane"], "racer_id": racer_ids[-lane["lane"]]} for lane in lanes]
+    started = {"status": "in_progress", "lanes": lanes}
+    assert client.put(f"/api/heats/{heat_ids[0]}", json=started).status_code == 200
+    live = client.put(f"/api/heats/{heat_ids[0]}", json={"lanes": swapped}).json()
+    assert live["version"] == 2
+
+    async def reset():
+        async with async_sessionmaker(engine)() as session:
+            heat = await session.get(Heat, heat_ids[0])
+            heat.version, heat.status = 0, "scheduled"
+            await session.commit()
+        await engine.dispose()
+
+    asyncio.run(reset())
+    isolated_journal.close()
+    asyncio.run(replay(isolated_journal.path, migrated_db))
+
+    heat = query(migrated_db, select(Heat).where(Heat.id == heat_ids[0]))[0]
+    assert (heat.version, heat.status) == (live["version"], live["status"])
+    assert (
+        query(migrated_db, select(RacerHeat.racer_id).order_by(RacerHeat.lane)) == racer_ids[::-1]
+    )
+
+
+def test_close_flushes_pending_batch(tmp_path):
+    """Records still waiting for their group commit are written on close"""
+    path = tmp_path / "results.journal"
+    journal = ResultJournal(path, fsync_interval=60)
+
+    async def run():
+        pending = asyncio.create_task(journal.append("clear", heat_id=1))
+        await asyncio.sleep(0)
+        journal.close()
+        await pending
+
+    asyncio.run(run())
+    assert [r["heat_id"] for r in iter_journal(path)] == [1]
@@ -0,0 +1,51 @@
+# backend/tests/test_loop_monitor.py
+"""
+Tests for the event loop lag monitor
+"""
+
+import asyncio
+import time
+
+from backend.api.services.loop_monitor import LoopMonitor
+
+
+def blocking_schedule_build():
+    time.sleep(0.3)
+
+
+def test_stall_is_captured_with_stack():
+    async def scenario():
+        monitor = LoopMonitor(interval=0.01, threshold=0.05)
+        await monitor.start()
+        await asyncio.sleep(0.05)
+
+        async def handler():
+            blocking_schedule_build()
+
+        await asyncio.create_task(handler(), name="slow-handler")
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+        return monitor.snapshot()
+
+    snapshot = asyncio.run(scenario())
+
+    assert snapshot["stalls"] == 1
+    assert snapshot["max_lag"] >= 0.25
+    stall = snapshot["recent"][0]
+    assert stall["task"] == "slow-handler"
+    assert stall["lag"] >= 0.25
+    assert any("blocking_schedule_build" in line for line in stall["stack"])
+
+
+def test_idle_loop_has_no_stalls():
+    async def scenario():
+        monitor = LoopMonitor(interval=0.01, threshold=0.1)
+        await monitor.start()
+        await asyncio.sleep(0.2)
+        await monitor.stop()
+        return monitor
+
+    monitor = asyncio.run(scenario())
+
+    assert monitor.stalls == 0
+    assert not monitor.running
@@ -0,0 +1,48 @@
+# backend/tests/test_metrics.py
+"""
+Tests for the metrics registry and scrape endpoint
+"""
+
+from litestar.testing import TestClient
+
+from backend.api.services.metrics import MetricsRegistry, racer_count_bucket
+
+
+def test_histogram_render():
+    registry = MetricsRegistry()
+    latency = registry.histogram("test_seconds", "Test latency", ("route",), buckets=(0.1, 1.0))
+    requests = registry.counter("test_total", "Test requests", ("route",))
+
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, route='/a"b')
+    requests.inc(route="/x")
+    requests.inc(route="/x")
+
+    lines = registry.render().splitlines()
+    assert '# TYPE test_seconds histogram' in lines
+    assert 'test_seconds_bucket{route="/a\\"b",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{route="/a\\"b",le="1"} 2' in lines
+    assert 'test_seconds_bucket{route="/a\\"b",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{route="/a\\"b"} 3' in lines
+    assert 'test_total{route="/x"} 2' in lines
+
+
+def test_racer_count_bucket():
+    assert racer_count_bucket(10) == "<=25"
+    assert racer_count_bucket(100) == "<=100"
+    assert racer_count_bucket(5000) == ">500"
+
+
+def test_metrics_endpoint(migrated_db):
+    from backend.main import create_app
+
+    with TestClient(app=create_app()) as client:
+        client.get("/api/heats/")
+        response = client.get("/api/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'derby_http_requests_total{method="GET",route="/api/heats",status="200"}' in response.text
+    )
+    assert "derby_db_checkout_wait_seconds_count" in response.text
@@ -0,0 +1,107 @@
+# backend/tests/test_photos.py
+"""
+Tests for racer photo uploads and variant serving
+"""
+
+import asyncio
+import io
+
+import pytest
+from litestar.datastructures import State
+from litestar.testing import TestClient
+from PIL import Image
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.api.models import Division, Racer
+from backend.api.services.photos import photo_store
+
+
+@pytest.fixture
+def client(migrated_db, tmp_path, monkeypatch):
+    from backend.main import create_app
+
+    async def seed():
+        engine = create_async_engine(migrated_db)
+        async with engine.begin() as conn:
+            await conn.execute(insert(Division), [{"id": 1, "name": "Lions", "sort_order": 1}])
+            await conn.execute(
+                insert(Racer), [{"id": 1, "firstname": "Amy", "lastname": "Lee", "divisionid": 1}]
+            )
+        await engine.dispose()
+
+    asyncio.run(seed())
+    monkeypatch.setattr(photo_store, "root", tmp_path / "photos")
+
+    app = create_app()
+    app.state = State(
+        {**dict(app.state), "jwt_payload": {"sub": "1", "username": "admin", "is_admin": True}}
+    )
+    with TestClient(app=app) as test_client:
+        yield test_client
+
+
+def jpeg_bytes(size=(3000, 2000)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def test_upload_and_serve_variants(client):
+    photo = jpeg_bytes()
+    response = client.post("/api/racers/1/photo", files={"photo": ("car.jpg", photo, "image/jpeg")})
+    assert response.status_code == 200
+    racer = response.json()
+    digest = racer["imagefile"]
+    assert racer["photo_url"] == f"/api/photos/{digest}/display.jpg"
+
+    display = client.get(racer["photo_url"])
+    assert display.status_code == 200
+    assert display.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert display.headers["content-type"] == "image/jpeg"
+    assert max(Image.open(io.BytesIO(display.content)).size) == 800
+
+    thumb = client.get(f"/api/photos/{digest}/thumb.jpg")
+    assert Image.open(io.BytesIO(thumb.content)).size == (160, 107)
+
+    # The same bytes sent as a raw body land on the same content address
+    raw = client.post("/api/racers/1/photo", content=photo, headers={"Content-Type": "image/jpeg"})
+    assert raw.json()["imagefile"] == digest
+
+    assert client.get(f"/api/photos/{digest}/huge.jpg").status_code == 404
+    assert client.get(f"/api/photos/{'0' * 64}/thumb.jpg").status_code == 404
+
+
+def test_rejects_non_images(client):
+    response = client.post(
+        "/api/racers/1/photo", files={"photo": ("car.jpg", b"not a photo", "image/jpeg")}
+    )
+    assert response.status_code == 400
+    assert list(photo_store.root.glob("*/*")) == []
+
+
+def test_pathsend_when_server_supports_it(tmp_path):
+    from backend.api.responses import PathSendFileResponse, StaticFile
+
+    path = tmp_path / "thumb.jpg"
+    path.write_bytes(jpeg_bytes((16, 16)))
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def scenario(extensions):
+        response = StaticFile(path, media_type="image/jpeg").to_asgi_response(None, None)
+        assert type(response) is PathSendFileResponse
+        await response({"type": "http", "extensions": extensions}, None, send)
+
+    asyncio.run(scenario({"http.response.pathsend": {}}))
+    assert [message["type"] for message in sent] == [
+        "http.response.start",
+        "http.response.pathsend",
+    ]
+    assert sent[1]["path"] == str(path)
+
+    sent.clear()
+    asyncio.run(scenario({}))
+    assert [message["type"] for message in sent] == ["http.response.start", "http.response.body"]
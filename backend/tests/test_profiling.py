@@ -0,0 +1,71 @@
+# backend/tests/test_profiling.py
+"""
+Tests for on-demand request profiling
+"""
+
+import json
+import pstats
+
+import pytest
+from litestar.testing import TestClient
+
+from backend.api.middleware.auth import create_access_token
+from backend.api.services.profiling import request_profiler
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(request_profiler, "profile_dir", tmp_path / "profiles")
+    yield request_profiler.profile_dir
+    request_profiler.stop_sampling()
+
+
+def admin_headers(**extra):
+    token = create_access_token("1", "admin", is_admin=True)
+    return {"Authorization": f"Bearer {token}", **extra}
+
+
+def test_profile_single_request(migrated_db, profile_dir):
+    from backend.main import create_app
+
+    with TestClient(app=create_app()) as client:
+        plain = client.get("/api/heats/", headers={"X-Profile": "cprofile"})
+        profiled = client.get("/api/heats/", headers=admin_headers(**{"X-Profile": "cprofile"}))
+        sampled = client.get("/api/heats/?profile=sample", headers=admin_headers())
+
+    # Without an admin token the flag is ignored
+    assert "x-profile-file" not in plain.headers
+
+    stats = pstats.Stats(str(profile_dir / profiled.headers["x-profile-file"]))
+    assert stats.total_calls > 0
+
+    speedscope = json.loads((profile_dir / sampled.headers["x-profile-file"]).read_text())
+    assert speedscope["profiles"][0]["type"] == "sampled"
+    assert len(speedscope["profiles"][0]["samples"]) == len(speedscope["profiles"][0]["weights"])
+
+
+def test_sampling_window(migrated_db, profile_dir):
+    from backend.main import create_app
+
+    with TestClient(app=create_app()) as client:
+        assert (
+            client.post("/api/profiling/sampling", json={"every": 2, "duration": 60}).status_code
+            == 401
+        )
+
+        response = client.post(
+            "/api/profiling/sampling",
+            json={"every": 2, "duration": 60, "mode": "cprofile"},
+            headers=admin_headers()
+        )
+        assert response.json()["active"] is True
+
+        profiled = [
+            "x-profile-file" in client.get("/api/heats/").headers for _ in range(4)
+        ]
+        listing = client.get("/api/profiling/profiles", headers=admin_headers()).json()
+        stopped = client.delete("/api/profiling/sampling", headers=admin_headers()).json()
+
+    assert profiled == [False, True, False, True]
+    assert len(listing) == 2
+    assert stopped["active"] is False
@@ -0,0 +1,52 @@
+# backend/tests/test_query_stats.py
+"""
+Tests for per-request SQL instrumentation
+"""
+
+import asyncio
+
+from litestar.testing import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.api.middleware.query_stats import statement_shape, track_queries
+from backend.api.services import ResultRecorder
+from backend.tests.test_result_recorder import seed_heats, submission
+
+
+def test_statement_shape_collapses_in_lists():
+    assert statement_shape("SELECT * FROM racers WHERE id IN (?, ?, ?)") == \
+        statement_shape("SELECT  *\nFROM racers WHERE id IN (?)")
+
+
+def test_batch_recording_has_no_repeated_statements(migrated_db):
+    """Recording many heats must not issue a query per heat or per racer"""
+
+    async def run():
+        engine = create_async_engine(migrated_db)
+        async_session = async_sessionmaker(engine, expire_on_commit=False)
+        racer_ids, heat_ids = await seed_heats(async_session, heat_count=10)
+
+        async with async_session() as session:
+            with track_queries() as stats:
+                await ResultRecorder(session).record_heats(
+                    [submission(heat_id, racer_ids) for heat_id in heat_ids]
+                )
+
+        await engine.dispose()
+        return stats
+
+    stats = asyncio.run(run())
+
+    assert stats.repeated(threshold=1) == {}
+    assert stats.statements < 10
+
+
+def test_server_timing_header(migrated_db):
+    from backend.main import create_app
+
+    with TestClient(app=create_app()) as client:
+        response = client.get("/api/heats/")
+
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith('db;dur=')
+    assert '1 queries' in response.headers["server-timing"]
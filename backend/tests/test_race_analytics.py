@@ -0,0 +1,163 @@
+# backend/tests/test_race_analytics.py
+"""
+Tests for precomputed race reports
+"""
+
+import asyncio
+
+import pytest
+from litestar.testing import TestClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.api.models import Division, Heat, Racer, RaceResult, Rank, Round
+from backend.api.schemas import HeatResultRequest
+from backend.api.services import ResultRecorder, race_analytics
+from backend.api.services.race_analytics import finish_points
+
+
+async def seed(engine):
+    """Two ranks of two racers, a preliminary round of two heats and a final of one"""
+    async with engine.begin() as conn:
+        await conn.execute(insert(Division), [{"id": 1, "name": "Pack 1", "sort_order": 1}])
+        await conn.execute(insert(Rank), [
+            {"id": 1, "name": "Lion", "sort_order": 1},
+            {"id": 2, "name": "Tiger", "sort_order": 2},
+        ])
+        await conn.execute(insert(Racer), [
+            {"id": i, "firstname": f"Racer{i}", "lastname": "Test", "divisionid": 1,
+             "rankid": 1 if i <= 2 else 2, "carno": str(100 + i)}
+            for i in range(1, 5)
+        ])
+        await conn.execute(insert(Round), [
+            {"id": 1, "name": "Preliminary", "divisionid": 1, "roundno": 1, "phase": "preliminary",
+             "charttype": "roster"},
+            {"id": 2, "name": "Final", "divisionid": 1, "roundno": 2, "phase": "final",
+             "charttype": "roster"},
+        ])
+        await conn.execute(insert(Heat), [
+            {"id": 1, "roundid": 1, "heat": 1, "status": "scheduled"},
+            {"id": 2, "roundid": 1, "heat": 2, "status": "scheduled"},
+            {"id": 3, "roundid": 2, "heat": 1, "status": "scheduled"},
+        ])
+
+
+def submission(heat_id, times):
+    """Results for a heat from {racer_id: time}, lanes and places in the order given"""
+    ordered = sorted(times.items(), key=lambda item: item[1])
+    places = {racer_id: place for place, (racer_id, _) in enumerate(ordered, 1)}
+    return HeatResultRequest.model_validate({
+        "heat_id": heat_id,
+        "results": [
+            {"heat_id": heat_id, "racer_id": racer_id, "lane": lane, "time": time,
+             "place": places[racer_id]}
+            for lane, (racer_id, time) in enumerate(times.items(), 1)
+        ],
+    })
+
+
+def test_finish_points():
+    assert [finish_points(place, 4) for place in (1, 2, 3, 4, None)] == [4, 3, 2, 1, 0]
+
+
+def test_incremental_refresh(migrated_db, monkeypatch):
+    """Recorded results update the analytics without reloading them"""
+
+    async def run():
+        engine = create_async_engine(migrated_db)
+        async_session = async_sessionmaker(engine, expire_on_commit=False)
+        await seed(engine)
+
+        async with async_session() as session:
+            await race_analytics.load(session)
+        assert race_analytics.standings() == []
+
+        async def no_reload(session):
+            raise AssertionError("analytics reloaded")
+        monkeypatch.setattr(race_analytics, "load", no_reload)
+
+        async with async_session() as session:
+            recorder = ResultRecorder(session)
+            await recorder.record_heats([submission(1, {1: 3.0, 2: 3.2, 3: 3.1, 4: 3.4})])
+            await recorder.record_heats([submission(2, {1: 3.4, 2: 3.0, 3: 3.1, 4: 3.3})])
+            await recorder.record_heats([submission(3, {2: 2.9, 3: 3.5})])
+
+        standings = race_analytics.standings()
+        assert [(s.racer_id, s.avg_time, s.total_points, s.races_completed) for s in standings] == [
+            (2, 3.1, 6, 2), (3, 3.1, 6, 2), (1, 3.2, 5, 2), (4, 3.35, 3, 2)
+        ]
+        assert [s.racer_id for s in race_analytics.standings("TIGER")] == [3, 4]
+        assert race_analytics.standings("Bear") is None
+
+        summary, results = race_analytics.round_report(1)
+        assert (summary.status, summary.total_heats, summary.completed_heats) == ("completed", 2, 2)
+        assert race_analytics.round_report(2)[0].status == "completed"
+
+        # The final shows in the racer's history but not the standings
+        history = race_analytics.racer_history(2)
+        assert [(entry[0].race_id, entry[1]) for entry in history] == [(1, 1), (2, 1)]
+
+        async with async_session() as session:
+            await ResultRecorder(session).update_lane(1, 4, {"time": 2.5})
+
+        assert race_analytics.standings()[0].racer_id == 4
+        assert race_analytics.standings()[0].fastest_time == 2.5
+
+        await engine.dispose()
+
+    try:
+        asyncio.run(run())
+    finally:
+        race_analytics.clear()
+
+
+@pytest.fixture
+def client(migrated_db):
+    from backend.main import create_app
+
+    async def seed_results():
+        engine = create_async_engine(migrated_db)
+        await seed(engine)
+        async with engine.begin() as conn:
+            finishes = [(1, 3.0, 1), (2, 3.2, 3), (3, 3.1, 2)]
+            await conn.execute(insert(RaceResult), [
+                {"heat_id": 1, "racer_id": racer_id, "lane": lane, "time": time, "place": place,
+                 "completed": True}
+                for lane, (racer_id, time, place) in enumerate(finishes, 1)
+            ])
+            await conn.execute(
+                Heat.__table__.update().where(Heat.id == 1).values(status="completed")
+            )
+        await engine.dispose()
+
+    asyncio.run(seed_results())
+    with TestClient(app=create_app()) as test_client:
+        yield test_client
+    race_analytics.clear()
+
+
+def test_report_endpoints(client):
+    standings = client.get("/api/reports/standings").json()
+    assert [(row["racer_id"], row["position"], row["total_points"]) for row in standings] == [
+        (1, 1, 3), (3, 2, 2), (2, 3, 1)
+    ]
+    assert standings[0]["rank"] == "Lion" and standings[0]["den"] == "Pack 1"
+
+    lions = client.get("/api/reports/standings/lion").json()
+    assert [(row["racer_id"], row["position"]) for row in lions] == [(1, 1), (2, 2)]
+    assert client.get("/api/reports/standings/bear").status_code == 404
+
+    races = client.get("/api/reports/results").json()
+    assert [(race["race_id"], race["status"], race["completed_heats"]) for race in races] == [
+        (1, "in_progress", 1), (2, "pending", 0)
+    ]
+
+    report = client.get("/api/reports/races/1").json()
+    assert [row["racer_id"] for row in report["results"]] == [1, 3, 2]
+    assert client.get("/api/reports/races/99").status_code == 404
+
+    history = client.get("/api/reports/racers/3").json()
+    assert [(entry["race_name"], entry["position"], entry["fastest_time"])
+            for entry in history] == [("Preliminary", 2, 3.1)]
+    assert client.get("/api/reports/racers/4").json() == []
+    assert client.get("/api/reports/racers/99").status_code == 404
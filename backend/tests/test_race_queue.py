@@ -0,0 +1,196 @@
+# backend/tests/test_race_queue.py
+"""
+Tests for the now-racing board
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from litestar.testing import TestClient
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.api.models import Division, Heat, Racer, RacerHeat, Round
+from backend.api.services import ResultRecorder, heats_changed, race_queue
+from backend.config import ITINERARY_DEFAULT_CYCLE
+from backend.tests.test_result_recorder import submission
+
+HEATS = 8
+
+
+async def seed(engine):
+    """Two rounds of heats, each racer in lanes 1-4 in rotation"""
+    async with engine.begin() as conn:
+        await conn.execute(insert(Division), [{"id": 1, "name": "Lions", "sort_order": 1}])
+        await conn.execute(insert(Racer), [
+            {"id": i, "firstname": f"Racer{i}", "lastname": "Test", "divisionid": 1,
+             "carno": str(100 + i)}
+            for i in range(1, 5)
+        ])
+        await conn.execute(insert(Round), [
+            {"id": 1, "name": "Second", "divisionid": 1, "roundno": 2, "phase": "preliminary",
+             "charttype": "roster"},
+            {"id": 2, "name": "First", "divisionid": 1, "roundno": 1, "phase": "preliminary",
+             "charttype": "roster"},
+        ])
+        await conn.execute(insert(Heat), [
+            {"id": h, "roundid": 1 if h <= HEATS // 2 else 2, "heat": (h - 1) % (HEATS // 2) + 1,
+             "status": "scheduled"}
+            for h in range(1, HEATS + 1)
+        ])
+        await conn.execute(insert(RacerHeat), [
+            {"heat_id": h, "lane": lane, "racer_id": (h + lane) % 4 + 1}
+            for h in range(1, HEATS + 1) for lane in range(1, 5)
+        ])
+
+
+def board():
+    return json.loads(race_queue.board())
+
+
+def test_queue_follows_heat_transitions(migrated_db):
+    async def run():
+        engine = create_async_engine(migrated_db)
+        async_session = async_sessionmaker(engine, expire_on_commit=False)
+        await seed(engine)
+
+        async with async_session() as session:
+            await race_queue.load(session)
+
+        # Round 2 has the lower round number, so its heats (5-8) run first
+        state = board()
+        assert state["current"]["heat_id"] == 5
+        assert [heat["heat_id"] for heat in state["on_deck"]] == [6, 7, 8, 1]
+        assert state["current"]["lanes"][0] == {
+            "lane": 1, "racer_id": 3, "racer_name": "Racer3 Test", "car_number": "103",
+            "time": None, "place": None,
+        }
+        assert state["last_result"] is None and state["remaining"] == HEATS
+
+        async with async_session() as session:
+            # Starting a later heat puts it on the track
+            await session.execute(update(Heat).where(Heat.id == 7).values(status="in_progress"))
+            await session.commit()
+            await heats_changed(session, [7])
+            assert board()["current"]["heat_id"] == 7
+            assert [heat["heat_id"] for heat in board()["on_deck"]] == [5, 6, 8, 1]
+
+            lanes = [lane["racer_id"] for lane in board()["current"]["lanes"]]
+            await ResultRecorder(session).record_heats([submission(7, lanes)])
+
+        state = board()
+        assert state["current"]["heat_id"] == 5
+        assert state["last_result"]["heat_id"] == 7
+        assert [lane["time"] for lane in state["last_result"]["lanes"]] == [3.0, 3.1, 3.2, 3.3]
+        assert state["remaining"] == HEATS - 1
+
+        async with async_session() as session:
+            await ResultRecorder(session).record_heats([submission(5, [3, 4, 1, 2])])
+            assert board()["last_result"]["heat_id"] == 5
+
+            # Clearing the last result falls back to the heat before it
+            await session.execute(update(Heat).where(Heat.id == 5).values(status="scheduled"))
+            await session.commit()
+            await heats_changed(session, [5])
+
+        state = board()
+        assert state["current"]["heat_id"] == 5
+        assert state["last_result"]["heat_id"] == 7
+
+        await engine.dispose()
+
+    try:
+        asyncio.run(run())
+    finally:
+        race_queue.clear()
+
+
+def test_itinerary_eta(migrated_db):
+    async def run():
+        engine = create_async_engine(migrated_db)
+        async_session = async_sessionmaker(engine, expire_on_commit=False)
+        await seed(engine)
+
+        # Heats 5 and 6 finished 100s apart, after a long break following heat 7
+        start = datetime(2026, 5, 2, 10, 0, 0)
+        async with engine.begin() as conn:
+            for heat_id, completed in ((7, start), (5, start + timedelta(hours=1)),
+                                       (6, start + timedelta(hours=1, seconds=100))):
+                await conn.execute(update(Heat).where(Heat.id == heat_id)
+                                   .values(status="completed", completed_time=completed))
+
+        async with async_session() as session:
+            await race_queue.load(session)
+        assert race_queue.cycle_time() == 100
+
+        # Heat 8 is next up, then round 1; the next heat is due 100s after heat 6 finished
+        now = start + timedelta(hours=1, seconds=130)
+        stops = race_queue.itinerary(1, now=now)
+        assert [(stop.heat.heat_id, stop.lane.lane, stop.position) for stop in stops] == [
+            (8, 4, 0), (1, 3, 1), (2, 2, 2), (3, 1, 3), (4, 4, 4)
+        ]
+        assert [(stop.eta - now).total_seconds() for stop in stops] == [70, 170, 270, 370, 470]
+        assert race_queue.racer_for_car("101") == 1
+
+        async with async_session() as session:
+            await ResultRecorder(session).record_heats([submission(8, [4, 1, 2, 3])])
+        assert [stop.heat.heat_id for stop in race_queue.itinerary(1)] == [1, 2, 3, 4]
+        assert race_queue.itinerary(99) == []
+
+        await engine.dispose()
+
+    try:
+        asyncio.run(run())
+    finally:
+        race_queue.clear()
+
+
+@pytest.fixture
+def client(migrated_db):
+    from backend.main import create_app
+
+    async def seed_db():
+        engine = create_async_engine(migrated_db)
+        await seed(engine)
+        await engine.dispose()
+
+    asyncio.run(seed_db())
+    with TestClient(app=create_app()) as test_client:
+        yield test_client
+    race_queue.clear()
+
+
+def test_board_endpoint(client):
+    response = client.get("/api/board")
+    assert response.status_code == 200
+    assert response.json()["current"]["heat_id"] == 5
+    assert len(response.json()["on_deck"]) == 4
+    assert '"0 queries' in response.headers["server-timing"]
+
+    cached = client.get("/api/board", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+
+
+def test_board_not_loaded(client):
+    race_queue.clear()
+    assert client.get("/api/board").status_code == 503
+
+
+def test_itinerary_endpoints(client):
+    itinerary = client.get("/api/racers/2/itinerary").json()
+    assert itinerary["racer_name"] == "Racer2 Test" and itinerary["car_number"] == "102"
+    assert itinerary["cycle_time"] == ITINERARY_DEFAULT_CYCLE
+    assert [(heat["heat_id"], heat["lane"], heat["position"]) for heat in itinerary["heats"]] == [
+        (5, 4, 0), (6, 3, 1), (7, 2, 2), (8, 1, 3), (1, 4, 4), (2, 3, 5), (3, 2, 6), (4, 1, 7)
+    ]
+
+    by_car = client.get("/api/racers/car/102/itinerary").json()
+    assert by_car["racer_id"] == 2
+    assert [heat["heat_id"] for heat in by_car["heats"]] == [
+        heat["heat_id"] for heat in itinerary["heats"]
+    ]
+
+    assert client.get("/api/racers/99/itinerary").status_code == 404
+    assert client.get("/api/racers/car/999/itinerary").status_code == 404
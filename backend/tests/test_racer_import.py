@@ -0,0 +1,124 @@
+# backend/tests/test_racer_import.py
+"""
+Tests for bulk racer import file parsing and loading
+"""
+
+import asyncio
+import io
+import zipfile
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.api.models import Division, Racer, Rank
+from backend.api.services import RacerImporter, iter_upload_rows
+from backend.api.services.racer_import import normalize_header
+
+SHEET_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+  <sheetData>
+    <row r="1">
+      <c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c><c r="D1" t="s"><v>2</v></c>
+    </row>
+    <row r="2">
+      <c r="A2" t="inlineStr"><is><t>Amy</t></is></c><c r="B2" t="s"><v>3</v></c>
+      <c r="D2"><v>101.0</v></c>
+    </row>
+  </sheetData>
+</worksheet>"""
+
+STRINGS_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+  <si><t>First Name</t></si><si><t>Last Name</t></si><si><t>Car #</t></si><si><t>Lee</t></si>
+</sst>"""
+
+
+def test_normalize_header():
+    """Common spreadsheet headings map to racer fields"""
+    assert normalize_header("First Name") == "firstname"
+    assert normalize_header("car_number") == "carno"
+    assert normalize_header("Car #") == "carno"
+    assert normalize_header("Shoe size") is None
+
+
+def test_csv_rows():
+    """CSV uploads are decoded with BOM handling"""
+    data = io.BytesIO("\ufefffirstname,lastname\nAmy,Lee\n".encode("utf-8"))
+    assert list(iter_upload_rows(data, "racers.csv")) == [["firstname", "lastname"], ["Amy", "Lee"]]
+
+
+def test_xlsx_rows():
+    """XLSX uploads resolve shared strings, inline strings and sparse cells"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("xl/worksheets/sheet1.xml", SHEET_XML)
+        archive.writestr("xl/sharedStrings.xml", STRINGS_XML)
+    buffer.seek(0)
+
+    assert list(iter_upload_rows(buffer, "racers.xlsx")) == [
+        ["First Name", "Last Name", "", "Car #"],
+        ["Amy", "Lee", "", "101"],
+    ]
+
+
+IMPORT_ROWS = [
+    ["First Name", "Last Name", "Division", "Rank", "Car #", "Barcode"],
+    ["Amy", "Lee", "bears", "Tiger", "101", "dd-002"],
+    ["Bob", "Ray", "Wolves", "", "102", ""],
+    ["Cal", "Ox", "Lions", "Eagle", "103", ""],
+    ["Dee", "Fox", "Lions", "", "104", "DD-001"],
+    ["Eve", "Kim", "LIONS", "", "105", "DD-002"],
+    ["", "", "", "", "", ""],
+    ["Fay", "", "Lions", "", "106", ""],
+    ["Gus", "Lu", "Lions", "", "107", ""],
+]
+
+
+def test_import_rows(migrated_db):
+    """Names resolve case-insensitively, bad rows are reported and dry runs change nothing"""
+
+    async def run():
+        engine = create_async_engine(migrated_db)
+        async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+        async with engine.begin() as conn:
+            await conn.execute(
+                insert(Division), [{"id": 1, "name": "Bears"}, {"id": 2, "name": "Lions"}]
+            )
+            await conn.execute(insert(Rank), [{"id": 1, "name": "Tiger"}])
+            await conn.execute(insert(Racer), [
+                {"firstname": "Old", "lastname": "Timer", "divisionid": 1, "barcode": "DD-001"}
+            ])
+
+        async def racers():
+            async with async_session() as session:
+                return (await session.execute(select(Racer).order_by(Racer.id))).scalars().all()
+
+        async with async_session() as session:
+            dry = await RacerImporter(session).import_rows(iter(IMPORT_ROWS), dry_run=True)
+        after_dry_run = await racers()
+
+        async with async_session() as session:
+            report = await RacerImporter(session, batch_size=1).import_rows(iter(IMPORT_ROWS))
+        imported = await racers()
+
+        await engine.dispose()
+        return dry, after_dry_run, report, imported
+
+    dry, after_dry_run, report, imported = asyncio.run(run())
+
+    assert dry["dry_run"] and dry["imported"] == 2
+    assert [r.firstname for r in after_dry_run] == ["Old"]
+
+    assert (report["total_rows"], report["imported"], report["failed"]) == (7, 2, 5)
+    assert [(e["row"], e["field"]) for e in report["errors"]] == [
+        (3, "division"), (4, "rank"), (5, "barcode"), (6, "barcode"), (8, "lastname")
+    ]
+    assert report["errors"][2]["message"] == "Duplicate barcode 'DD-001'"
+    assert report["errors"][0]["message"] == "Unknown division 'Wolves'"
+
+    amy, gus = imported[1:]
+    assert (amy.firstname, amy.divisionid, amy.rankid) == ("Amy", 1, 1)
+    assert (amy.carno, amy.barcode) == ("101", "dd-002")
+    assert amy.checkin_status == "registered"
+    assert (gus.firstname, gus.divisionid, gus.rankid) == ("Gus", 2, None)
@@ -0,0 +1,70 @@
+# backend/tests/test_racer_search.py
+"""
+Tests for the racer full-text search index
+"""
+
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.api.models import Division, Racer
+from backend.api.services import apply_racer_search, build_fts_query
+
+
+def test_build_fts_query():
+    """Search text becomes quoted prefix terms with FTS syntax stripped"""
+    assert build_fts_query("jo smi") == '"jo"* "smi"*'
+    assert build_fts_query('Bob "the" (fast)*') == '"Bob"* "the"* "fast"*'
+    assert build_fts_query('  "*  ') is None
+
+
+def test_fts_search(migrated_db):
+    """FTS results follow inserts, updates and deletes on the racers table"""
+
+    async def run():
+        engine = create_async_engine(migrated_db)
+        async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+        async def search(term):
+            async with async_session() as session:
+                query = await apply_racer_search(session, select(Racer), term)
+                result = await session.execute(query)
+                return [racer.carno for racer in result.scalars()]
+
+        async with async_session() as session:
+            dvsn = Division(name="Wolves", sort_order=1)
+            session.add(dvsn)
+            await session.flush()
+            now = datetime.utcnow()
+            session.add_all([
+                Racer(firstname="John", lastname="Smith", divisionid=dvsn.id, carno="101",
+                      carname="Blue Comet", created_at=now, updated_at=now),
+                Racer(firstname="Joanna", lastname="Jones", divisionid=dvsn.id, carno="102",
+                      carname="Red Rocket", created_at=now, updated_at=now),
+            ])
+            await session.commit()
+
+        assert sorted(await search("jo")) == ["101", "102"]
+        assert await search("jo smi") == ["101"]
+        assert await search("comet") == ["101"]
+        assert sorted(await search("10")) == ["101", "102"]
+
+        async with async_session() as session:
+            racer = (await session.execute(select(Racer).filter(Racer.carno == "102"))).scalar_one()
+            racer.lastname = "Smithers"
+            await session.commit()
+
+        assert sorted(await search("smith")) == ["101", "102"]
+
+        async with async_session() as session:
+            racer = (await session.execute(select(Racer).filter(Racer.carno == "101"))).scalar_one()
+            await session.delete(racer)
+            await session.commit()
+
+        assert await search("smith") == ["102"]
+
+        await engine.dispose()
+
+    asyncio.run(run())
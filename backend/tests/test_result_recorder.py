@@ -0,0 +1,149 @@
+# backend/tests/test_result_recorder.py
+"""
+Tests for heat result recording
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from litestar.datastructures import State
+from litestar.testing import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.api.models import Division, Heat, Racer, RaceResult, Round
+from backend.api.schemas import HeatResultRequest
+from backend.api.services import MissingRecordError, ResultRecorder
+
+
+async def seed_heats(async_session, heat_count=3):
+    """Create one division with four racers and a round of heats"""
+    async with async_session() as session:
+        dvsn = Division(name="Bears", sort_order=1)
+        session.add(dvsn)
+        await session.flush()
+
+        now = datetime.utcnow()
+        racers = [
+            Racer(firstname=f"R{i}", lastname="Test", divisionid=dvsn.id, carno=str(i),
+                  created_at=now, updated_at=now)
+            for i in range(4)
+        ]
+        round_obj = Round(name="Prelim", divisionid=dvsn.id, roundno=1,
+                          phase="preliminary", charttype="roster")
+        session.add_all(racers + [round_obj])
+        await session.flush()
+
+        heats = [
+            Heat(roundid=round_obj.id, heat=n + 1, status="scheduled") for n in range(heat_count)
+        ]
+        session.add_all(heats)
+        await session.commit()
+
+        return [r.id for r in racers], [h.id for h in heats]
+
+
+def submission(heat_id, racer_ids, base_time=3.0):
+    """Build a heat result submission with one racer per lane"""
+    return HeatResultRequest.model_validate({
+        "heat_id": heat_id,
+        "results": [
+            {"heat_id": heat_id, "racer_id": racer_id, "lane": lane + 1,
+             "time": base_time + lane / 10, "place": lane + 1}
+            for lane, racer_id in enumerate(racer_ids)
+        ],
+    })
+
+
+def test_record_batch(migrated_db):
+    """A backlog is applied in one go, the last submission wins and row IDs are kept"""
+
+    async def run():
+        engine = create_async_engine(migrated_db)
+        async_session = async_sessionmaker(engine, expire_on_commit=False)
+        racer_ids, heat_ids = await seed_heats(async_session)
+
+        async with async_session() as session:
+            heats = await ResultRecorder(session).record_heats([
+                submission(heat_ids[0], racer_ids),
+                submission(heat_ids[1], racer_ids),
+                submission(heat_ids[0], racer_ids, base_time=4.0),
+            ])
+
+        assert [h.id for h in heats] == [heat_ids[1], heat_ids[0]]
+        assert all(h.status == "completed" for h in heats)
+
+        async with async_session() as session:
+            times = (await session.execute(
+                select(RaceResult.time).filter(RaceResult.heat_id == heat_ids[0])
+                .order_by(RaceResult.lane)
+            )).scalars().all()
+            assert times == [4.0, 4.1, 4.2, 4.3]
+
+            ids_before = (await session.execute(
+                select(RaceResult.id).filter(RaceResult.heat_id == heat_ids[0])
+                .order_by(RaceResult.lane)
+            )).scalars().all()
+
+            corrected = await ResultRecorder(session).update_lane(heat_ids[0], 2, {"time": 3.9})
+            assert corrected.id == ids_before[1]
+            assert (await session.get(Heat, heat_ids[0])).version == 2
+
+            await ResultRecorder(session).record_heats([submission(heat_ids[0], racer_ids[:3])])
+            ids_after = (await session.execute(
+                select(RaceResult.id).filter(RaceResult.heat_id == heat_ids[0])
+                .order_by(RaceResult.lane)
+            )).scalars().all()
+            assert ids_after == ids_before[:3]
+
+            with pytest.raises(MissingRecordError):
+                await ResultRecorder(session).record_heats([submission(heat_ids[2], [999])])
+
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_record_nothing(migrated_db):
+    """An empty submission list records nothing and deletes nothing"""
+
+    async def run():
+        engine = create_async_engine(migrated_db)
+        async_session = async_sessionmaker(engine, expire_on_commit=False)
+        racer_ids, heat_ids = await seed_heats(async_session, heat_count=1)
+
+        async with async_session() as session:
+            await ResultRecorder(session).record_heats([submission(heat_ids[0], racer_ids)])
+            assert await ResultRecorder(session).record_heats([]) == []
+            count = (await session.execute(select(func.count()).select_from(RaceResult))).scalar()
+
+        await engine.dispose()
+        return count
+
+    assert asyncio.run(run()) == 4
+
+
+def test_empty_submissions_are_rejected(migrated_db):
+    """Neither an empty batch nor a heat without results reaches the recorder's delete"""
+    from backend.main import create_app
+
+    engine = create_async_engine(migrated_db)
+    racer_ids, heat_ids = asyncio.run(
+        seed_heats(async_sessionmaker(engine, expire_on_commit=False), heat_count=1)
+    )
+    asyncio.run(engine.dispose())
+
+    app = create_app()
+    app.state = State({**dict(app.state), "jwt_payload": {"sub": "tester", "is_admin": True}})
+    with TestClient(app=app) as client:
+        recorded = client.post("/api/results/heats:batch", json={"heats": [
+            submission(heat_ids[0], racer_ids).model_dump()
+        ]})
+        assert recorded.status_code == 201
+
+        assert client.post("/api/results/heats:batch", json={"heats": []}).status_code == 400
+        empty_heat = {"heats": [{"heat_id": heat_ids[0], "results": []}]}
+        assert client.post("/api/results/heats:batch", json=empty_heat).status_code == 400
+
+        assert len(client.get(f"/api/results/heat/{heat_ids[0]}").json()["results"]) == 4
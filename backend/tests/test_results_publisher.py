@@ -0,0 +1,136 @@
+# backend/tests/test_results_publisher.py
+"""
+Tests for the published results snapshot
+"""
+
+import asyncio
+import contextlib
+import gzip
+import json
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.api.services import ResultRecorder, race_analytics, race_queue
+from backend.api.services.results_publisher import ResultsPublisher, rank_slug
+from backend.tests.test_race_analytics import seed, submission
+
+
+def test_rank_slug():
+    assert rank_slug(" Arrow of Light ") == "arrow-of-light"
+    assert rank_slug("Bear/Wolf") == "bear-wolf"
+    assert rank_slug("") == "unranked"
+
+
+def test_publish_regenerates_affected_files(migrated_db, tmp_path, monkeypatch):
+    publisher = ResultsPublisher(tmp_path)
+    monkeypatch.setattr("backend.api.services.heat_events.results_publisher", publisher)
+
+    def read(relative):
+        return json.loads((tmp_path / relative).read_bytes())
+
+    def inodes():
+        return {str(path.relative_to(tmp_path)): path.stat().st_ino
+                for path in tmp_path.rglob("*") if path.is_file()}
+
+    async def run():
+        engine = create_async_engine(migrated_db)
+        async_session = async_sessionmaker(engine, expire_on_commit=False)
+        await seed(engine)
+
+        async with async_session() as session:
+            await race_analytics.load(session)
+            await publisher.publish_all(session)
+
+            assert read("reports/standings.json") == []
+            assert read("rounds/1/chart.json")["heats"]["id"] == [1, 2]
+            assert (tmp_path / "reports/standings/tiger.json").exists()
+            assert "reports/racers/4.json" in (tmp_path / "index.html").read_text()
+
+            await ResultRecorder(session).record_heats(
+                [submission(1, {1: 3.0, 2: 3.2, 3: 3.1, 4: 3.4})]
+            )
+            await publisher.flush()
+
+            standings = read("reports/standings.json")
+            assert [row["racer_id"] for row in standings] == [1, 3, 2, 4]
+            assert (
+                json.loads(gzip.decompress((tmp_path / "reports/standings.json.gz").read_bytes()))
+                == standings
+            )
+            assert [row["racer_id"] for row in read("reports/standings/tiger.json")] == [3, 4]
+            assert read("reports/races/1.json")["completed_heats"] == 1
+            assert read("rounds/1/chart.json")["heats"]["status"] == ["completed", "scheduled"]
+            assert [entry["race_id"] for entry in read("reports/racers/4.json")] == [1]
+
+            # The final touches only its own round and its two racers
+            before = inodes()
+            await ResultRecorder(session).record_heats([submission(3, {2: 2.9, 3: 3.5})])
+            await publisher.flush()
+            changed = {path for path, inode in inodes().items() if before.get(path) != inode}
+
+        assert changed == {
+            "reports/races/2.json", "reports/races/2.json.gz",
+            "rounds/2/chart.json", "rounds/2/chart.json.gz",
+            "reports/racers/2.json", "reports/racers/2.json.gz",
+            "reports/racers/3.json", "reports/racers/3.json.gz",
+            "reports/results.json", "reports/results.json.gz",
+        }
+        await engine.dispose()
+
+    try:
+        asyncio.run(run())
+    finally:
+        race_analytics.clear()
+        race_queue.clear()
+
+
+def test_scheduled_changes_are_coalesced(migrated_db, tmp_path, monkeypatch):
+    """Changes scheduled in the same loop tick are published together, off the request"""
+    publisher = ResultsPublisher(tmp_path)
+    calls = []
+
+    async def publish(session, round_ids=(), heat_ids=(), racer_ids=()):
+        calls.append((set(round_ids), set(racer_ids)))
+
+    monkeypatch.setattr(publisher, "publish", publish)
+
+    async def run():
+        publisher.schedule(round_ids=[1])
+        publisher.schedule(racer_ids=[4])
+        publisher.schedule(round_ids=[2], racer_ids=[3])
+        assert calls == []
+        await publisher.flush()
+
+    asyncio.run(run())
+    assert calls == [({1, 2}, {3, 4})]
+
+
+def test_changes_scheduled_while_finishing_are_published(tmp_path, monkeypatch):
+    """A change landing while the publish task shuts down its engine is not lost"""
+    publisher = ResultsPublisher(tmp_path)
+    calls = []
+
+    async def publish(session, round_ids=(), heat_ids=(), racer_ids=()):
+        calls.append(set(round_ids))
+
+    class Engine:
+        disposed = 0
+
+        async def dispose(self):
+            Engine.disposed += 1
+            if Engine.disposed == 1:
+                publisher.schedule(round_ids=[2])
+            await asyncio.sleep(0)
+
+    monkeypatch.setattr(publisher, "publish", publish)
+    monkeypatch.setattr("sqlalchemy.ext.asyncio.create_async_engine", lambda url: Engine())
+    monkeypatch.setattr(
+        "sqlalchemy.ext.asyncio.async_sessionmaker", lambda engine, **kwargs: contextlib.nullcontext
+    )
+
+    async def run():
+        publisher.schedule(round_ids=[1])
+        await publisher.flush()
+
+    asyncio.run(run())
+    assert calls == [{1}, {2}]
@@ -0,0 +1,112 @@
+# backend/tests/test_round_chart.py
+"""
+Tests for the round chart endpoint
+"""
+
+import asyncio
+
+import pytest
+from litestar.testing import TestClient
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.api.models import Division, Heat, Racer, RaceResult, RacerHeat, Round
+from backend.api.responses import etag_matches
+
+
+def run_sql(url, *statements):
+    async def run():
+        engine = create_async_engine(url)
+        async with engine.begin() as conn:
+            for statement, *params in statements:
+                await conn.execute(statement, *params)
+        await engine.dispose()
+    asyncio.run(run())
+
+
+@pytest.fixture
+def client(migrated_db):
+    from backend.main import create_app
+
+    run_sql(
+        migrated_db,
+        (insert(Division), [{"id": 1, "name": "Lions", "sort_order": 1}]),
+        (insert(Racer), [
+            {"id": i, "firstname": f"Racer{i}", "lastname": "Test", "divisionid": 1,
+             "carno": str(100 + i)}
+            for i in range(1, 5)
+        ]),
+        (insert(Round), [{"id": 1, "name": "Prelim", "divisionid": 1, "roundno": 1,
+                          "phase": "preliminary", "charttype": "roster"}]),
+        (insert(Heat), [
+            {"id": 1, "roundid": 1, "heat": 1, "status": "completed", "version": 1},
+            {"id": 2, "roundid": 1, "heat": 2, "status": "scheduled", "version": 0},
+            {"id": 3, "roundid": 1, "heat": 3, "status": "scheduled", "version": 0},
+        ]),
+        (insert(RacerHeat), [
+            {"heat_id": 1, "lane": 1, "racer_id": 1}, {"heat_id": 1, "lane": 2, "racer_id": 2},
+            {"heat_id": 2, "lane": 1, "racer_id": 2}, {"heat_id": 2, "lane": 2, "racer_id": 1},
+        ]),
+        (insert(RaceResult), [
+            {"heat_id": 1, "racer_id": 1, "lane": 1, "time": 3.1, "place": 1, "completed": True},
+            {"heat_id": 1, "racer_id": 2, "lane": 2, "time": 3.3, "place": 2, "completed": True},
+        ]),
+    )
+    with TestClient(app=create_app()) as test_client:
+        test_client.db_url = migrated_db
+        yield test_client
+
+
+def test_etag_matches():
+    assert etag_matches('"1-abc"', '"1-abc"')
+    assert etag_matches('W/"1-abc", "2-def"', '"1-abc"')
+    assert etag_matches("*", '"1-abc"')
+    assert not etag_matches('"1-abd"', '"1-abc"')
+    assert not etag_matches(None, '"1-abc"')
+
+
+def test_round_chart_columns(client):
+    response = client.get("/api/rounds/1/chart")
+    assert response.status_code == 200
+    chart = response.json()
+
+    assert chart["round"]["name"] == "Prelim"
+    assert chart["lane_count"] == 2
+    assert chart["heats"]["heat"] == [1, 2, 3]
+    assert chart["heats"]["status"] == ["completed", "scheduled", "scheduled"]
+
+    # Each racer appears once; lanes point at heats and racers by index
+    assert chart["racers"]["name"] == ["Racer1 Test", "Racer2 Test"]
+    assert chart["lanes"] == {
+        "heat": [0, 0, 1, 1],
+        "lane": [1, 2, 1, 2],
+        "racer": [0, 1, 1, 0],
+        "time": [3.1, 3.3, None, None],
+        "place": [1, 2, None, None],
+    }
+    assert response.headers["etag"] == f'"1-{chart["version"]}"'
+
+    assert client.get("/api/rounds/99/chart").status_code == 404
+
+
+def test_round_chart_revalidation(client):
+    first = client.get("/api/rounds/1/chart")
+    etag = first.headers["etag"]
+
+    cached = client.get("/api/rounds/1/chart", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    # A result bumps the heat version, which changes the chart version
+    run_sql(
+        client.db_url,
+        (insert(RaceResult), [
+            {"heat_id": 2, "racer_id": 2, "lane": 1, "time": 3.0, "place": 1, "completed": True},
+        ]),
+        (update(Heat).where(Heat.id == 2).values(status="completed", version=Heat.version + 1),),
+    )
+
+    changed = client.get("/api/rounds/1/chart", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["lanes"]["time"] == [3.1, 3.3, 3.0, None]
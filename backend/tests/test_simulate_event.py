@@ -0,0 +1,31 @@
+# backend/tests/test_simulate_event.py
+"""
+Smoke test for the full-event simulator
+"""
+
+import argparse
+import asyncio
+
+from backend.simulate_event import percentile, simulate
+
+
+def test_percentile():
+    samples = [float(n) for n in range(1, 101)]
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 99) == 99.0
+    assert percentile([], 99) == 0.0
+
+
+def test_small_event(migrated_db, tmp_path):
+    """A tiny event runs end to end through prelims, finals and championship"""
+    args = argparse.Namespace(
+        database=migrated_db, divisions=2, racers=5, displays=1, lanes=4,
+        poll_interval=0.05, finalists=4, seed=3, verbose=False,
+    )
+
+    report = asyncio.run(simulate(args, tmp_path))
+
+    assert report["heats"] == report["phases"]["run prelims"]["heats"] + 3
+    assert report["standings"] == 10
+    assert report["latency_ms"]["record results"]["count"] == report["heats"]
+    assert report["phases"]["run prelims"]["statements"] > 0
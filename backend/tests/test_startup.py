@@ -0,0 +1,30 @@
+# backend/tests/test_startup.py
+"""
+Tests that optional subsystems stay off the startup path
+"""
+
+import json
+import subprocess
+import sys
+
+from backend.benchmark_startup import LAZY_MODULES, PROJECT_ROOT
+
+
+def test_app_import_skips_optional_dependencies():
+    snippet = (
+        "import json, sys\n"
+        "import backend.main\n"
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", snippet],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    assert json.loads(output.stdout.strip().splitlines()[-1]) == []
+
+
+def test_timer_drivers_load_on_access():
+    import backend.api.services.timer as timer
+
+    assert timer.VirtualTimer.__module__ == "backend.api.services.timer.virtual"
+    assert timer.SmartLineReplayTimer.__name__ == "SmartLineReplayTimer"
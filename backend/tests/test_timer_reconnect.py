@@ -0,0 +1,81 @@
+# backend/tests/test_timer_reconnect.py
+"""
+Tests for timer connection supervision and result recovery
+"""
+
+import asyncio
+from unittest.mock import patch
+
+from backend.api.services.timer import TimerInterface, TimerService
+
+
+class FlakyTimer(TimerInterface):
+    """Timer whose link drops once and whose first reconnect attempt fails"""
+
+    def __init__(self):
+        self.connected = False
+        self.probes = 0
+        self.reconnect_attempts = 0
+        self.results = [{"lane": 1, "time": 2.5, "place": 1}]
+
+    async def connect(self) -> bool:
+        self.connected = True
+        return True
+
+    async def disconnect(self) -> None:
+        self.connected = False
+
+    async def reconnect(self) -> bool:
+        self.reconnect_attempts += 1
+        self.connected = self.reconnect_attempts > 1
+        return self.connected
+
+    async def probe(self) -> bool:
+        self.probes += 1
+        return self.probes != 2
+
+    async def reset(self) -> bool:
+        return True
+
+    async def prepare_heat(self, lanes) -> bool:
+        return True
+
+    async def start_heat(self) -> bool:
+        return True
+
+    async def get_results(self):
+        return self.results
+
+    @property
+    def is_connected(self) -> bool:
+        return self.connected
+
+
+def test_reconnect_and_recover():
+    """A dropped link is reopened with backoff and missed results are delivered once"""
+    timer = FlakyTimer()
+    delivered = []
+
+    async def run():
+        service = TimerService(health_check_interval=0.01, reconnect_initial_delay=0.01)
+        service.register_callback(delivered.append)
+
+        with patch(
+            "backend.api.services.timer.factory.TimerFactory.create_timer", return_value=timer
+        ):
+            assert await service.initialize_timer({})
+
+        # Wait for the drop, two reconnect attempts and a few more probes
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if timer.probes > 4:
+                break
+
+        await service.close_timer()
+        return service
+
+    service = asyncio.run(run())
+
+    assert timer.reconnect_attempts == 2
+    assert service.reconnects == 1
+    assert delivered == [timer.results]
@@ -0,0 +1,64 @@
+# backend/tests/test_timer_replay.py
+"""
+Tests for timer wire capture and capture replay
+"""
+
+import asyncio
+
+from backend.api.services.timer import CaptureWriter, TimerFactory, read_capture
+from backend.api.services.timer.capture import RX, TX
+
+
+def write_capture(path):
+    """A short SmartLine session: reset on connect, then a results request"""
+    capture = CaptureWriter(path)
+    capture.record(TX, b"R\r\n")
+    capture.record(RX, b"OK\r\n")
+    capture.record(TX, b"RESULTS\r\n")
+    capture.record(RX, b"1,2.456,2,2.345,3,2.567\r\n")
+    capture.close()
+
+
+def test_capture_round_trip(tmp_path):
+    """Records come back in order and a cut-off final record is dropped"""
+    path = tmp_path / "session.ddcap"
+    write_capture(path)
+
+    events = read_capture(path)
+    assert [(e.direction, e.data) for e in events][:2] == [(TX, b"R\r\n"), (RX, b"OK\r\n")]
+    assert [e.elapsed for e in events] == sorted(e.elapsed for e in events)
+
+    with open(path, "ab") as handle:
+        handle.write(b"\x00\x00\x00")
+    assert len(read_capture(path)) == 4
+
+
+def test_replay_through_driver(tmp_path):
+    """The SmartLine driver parses replayed traffic, and can re-capture it"""
+    path = tmp_path / "session.ddcap"
+    write_capture(path)
+    capture_dir = tmp_path / "recaptured"
+
+    async def run():
+        timer = TimerFactory.create_timer({
+            "timer_type": "smartline",
+            "connection_type": "replay",
+            "capture_file": str(path),
+            "speed": 0,
+        })
+        timer.capture_dir = str(capture_dir)
+        assert await timer.connect()
+        results = await timer.get_results()
+        mismatches = timer.replay.mismatches
+        await timer.disconnect()
+        return results, mismatches
+
+    results, mismatches = asyncio.run(run())
+
+    assert mismatches == 0
+    assert [(r["lane"], r["place"]) for r in results] == [(2, 1), (1, 2), (3, 3)]
+
+    recaptured = read_capture(next(capture_dir.glob("smartline-*.ddcap")))
+    assert [(e.direction, e.data) for e in recaptured] == [
+        (e.direction, e.data) for e in read_capture(path)
+    ]